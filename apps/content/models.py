@@ -1,9 +1,8 @@
 from django.db import models
-from django.utils.text import slugify
 
 from mdeditor.fields import MDTextField
 
-from apps.core.models import TimeStampedModel
+from apps.core.models import AnalyzedContentModel, AutoSlugModel, TimeStampedModel
 
 
 class Partner(TimeStampedModel):
@@ -94,8 +93,11 @@ class SiteSettings(TimeStampedModel):
         return obj
 
 
-class Page(TimeStampedModel):
+class Page(AutoSlugModel, AnalyzedContentModel, TimeStampedModel):
     """Статичная страница (О нас, Контакты, Правила)."""
+    analyzed_field = "content"
+    slug_source = "title"
+
     title = models.CharField("Заголовок", max_length=200)
     slug = models.SlugField("URL-путь", max_length=220, unique=True)
     content = MDTextField("Содержимое", blank=True)
@@ -111,11 +113,6 @@ class Page(TimeStampedModel):
     def __str__(self):
         return self.title
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title, allow_unicode=True)
-        super().save(*args, **kwargs)
-
 
 class PartnershipApplication(TimeStampedModel):
     """Заявка на партнёрство."""
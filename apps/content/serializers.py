@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from apps.content.models import Page, Partner, PartnershipApplication, SiteSettings, TeamMember
+from apps.core.serializers import MarkdownHTMLField
 
 
 class PartnerSerializer(serializers.ModelSerializer):
@@ -52,6 +53,8 @@ class SiteSettingsSerializer(serializers.ModelSerializer):
 class ContentPageSerializer(serializers.ModelSerializer):
     """Статичная страница контента (О нас, Контакты и т.д.)."""
 
+    content_html = MarkdownHTMLField(source="content")
+
     class Meta:
         model = Page
         fields = (
@@ -59,9 +62,13 @@ class ContentPageSerializer(serializers.ModelSerializer):
             "title",
             "slug",
             "content",
+            "content_html",
+            "toc",
+            "read_time_minutes",
             "meta_title",
             "meta_description",
         )
+        optional_fields = ("content_html",)
 
 
 class PartnershipApplicationSerializer(serializers.ModelSerializer):
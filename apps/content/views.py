@@ -10,22 +10,34 @@ from apps.content.serializers import (
     SiteSettingsSerializer,
     TeamMemberSerializer,
 )
+from apps.core.mixins import (
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    SparseFieldsetsMixin,
+    conditional_get,
+)
 
 
 @extend_schema(tags=["content"])
-class PartnerViewSet(viewsets.ReadOnlyModelViewSet):
+class PartnerViewSet(
+    ConditionalGetMixin, CachedResponseMixin, SparseFieldsetsMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = Partner.objects.all()
     serializer_class = PartnerSerializer
+    cache_models = (Partner,)
 
 
 @extend_schema(tags=["content"])
-class TeamMemberViewSet(viewsets.ReadOnlyModelViewSet):
+class TeamMemberViewSet(
+    ConditionalGetMixin, CachedResponseMixin, SparseFieldsetsMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = TeamMember.objects.all().order_by("display_order", "full_name")
     serializer_class = TeamMemberSerializer
+    cache_models = (TeamMember,)
 
 
 @extend_schema(tags=["content"])
-class SiteSettingsViewSet(viewsets.ReadOnlyModelViewSet):
+class SiteSettingsViewSet(SparseFieldsetsMixin, viewsets.ReadOnlyModelViewSet):
     """Singleton: одна запись настроек сайта."""
 
     serializer_class = SiteSettingsSerializer
@@ -37,17 +49,26 @@ class SiteSettingsViewSet(viewsets.ReadOnlyModelViewSet):
         return SiteSettings.load()
 
     def list(self, request, *args, **kwargs):
+        return conditional_get(
+            request, self.get_queryset(), (SiteSettings,), self._settings_response, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
+
+    def _settings_response(self, request, *args, **kwargs):
         instance = SiteSettings.load()
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
 
 @extend_schema(tags=["content"])
-class ContentPageViewSet(viewsets.ReadOnlyModelViewSet):
+class ContentPageViewSet(ConditionalGetMixin, SparseFieldsetsMixin, viewsets.ReadOnlyModelViewSet):
     """Статичные страницы (О нас, Контакты) — только опубликованные."""
 
     queryset = Page.objects.filter(is_published=True)
     serializer_class = ContentPageSerializer
+    cache_models = (Page,)
     lookup_field = "slug"
     lookup_url_kwarg = "slug"
 
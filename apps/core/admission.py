@@ -0,0 +1,185 @@
+"""
+Очередь допуска к дорогим записям (virtual waiting room): регистрации на события.
+
+Когда открывается регистрация на популярное событие, все приходят одновременно, и
+воркеры упираются в одни и те же строки. Очередь пропускает запросы не чаще RATE в
+секунду (плюс всплеск BURST); остальные получают билет и ответ 429 с Retry-After и
+местом в очереди, а после ожидания повторяют запрос с билетом в заголовке
+X-Admission-Ticket. Число одновременных записей ограничено скоростью допуска, и
+чтение событий, новостей и страниц не ждёт свободного воркера.
+
+Билет — подписанная строка (django.core.signing) с номером, временем допуска и
+субъектом (для регистраций — пользователь и событие): состояние билета хранится в нём
+самом. Проверка билета и опрос статуса не обращаются ни к БД, ни к кэшу — только
+подпись и арифметика. В общем кэше — два значения на очередь: счётчик выданных
+номеров (incr) и начало отсчёта opened; номер n допускается в opened + (n - BURST) / RATE.
+
+Один субъект — один билет: выданный билет хранится в кэше под ключом субъекта до
+конца срока его действия, и запрос без билета получает его же, а не новый номер.
+Иначе клиент, повторяющий POST в цикле, отодвигал бы в очереди всех остальных.
+
+Если очередь простаивала, начало отсчёта сдвигается к текущему моменту, и простой
+не копится в неограниченный всплеск. Сдвиг не атомарен: при гонке время допуска
+смещается на доли интервала, ограничение скорости от этого не страдает.
+"""
+import hashlib
+import json
+import math
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.serializers import AdmissionStatusSerializer
+
+ADMISSION_HEADER = "X-Admission-Ticket"
+ADMISSION_PARAM = "ticket"
+
+
+class Ticket(NamedTuple):
+    token: str
+    number: int
+    admit_at: float
+
+    def wait(self, now=None):
+        """Секунд до допуска; 0 — допущен."""
+        return max(0.0, self.admit_at - (time.time() if now is None else now))
+
+
+class AdmissionQueue:
+    """
+    Очередь допуска scope с настройками <prefix>_RATE (в секунду; 0 — очередь выключена),
+    <prefix>_BURST (сколько запросов пропускается разом) и <prefix>_TICKET_TTL (сколько
+    секунд после допуска действует билет). Настройки читаются при каждом обращении.
+    """
+
+    def __init__(self, scope, setting_prefix):
+        self.scope = scope
+        self.setting_prefix = setting_prefix
+
+    def _setting(self, name):
+        return getattr(settings, f"{self.setting_prefix}_{name}")
+
+    @property
+    def rate(self):
+        return self._setting("RATE")
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def _key(self, name):
+        return f"core:admission:{self.scope}:{name}"
+
+    def _salt(self):
+        return f"core.admission.{self.scope}"
+
+    def _subject_key(self, subject):
+        digest = hashlib.sha256(json.dumps(subject, sort_keys=True).encode()).hexdigest()
+        return self._key(f"subject:{digest}")
+
+    def issue(self, subject):
+        """Билет субъекта: ещё действующий ранее выданный или новый в конце очереди."""
+        cache = caches[settings.ADMISSION_CACHE_ALIAS]
+        subject_key = self._subject_key(subject)
+        existing = cache.get(subject_key)
+        ticket = existing and self.check(existing, subject)
+        if ticket:
+            return ticket
+        interval = 1 / self.rate
+        issued_key, opened_key = self._key("issued"), self._key("opened")
+        cache.add(issued_key, 0, timeout=None)
+        number = cache.incr(issued_key)
+        now = time.time()
+        opened = cache.get(opened_key)
+        if opened is None or opened + (number - 1) * interval < now:
+            # Первый билет, вытесненное начало отсчёта или простой очереди.
+            opened = now - (number - 1) * interval
+            cache.set(opened_key, opened, timeout=None)
+        admit_at = opened + (number - self._setting("BURST")) * interval
+        token = signing.dumps({"s": subject, "n": number, "a": admit_at}, salt=self._salt())
+        timeout = max(1, math.ceil(admit_at + self._setting("TICKET_TTL") - now))
+        if not cache.add(subject_key, token, timeout=timeout):
+            # Параллельный запрос того же субъекта успел получить билет — отдаём его.
+            ticket = self.check(cache.get(subject_key) or "", subject)
+            if ticket:
+                return ticket
+            cache.set(subject_key, token, timeout=timeout)
+        return Ticket(token, number, admit_at)
+
+    def check(self, token, subject=None):
+        """Билет из token или None: подпись не сошлась, истёк, выдан другому субъекту."""
+        try:
+            data = signing.loads(token, salt=self._salt())
+        except signing.BadSignature:
+            return None
+        if time.time() > data["a"] + self._setting("TICKET_TTL"):
+            return None
+        if subject is not None and data["s"] != subject:
+            return None
+        return Ticket(token, data["n"], data["a"])
+
+    def admit(self, token, subject):
+        """Билет запроса: предъявленный (место в очереди сохраняется) или новый."""
+        return (token and self.check(token, subject)) or self.issue(subject)
+
+    def status(self, ticket, now=None):
+        """Состояние билета для ответа API."""
+        wait = ticket.wait(now)
+        return {
+            "ticket": ticket.token,
+            "admitted": wait == 0,
+            "position": math.ceil(wait * self.rate),
+            "retry_after": math.ceil(wait),
+        }
+
+
+def waiting_response(queue, ticket):
+    """429 с билетом, местом в очереди и Retry-After."""
+    data = queue.status(ticket)
+    return Response(
+        data, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={"Retry-After": str(max(1, data["retry_after"]))}
+    )
+
+
+class AdmissionControlMixin:
+    """
+    Очередь допуска перед create() вьюсета. admission_queue — AdmissionQueue;
+    admission_subject(request) — кому выдаётся билет (None — запрос без очереди).
+    """
+
+    admission_queue = None
+
+    def admission_subject(self, request):
+        return request.user.pk
+
+    def create(self, request, *args, **kwargs):
+        queue = self.admission_queue
+        subject = self.admission_subject(request)
+        if queue is not None and queue.enabled and subject is not None:
+            ticket = queue.admit(request.headers.get(ADMISSION_HEADER), subject)
+            if ticket.wait() > 0:
+                return waiting_response(queue, ticket)
+        return super().create(request, *args, **kwargs)
+
+
+class AdmissionStatusAPIView(APIView):
+    """
+    Опрос билета очереди допуска: GET ?ticket=... → admitted, position, retry_after.
+    Без обращений к БД и кэшу; admission_queue задаётся в подклассе.
+    """
+
+    admission_queue = None
+    serializer_class = AdmissionStatusSerializer
+
+    def get(self, request, *args, **kwargs):
+        ticket = self.admission_queue.check(request.query_params.get(ADMISSION_PARAM, ""))
+        if ticket is None:
+            raise ValidationError({ADMISSION_PARAM: "Билет недействителен или истёк — повторите запрос."})
+        return Response(AdmissionStatusSerializer(self.admission_queue.status(ticket)).data)
@@ -5,3 +5,18 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
     verbose_name = 'Ядро проекта'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+
+        from apps.core import signals
+        from apps.core.content_analysis import analyze_pending_content
+        from apps.core.markdown import markdown_models
+
+        post_migrate.connect(signals.fill_search_documents, sender=self)
+        post_migrate.connect(analyze_pending_content, sender=self)
+        # HTML из Markdown: все модели проекта с MDTextField (events.Event, news.NewsArticle, content.Page).
+        for model in markdown_models():
+            pre_save.connect(signals.remember_previous_markdown, sender=model)
+            post_save.connect(signals.render_markdown_on_save, sender=model)
+            post_delete.connect(signals.forget_markdown_on_delete, sender=model)
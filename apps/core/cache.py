@@ -0,0 +1,122 @@
+"""
+Кэши уровня процесса (воркера gunicorn) и поколения моделей для общего кэша.
+
+LocalTTLCache — небольшой LRU с временем жизни записей. Используется перед общим
+кэшем Django (settings.CACHES), чтобы горячие значения не требовали даже сетевого
+запроса к кэш-бэкенду.
+
+Поколение модели — число в общем кэше, которое меняется при каждом сохранении,
+удалении или изменении M2M её объектов (сигналы в apps.core.signals). Ключи кэша,
+в которые входят поколения, устаревают сами: старые записи больше никто не читает
+и они истекают по TTL — удалять их по одной не нужно.
+
+Поколение области (scope) — то же самое для произвольной строки вместо модели: им
+сбрасывается часть ответов модели, например календарь одного месяца
+(apps.events.calendar), а не все ответы с событиями.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+MISSING = object()
+
+
+class LocalTTLCache:
+    """Потокобезопасный LRU-кэш в памяти процесса с TTL на каждую запись."""
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _generation_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def _generation_key(model):
+    return f"core:gen:{model._meta.label_lower}"
+
+
+def _scope_generation_key(scope):
+    return f"core:gen:scope:{scope}"
+
+
+def _current_generations(keys):
+    cache = _generation_cache()
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            cache.add(key, time.time_ns(), timeout=None)
+            values[key] = cache.get(key)
+    return tuple(values[key] for key in keys)
+
+
+def _bump(key):
+    cache = _generation_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def get_generations(models):
+    """
+    Текущие поколения моделей одним запросом к кэшу.
+
+    Отсутствующее поколение (первый запуск, вытеснение из кэша) инициализируется
+    временем в наносекундах, а не нулём: иначе после вытеснения счётчик начался бы
+    заново и совпал с поколением уже устаревших записей.
+    """
+    return _current_generations([_generation_key(model) for model in models])
+
+
+def bump_generation(model):
+    """Сменить поколение модели: все ключи с прежним поколением перестают читаться."""
+    _bump(_generation_key(model))
+
+
+def get_scope_generation(scope):
+    """Текущее поколение области scope (см. get_generations)."""
+    return _current_generations([_scope_generation_key(scope)])[0]
+
+
+def bump_scope_generation(scope):
+    """Сменить поколение области scope."""
+    _bump(_scope_generation_key(scope))
@@ -0,0 +1,123 @@
+"""
+Анализ текста при сохранении: число слов, время чтения, выдержка и оглавление.
+
+Модели-наследники AnalyzedContentModel (события, новости, материалы, статичные страницы)
+пересчитывают эти поля в save() из своего основного текста (analyzed_field) и хранят
+в компактных колонках. Списки API отдают выдержку и время чтения вместо тела текста:
+поля текста в сериализаторах списков нет, и колонка не выбирается.
+
+Текст разбирается тем же конвертером Markdown, что и *_html (apps.core.markdown),
+поэтому якоря оглавления совпадают с id заголовков в HTML.
+"""
+import math
+import re
+from html import unescape
+from typing import NamedTuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.utils.html import strip_tags
+
+from apps.core.markdown import markdown_converter
+from apps.core.models import AnalyzedContentModel
+
+# Слово — буквы/цифры, в том числе через дефис или апостроф («PM-менеджер», «don't»).
+WORD_RE = re.compile(r"\w+(?:[-'’]\w+)*")
+HEADING_RE = re.compile(r"<h[1-6][^>]*>.*?</h[1-6]>", re.DOTALL)
+
+
+class ContentAnalysis(NamedTuple):
+    word_count: int
+    read_time_minutes: int
+    excerpt: str
+    toc: list
+
+
+def plain_text(html):
+    """HTML → текст без тегов и сущностей, пробелы схлопнуты."""
+    return " ".join(unescape(strip_tags(html)).split())
+
+
+def make_excerpt(text, length=AnalyzedContentModel.EXCERPT_LENGTH):
+    """Начало текста не длиннее length символов, обрезанное по границе слова, с «…»."""
+    if len(text) <= length:
+        return text
+    cut = text[: length - 1]
+    if not text[length - 1].isspace() and " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return f"{cut.rstrip(' ,;:.-—')}…"
+
+
+def flatten_toc(tokens):
+    """Дерево toc_tokens python-markdown → плоский список {level, title, anchor} в порядке текста."""
+    toc = []
+    for token in tokens:
+        toc.append({"level": token["level"], "title": unescape(token["name"]), "anchor": token["id"]})
+        toc += flatten_toc(token["children"])
+    return toc
+
+
+def analyze_content(source):
+    """Анализ текста Markdown (обычный текст — частный случай Markdown)."""
+    if not source or not source.strip():
+        return ContentAnalysis(word_count=0, read_time_minutes=0, excerpt="", toc=[])
+    converter = markdown_converter()
+    html = converter.convert(source)
+    word_count = len(WORD_RE.findall(plain_text(html)))
+    return ContentAnalysis(
+        word_count=word_count,
+        read_time_minutes=math.ceil(word_count / settings.CONTENT_READ_WORDS_PER_MINUTE),
+        # Выдержка — из абзацев: заголовки в начале текста карточке не нужны.
+        excerpt=make_excerpt(plain_text(HEADING_RE.sub(" ", html))),
+        toc=flatten_toc(converter.toc_tokens),
+    )
+
+
+def analyzed_models():
+    """Модели проекта с производными полями текста."""
+    return [
+        model
+        for model in apps.get_models()
+        if issubclass(model, AnalyzedContentModel) and model._meta.app_config.name.startswith("apps.")
+    ]
+
+
+def analyze_objects(model, only_pending=False, batch_size=500):
+    """
+    Пересчитать производные поля объектов model пачками (bulk_update, без сигналов
+    и без смены updated_at). only_pending — только ещё не проанализированные (word_count IS NULL).
+    Возвращает число обработанных объектов.
+    """
+    queryset = model._default_manager.order_by("pk").only("pk", model.analyzed_field)
+    if only_pending:
+        queryset = queryset.filter(word_count__isnull=True)
+    processed = 0
+    batch = []
+    for obj in queryset.iterator(chunk_size=batch_size):
+        obj.apply_content_analysis()
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model._default_manager.bulk_update(batch, AnalyzedContentModel.ANALYSIS_FIELDS)
+            processed += len(batch)
+            batch = []
+    if batch:
+        model._default_manager.bulk_update(batch, AnalyzedContentModel.ANALYSIS_FIELDS)
+        processed += len(batch)
+    return processed
+
+
+def analyze_pending_content(sender, **kwargs):
+    """
+    post_migrate: проанализировать объекты, сохранённые до появления полей (первый деплой
+    на существующей БД). Дальше поля пересчитываются в save().
+    """
+    tables = connection.introspection.table_names()
+    for model in analyzed_models():
+        table = model._meta.db_table
+        if table not in tables:
+            continue
+        with connection.cursor() as cursor:
+            columns = {column.name for column in connection.introspection.get_table_description(cursor, table)}
+        if "word_count" in columns:  # нет после отката миграций приложения
+            analyze_objects(model, only_pending=True)
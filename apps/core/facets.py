@@ -0,0 +1,90 @@
+"""
+Фасеты списков: сколько объектов текущей выборки приходится на каждое значение
+тега, статуса, формата, города, категории.
+
+?facets=tags,status добавляет в ответ списка блок
+
+    "facets": {"tags": [{"value": "agile", "count": 12}, ...], "status": [...]}
+
+Все запрошенные фасеты считаются одним SQL-запросом: по GROUP BY на фасет,
+объединённые UNION ALL, над той же выборкой, что и список (фильтры, поиск, теги),
+без пагинации. Значения фасета — по убыванию числа объектов, не больше FACET_MAX_VALUES.
+"""
+from django.db.models import CharField, Count, F, Value
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+
+FACETS_PARAM = "facets"
+FACET_MAX_VALUES = 50
+
+
+def parse_facets(query_params, available):
+    """Имена фасетов из ?facets= (через запятую); неизвестное имя — 400."""
+    names = list(dict.fromkeys(name.strip() for name in query_params.get(FACETS_PARAM, "").split(",")))
+    names = [name for name in names if name]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValidationError(
+            {FACETS_PARAM: f"Неизвестные фасеты: {', '.join(unknown)}. Доступны: {', '.join(available)}."}
+        )
+    return names
+
+
+def facet_counts(queryset, facets):
+    """
+    {имя: [{"value", "count"}, ...]} для facets = {имя: путь поля} над queryset одним запросом.
+    Путь может идти через M2M (tags__slug): объект считается в каждом своём теге.
+    """
+    base = queryset.order_by()
+    if base.query.annotations:
+        # Выборка с аннотациями (ранг поиска) — подзапросом по pk, иначе они попадут в GROUP BY.
+        base = queryset.model._default_manager.filter(pk__in=base.values("pk"))
+    parts = [
+        base.filter(**{f"{path}__isnull": False})
+        .order_by()
+        .values(facet=Value(name, output_field=CharField()), facet_value=F(path))
+        .annotate(facet_count=Count("pk"))
+        .order_by("-facet_count", "facet_value")[:FACET_MAX_VALUES]
+        for name, path in facets.items()
+    ]
+    result = {name: [] for name in facets}
+    if not parts:
+        return result
+    for row in parts[0].union(*parts[1:], all=True):
+        if row["facet_value"] != "":
+            result[row["facet"]].append({"value": row["facet_value"], "count": row["facet_count"]})
+    return result
+
+
+def facets_parameter(facet_fields):
+    """Параметр ?facets= для OpenAPI со списком фасетов вьюсета."""
+    return OpenApiParameter(
+        name=FACETS_PARAM,
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description=(
+            f"Фасеты через запятую ({', '.join(facet_fields)}): блок facets в ответе — "
+            "число объектов выборки на каждое значение."
+        ),
+    )
+
+
+class FacetsMixin:
+    """
+    Блок facets в ответе list по ?facets=. Ставится после CachedResponseMixin (фасеты
+    кэшируются вместе со страницей); facet_fields — {имя фасета: путь поля}:
+
+        facet_fields = {"status": "status", "tags": "tags__slug"}
+    """
+
+    facet_fields = {}
+
+    def list(self, request, *args, **kwargs):
+        names = parse_facets(request.query_params, self.facet_fields)
+        response = super().list(request, *args, **kwargs)
+        if names and isinstance(response.data, dict):
+            queryset = self.filter_queryset(self.get_queryset())
+            response.data[FACETS_PARAM] = facet_counts(
+                queryset, {name: self.facet_fields[name] for name in names}
+            )
+        return response
@@ -0,0 +1,41 @@
+"""
+Пересчёт производных полей текста: число слов, время чтения, выдержка, оглавление.
+
+Обычно не нужна: поля пересчитываются при сохранении объекта, а объекты без анализа
+заполняются при migrate. Пригодится после изменения CONTENT_READ_WORDS_PER_MINUTE,
+правил анализа или загрузки текстов в обход ORM (SQL, bulk_update).
+
+Использование:
+  python manage.py analyze_content
+  python manage.py analyze_content --model news.NewsArticle --pending
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core.content_analysis import analyze_objects, analyzed_models
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает число слов, время чтения, выдержку и оглавление текстов."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            choices=[model._meta.label for model in analyzed_models()],
+            help="Модель (можно указать несколько раз); по умолчанию — все.",
+        )
+        parser.add_argument(
+            "--pending",
+            action="store_true",
+            help="Только объекты, которые ещё не анализировались.",
+        )
+
+    def handle(self, *args, **options):
+        labels = options["models"]
+        for model in analyzed_models():
+            if labels and model._meta.label not in labels:
+                continue
+            processed = analyze_objects(model, only_pending=options["pending"])
+            self.stdout.write(f"  {model._meta.verbose_name_plural}: {processed}")
+        self.stdout.write(self.style.SUCCESS("Анализ текстов обновлён."))
@@ -0,0 +1,42 @@
+"""
+Полная пересборка таблиц поиска: документов (SearchDocument) и подсказок (SearchSuggestion).
+
+Обычно не нужна: документы обновляются сигналами при сохранении событий, новостей,
+материалов, тегов, спикеров и категорий. Пригодится после массовой загрузки данных
+в обход ORM (SQL, bulk_update) или при изменении состава полей документа.
+
+Использование:
+  python manage.py rebuild_search_documents
+  python manage.py rebuild_search_documents --kind event --kind news
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core.models import SearchDocument, SearchSuggestion
+from apps.core.search import rebuild_documents, rebuild_suggestions
+
+
+class Command(BaseCommand):
+    help = "Пересобирает поисковые документы (SearchDocument) и подсказки (SearchSuggestion)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            action="append",
+            dest="kinds",
+            choices=[kind for kind, _ in SearchSuggestion.KIND_CHOICES],
+            help="Тип объектов (можно указать несколько раз); по умолчанию — все.",
+        )
+
+    def handle(self, *args, **options):
+        kinds = options["kinds"] or [kind for kind, _ in SearchSuggestion.KIND_CHOICES]
+        document_kinds = [kind for kind, _ in SearchDocument.KIND_CHOICES if kind in kinds]
+        if document_kinds:
+            rebuild_documents(document_kinds)
+        rebuild_suggestions(kinds)
+        for kind, label in SearchSuggestion.KIND_CHOICES:
+            if kind not in kinds:
+                continue
+            documents = SearchDocument.objects.filter(kind=kind).count()
+            suggestions = SearchSuggestion.objects.filter(kind=kind).count()
+            self.stdout.write(f"  {label}: документов {documents}, подсказок {suggestions}")
+        self.stdout.write(self.style.SUCCESS("Поисковые документы и подсказки пересобраны."))
@@ -0,0 +1,34 @@
+"""
+Сверка сводок регистраций событий (EventStats) с самими регистрациями.
+
+Сводки ведутся приращениями при сохранении и удалении регистраций. Команда нужна
+после изменений регистраций в обход ORM (SQL, queryset.update) или для проверки:
+расходящиеся и недостающие сводки пересчитываются и записываются.
+
+Использование:
+  python manage.py reconcile_event_stats
+  python manage.py reconcile_event_stats --event tech-conference-2025
+"""
+from django.core.management.base import BaseCommand
+
+from apps.events.models import Event
+from apps.events.stats import reconcile_stats
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает сводки регистраций событий и исправляет расхождения."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            action="append",
+            dest="events",
+            help="Slug события (можно указать несколько раз); по умолчанию — все события.",
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.all()
+        if options["events"]:
+            events = events.filter(slug__in=options["events"])
+        fixed = reconcile_stats(events)
+        self.stdout.write(self.style.SUCCESS(f"Сводки событий сверены, исправлено: {fixed}."))
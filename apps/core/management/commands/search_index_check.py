@@ -0,0 +1,158 @@
+"""
+Проверка здоровья поисковых индексов (pg_trgm).
+
+1. Все trigram-индексы (gin_trgm_ops, gist_trgm_ops) из Meta.indexes моделей существуют в БД
+   и валидны. Поиск и подсказки идут по SearchDocument и SearchSuggestion, поэтому
+   trigram-индексы объявлены только у них; у исходных моделей их нет.
+2. EXPLAIN реальных поисковых querysets (get_queryset() вьюсетов events/news/materials)
+   во всех режимах search_mode не содержит Seq Scan по таблицам крупнее порога --max-seq-rows.
+
+Использование:
+  python manage.py search_index_check
+  python manage.py search_index_check --query "менеджмент" --query "agile" --max-seq-rows 5000
+  python manage.py search_index_check --mode fulltext
+Код выхода ≠ 0 (CommandError), если проверка не пройдена — удобно для CI и деплоя.
+"""
+import json
+
+from django.apps import apps
+from django.contrib.postgres.indexes import OpClass
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils.module_loading import import_string
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.core.search import SEARCH_MODES, search_transaction
+
+# (название, вьюсет, URL списка) — те же querysets, что строит API при ?search=...
+SEARCH_ENDPOINTS = [
+    ("events", "apps.events.views.EventViewSet", "/api/v1/events/events/"),
+    ("news", "apps.news.views.NewsArticleViewSet", "/api/v1/news/articles/"),
+    ("materials", "apps.materials.views.MaterialViewSet", "/api/v1/materials/materials/"),
+]
+
+
+def trigram_indexes():
+    """Имена всех trigram-индексов, объявленных в Meta.indexes моделей проекта."""
+    names = []
+    for model in apps.get_models():
+        for index in model._meta.indexes:
+            opclasses = list(index.opclasses)
+            opclasses += [expr.extra["name"] for expr in index.expressions if isinstance(expr, OpClass)]
+            # gist_trgm_ops(siglen=64) → gist_trgm_ops
+            if {"gin_trgm_ops", "gist_trgm_ops"} & {opclass.split("(")[0] for opclass in opclasses}:
+                names.append(index.name)
+    return sorted(names)
+
+
+def seq_scans(plan):
+    """Все узлы Seq Scan плана EXPLAIN (FORMAT JSON): список имён таблиц."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", ()):
+        found.extend(seq_scans(child))
+    return found
+
+
+def table_rows(table):
+    """Оценка числа строк из pg_class (без COUNT); для непроанализированных таблиц — COUNT(*)."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+        row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+        cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+        return cursor.fetchone()[0]
+
+
+class Command(BaseCommand):
+    help = "Проверяет trigram-индексы и планы поисковых запросов events/news/materials (EXPLAIN)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="queries",
+            help="Поисковая строка для EXPLAIN (можно указать несколько раз).",
+        )
+        parser.add_argument(
+            "--mode",
+            action="append",
+            dest="modes",
+            choices=SEARCH_MODES,
+            help="Режим search_mode для EXPLAIN (по умолчанию все).",
+        )
+        parser.add_argument(
+            "--min-rank",
+            default="0.12",
+            help="Значение min_rank для поисковых запросов (по умолчанию 0.12).",
+        )
+        parser.add_argument(
+            "--max-seq-rows",
+            type=int,
+            default=1000,
+            help="Seq Scan допустим только по таблицам не больше этого числа строк (по умолчанию 1000).",
+        )
+
+    def handle(self, *args, **options):
+        queries = options["queries"] or ["менеджмент", "meetup"]
+        problems = self._check_indexes()
+        modes = options["modes"] or SEARCH_MODES
+        for query in queries:
+            for mode in modes:
+                problems += self._check_plans(
+                    query, mode, options["min_rank"], options["max_seq_rows"]
+                )
+
+        if problems:
+            for problem in problems:
+                self.stderr.write(self.style.ERROR(f"  ✗ {problem}"))
+            raise CommandError(f"Проверка поисковых индексов не пройдена: {len(problems)} проблем(ы).")
+        self.stdout.write(self.style.SUCCESS("Поисковые индексы в порядке."))
+
+    def _check_indexes(self):
+        expected = trigram_indexes()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT c.relname
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = ANY(%s) AND i.indisvalid
+                """,
+                [expected],
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+        problems = []
+        for name in expected:
+            if name in existing:
+                self.stdout.write(f"  ✓ индекс {name}")
+            else:
+                problems.append(f"индекс {name} отсутствует или невалиден (migrate?)")
+        return problems
+
+    def _check_plans(self, query, mode, min_rank, max_seq_rows):
+        factory = APIRequestFactory()
+        problems = []
+        for label, viewset_path, url in SEARCH_ENDPOINTS:
+            view = import_string(viewset_path)()
+            params = {"search": query, "search_mode": mode, "min_rank": min_rank}
+            view.request = Request(factory.get(url, params))
+            view.action = "list"
+            view.format_kwarg = None
+            with search_transaction():  # порог %>> ставится до конца транзакции
+                queryset = view.filter_queryset(view.get_queryset())
+                plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+            bad = []
+            for table in sorted(set(seq_scans(plan))):
+                rows = table_rows(table)
+                if rows > max_seq_rows:
+                    bad.append(f"{table} (~{rows} строк)")
+            target = f"{label} ?search={query!r}&search_mode={mode}"
+            if bad:
+                problems.append(f"{target}: Seq Scan по {', '.join(bad)}")
+            else:
+                self.stdout.write(f"  ✓ {target}: без Seq Scan по крупным таблицам")
+        return problems
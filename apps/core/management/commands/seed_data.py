@@ -420,7 +420,6 @@ Tech Conference 2025 в очередной раз доказала: будуще
                 "Более 200 участников собрались на крупнейшей технологической конференции года. Обсуждали тренды и перспективы развития отрасли.",
                 content_tech,
                 timezone.make_aware(datetime(2025, 1, 10, 12, 0)),
-                3,
                 tags_tech,
             ),
             (
@@ -429,7 +428,6 @@ Tech Conference 2025 в очередной раз доказала: будуще
                 "К нашему сообществу присоединились 5 новых компаний партнеров, которые будут поддерживать развитие профессионального комьюнити.",
                 "К нашему сообществу присоединились 5 новых компаний партнеров. Они будут поддерживать развитие профессионального комьюнити и совместные мероприятия.",
                 timezone.make_aware(datetime(2025, 1, 10, 12, 0)),
-                3,
                 tags_partners,
             ),
             (
@@ -438,11 +436,10 @@ Tech Conference 2025 в очередной раз доказала: будуще
                 "Стартует новая программа наставничества для молодых специалистов. Опытные профессионалы поделятся знаниями и помогут в карьерном развитии.",
                 "Стартует новая программа наставничества для молодых специалистов. Опытные профессионалы поделятся знаниями и помогут в карьерном развитии.",
                 timezone.make_aware(datetime(2025, 1, 10, 12, 0)),
-                3,
                 tags_mentor,
             ),
         ]
-        for title, slug, short, content, pub_date, read_m, tag_list in data:
+        for title, slug, short, content, pub_date, tag_list in data:
             art, _ = NewsArticle.objects.get_or_create(
                 slug=slug,
                 defaults={
@@ -450,7 +447,6 @@ Tech Conference 2025 в очередной раз доказала: будуще
                     "short_description": short,
                     "content": content,
                     "publication_date": pub_date,
-                    "read_time_minutes": read_m,
                     "author": author,
                     "is_published": True,
                 },
@@ -0,0 +1,115 @@
+"""
+Markdown → очищенный HTML для полей MDTextField (описание события, текст новости,
+содержимое статичной страницы).
+
+Рендер (python-markdown) и очистка (nh3) выполняются один раз на текст: результат
+хранится в таблице RenderedMarkdown под sha256 текста и в LRU воркера перед ней.
+Повторные запросы деталей берут готовый HTML из памяти процесса, после перезапуска —
+одним запросом по первичному ключу. Сигналы (apps.core.signals) при сохранении
+объекта сразу рендерят новый текст и удаляют строку прежнего, если тот же текст не
+остался у другого объекта (копии события, серии, дубли из админки).
+"""
+import hashlib
+
+import markdown
+import nh3
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Q
+from markdown.extensions.toc import TocExtension, slugify_unicode
+from mdeditor.fields import MDTextField
+
+from apps.core.cache import MISSING, LocalTTLCache
+from apps.core.models import RenderedMarkdown
+
+# Менять при любом изменении конвейера (расширения, правила очистки): старые записи
+# перестанут совпадать по хешу и будут отрендерены заново.
+RENDERER_VERSION = 2
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists"]
+# Заголовкам — id из текста (кириллица сохраняется): на них ссылается оглавление toc
+# (apps.core.content_analysis), поэтому id переживают очистку nh3.
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+ALLOWED_ATTRIBUTES = {
+    **{tag: set(attributes) for tag, attributes in nh3.ALLOWED_ATTRIBUTES.items()},
+    **{tag: {*nh3.ALLOWED_ATTRIBUTES.get(tag, ()), "id"} for tag in HEADING_TAGS},
+}
+
+_local_html = LocalTTLCache(
+    maxsize=settings.MARKDOWN_CACHE_LOCAL_MAXSIZE,
+    ttl=settings.MARKDOWN_CACHE_LOCAL_TTL,
+)
+
+
+def markdown_digest(source):
+    return hashlib.sha256(f"{RENDERER_VERSION}\n{source}".encode()).hexdigest()
+
+
+def markdown_converter():
+    """Конвертер python-markdown проекта; после convert() в toc_tokens — дерево заголовков."""
+    return markdown.Markdown(
+        extensions=[*MARKDOWN_EXTENSIONS, TocExtension(slugify=slugify_unicode)],
+        output_format="html",
+    )
+
+
+def render_to_html(source):
+    """Рендер без кэша: Markdown → HTML → nh3 (без script/style/on*-атрибутов и javascript:-ссылок)."""
+    html = markdown_converter().convert(source)
+    return nh3.clean(html, attributes=ALLOWED_ATTRIBUTES, link_rel="noopener noreferrer")
+
+
+def render_markdown(source):
+    """Очищенный HTML для текста Markdown; рендерится только при первом обращении к этому тексту."""
+    if not source:
+        return ""
+    digest = markdown_digest(source)
+    html = _local_html.get(digest)
+    if html is not MISSING:
+        return html
+    html = RenderedMarkdown.objects.filter(digest=digest).values_list("html", flat=True).first()
+    if html is None:
+        html = render_to_html(source)
+        # ignore_conflicts: параллельный запрос мог уже сохранить тот же текст.
+        RenderedMarkdown.objects.bulk_create(
+            [RenderedMarkdown(digest=digest, html=html)], ignore_conflicts=True
+        )
+    _local_html.set(digest, html)
+    return html
+
+
+def markdown_in_use(source):
+    """Есть ли объект с этим текстом в каком-либо поле MDTextField (по одному запросу на модель)."""
+    for model in markdown_models():
+        query = Q()
+        for name in markdown_fields(model):
+            query |= Q(**{name: source})
+        if model._default_manager.filter(query).exists():
+            return True
+    return False
+
+
+def forget_markdown(source):
+    """
+    Удалить HTML прежнего текста (после изменения поля или удаления объекта). Вызывается
+    после записи, поэтому сам объект уже не учитывается; строка, которую разделяют
+    другие объекты с тем же текстом, остаётся.
+    """
+    if not source or markdown_in_use(source):
+        return
+    digest = markdown_digest(source)
+    _local_html.delete(digest)
+    RenderedMarkdown.objects.filter(digest=digest).delete()
+
+
+def markdown_fields(model):
+    """Имена полей MDTextField модели."""
+    return [field.name for field in model._meta.concrete_fields if isinstance(field, MDTextField)]
+
+
+def markdown_models():
+    """Модели проекта с полями MDTextField — для них подключаются сигналы рендера."""
+    return [
+        model
+        for model in apps.get_models()
+        if model._meta.app_config.name.startswith("apps.") and markdown_fields(model)
+    ]
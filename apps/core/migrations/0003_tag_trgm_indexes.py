@@ -0,0 +1,34 @@
+"""
+Триграммные индексы тегов: поиск событий/новостей фильтрует по tags__name/tags__slug
+(icontains → UPPER(...) LIKE '%...%'), поэтому индексы выражений по UPPER(...).
+"""
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ("core", "0002_enable_pg_trgm"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="tag",
+            index=GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="core_tag_name_trgm",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="tag",
+            index=GinIndex(
+                OpClass(Upper("slug"), name="gin_trgm_ops"),
+                name="core_tag_slug_trgm",
+            ),
+        ),
+    ]
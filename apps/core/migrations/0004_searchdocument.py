@@ -0,0 +1,31 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_tag_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('event', 'Событие'), ('news', 'Новость'), ('material', 'Материал')], max_length=20, verbose_name='Тип объекта')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID объекта')),
+                ('title', models.CharField(max_length=300, verbose_name='Заголовок')),
+                ('text', models.TextField(blank=True, verbose_name='Текст для поиска')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Полнотекстовый вектор')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлён')),
+            ],
+            options={
+                'verbose_name': 'Поисковый документ',
+                'verbose_name_plural': 'Поисковые документы',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['text'], name='core_searchdoc_text_trgm', opclasses=['gin_trgm_ops']), django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='core_searchdoc_vector_gin')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='core_searchdoc_kind_object_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_searchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('event', 'Событие'), ('news', 'Новость'), ('material', 'Материал'), ('speaker', 'Спикер'), ('tag', 'Тег')], max_length=20, verbose_name='Тип объекта')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID объекта')),
+                ('text', models.CharField(max_length=300, verbose_name='Текст подсказки')),
+                ('normalized', models.CharField(max_length=300, verbose_name='Текст в нижнем регистре')),
+                ('lookup', models.CharField(max_length=300, verbose_name='slug или id для URL деталей')),
+            ],
+            options={
+                'verbose_name': 'Поисковая подсказка',
+                'verbose_name_plural': 'Поисковые подсказки',
+                'indexes': [models.Index(fields=['normalized'], name='core_suggest_prefix', opclasses=['varchar_pattern_ops']), django.contrib.postgres.indexes.GistIndex(fields=['normalized'], name='core_suggest_trgm', opclasses=['gist_trgm_ops(siglen=64)'])],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='core_suggest_kind_object_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_searchsuggestion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderedMarkdown',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='Хеш исходного текста')),
+                ('html', models.TextField(verbose_name='HTML')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создан')),
+            ],
+            options={
+                'verbose_name': 'HTML из Markdown',
+                'verbose_name_plural': 'HTML из Markdown',
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_renderedmarkdown'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tag',
+            name='core_tag_name_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='tag',
+            name='core_tag_slug_trgm',
+        ),
+    ]
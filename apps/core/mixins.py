@@ -0,0 +1,302 @@
+"""
+Кэш ответов API и условные GET (ETag / Last-Modified) для read-only вьюсетов.
+
+CachedResponseMixin кэширует готовые данные ответа list/retrieve (после сериализации)
+в общем кэше Django. Ключ — хост + путь + отсортированные query-параметры и поколения
+моделей из cache_models (apps.core.cache). Поколение меняется сигналами post_save /
+post_delete / m2m_changed, поэтому после правки в админке следующий запрос собирает
+ответ заново, а повторные чтения не обращаются ни к БД, ни к сериализаторам.
+
+ConditionalGetMixin отвечает 304 Not Modified без сериализации, если клиент прислал
+актуальный If-None-Match / If-Modified-Since (см. conditional_get).
+
+SparseFieldsetsMixin — проекция ответа (?fields= / ?omit=) и выборка строк по плану
+сериализатора (apps.core.planner): связи и колонки ровно под выводимые поля.
+
+Права доступа проверяются до list()/retrieve() (APIView.initial), кэш их не обходит.
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from drf_spectacular.openapi import AutoSchema
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from apps.core.cache import get_generations
+from apps.core.planner import nested_serializer, plan_queryset
+
+
+def normalized_request_key(request):
+    """Хост + путь + отсортированные query-параметры: одинаковые запросы дают одинаковый ключ."""
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    return f"{request.get_host()}{request.path}?{query}"
+
+
+def response_validators(request, queryset, models):
+    """
+    (ETag, Last-Modified в секундах) для ответа на queryset — один агрегатный запрос.
+
+    Last-Modified — MAX(updated_at) строк ответа. ETag — хеш запроса, MAX(updated_at),
+    COUNT (ловит удаление) и поколений models (ловят изменения M2M и связанных
+    объектов, которые не трогают updated_at).
+    """
+    validators = queryset.order_by().aggregate(last_modified=Max("updated_at"), count=Count("pk"))
+    last_modified = validators["last_modified"]
+    raw = "|".join(
+        [
+            normalized_request_key(request),
+            str(validators["count"]),
+            last_modified.isoformat() if last_modified else "",
+            ".".join(str(generation) for generation in get_generations(models)),
+        ]
+    )
+    etag = quote_etag(hashlib.sha256(raw.encode()).hexdigest()[:32])
+    return etag, int(last_modified.timestamp()) if last_modified else None
+
+
+def conditional_response(request, validators, build, *args, **kwargs):
+    """
+    Совпал If-None-Match / If-Modified-Since — 304 без вызова build() (без сериализации),
+    иначе ответ build() с заголовками ETag и Last-Modified.
+    """
+    etag, last_modified = validators
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = build(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    # Браузер и nginx не отдают ответ из своего кэша без перепроверки по ETag.
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def conditional_get(request, queryset, models, build, *args, **kwargs):
+    """Условный GET для ответа на queryset (для APIView без ConditionalGetMixin)."""
+    validators = response_validators(request, queryset, models)
+    return conditional_response(request, validators, build, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Условные GET для list/retrieve; ставится первым, перед CachedResponseMixin:
+
+        class TagViewSet(ConditionalGetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+
+    Модель должна иметь updated_at (TimeStampedModel); cache_models участвуют в ETag.
+    Вместе с CachedResponseMixin валидаторы хранятся рядом с данными ответа: при
+    попадании в кэш и 200, и 304 отдаются без запросов к БД.
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(
+            request, lambda: self.filter_queryset(self.get_queryset()), super().list, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self._conditional(
+            request,
+            lambda: self.get_queryset().filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}),
+            super().retrieve,
+            *args,
+            **kwargs,
+        )
+
+    def _conditional(self, request, get_queryset, build, *args, **kwargs):
+        cached_validators = getattr(self, "cached_validators", None)
+        validators = cached_validators(request) if cached_validators else None
+        if validators is None:
+            validators = response_validators(request, get_queryset(), self.cache_models)
+        self.response_validators = validators
+        return conditional_response(request, validators, build, *args, **kwargs)
+
+
+class CachedResponseMixin:
+    """
+    Подмешивается перед ReadOnlyModelViewSet:
+
+        class TagViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+            cache_models = (Tag,)
+
+    cache_models — все модели, чьи поля попадают в ответ (включая вложенные сериализаторы).
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
+
+    def get_response_cache_key(self, request):
+        raw = normalized_request_key(request)
+        generations = ".".join(str(generation) for generation in get_generations(self.cache_models))
+        digest = hashlib.sha256(raw.encode()).hexdigest()
+        return f"core:resp:{type(self).__name__}:{self.action}:{generations}:{digest}"
+
+    def _cache_enabled(self):
+        return bool(settings.RESPONSE_CACHE_TTL and self.cache_models)
+
+    def _cached_entry(self, request):
+        if not self._cache_enabled():
+            return None
+        return caches[settings.RESPONSE_CACHE_ALIAS].get(self.get_response_cache_key(request))
+
+    def cached_validators(self, request):
+        """ETag/Last-Modified закэшированного ответа (для ConditionalGetMixin) или None."""
+        entry = self._cached_entry(request)
+        return entry["validators"] if entry else None
+
+    def cached_response(self, request, build, *args, **kwargs):
+        entry = self._cached_entry(request)
+        if entry is not None:
+            return Response(entry["data"])
+        response = build(request, *args, **kwargs)
+        if response.status_code == 200 and self._cache_enabled():
+            entry = {"data": response.data, "validators": getattr(self, "response_validators", None)}
+            caches[settings.RESPONSE_CACHE_ALIAS].set(
+                self.get_response_cache_key(request), entry, settings.RESPONSE_CACHE_TTL
+            )
+        return response
+
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+INCLUDE_PARAM = "include"
+
+
+def parse_fieldset(value):
+    """'id,title,speakers.full_name' → {"id": {}, "title": {}, "speakers": {"full_name": {}}}."""
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for name in path.split("."):
+            name = name.strip()
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+def project_fields(serializer, only, omit, extra=None, path=""):
+    """
+    Оставить в serializer.fields только only (если задан) и убрать omit. Вложенные
+    поля проецируются по дочерним узлам: fields=speakers.full_name оставляет у спикеров
+    только full_name, omit=speakers.bio убирает у них bio. Неизвестное поле — 400.
+
+    Поля из Meta.optional_fields (тяжёлые, например description_html) выводятся, только
+    если названы в only или extra (?include=).
+    """
+    extra = extra or {}
+    fields = serializer.fields
+    unknown = (set(only) | set(omit) | set(extra)) - set(fields)
+    if unknown:
+        names = ", ".join(sorted(f"{path}{name}" for name in unknown))
+        raise ValidationError({FIELDS_PARAM: f"Неизвестные поля: {names}."})
+    optional = set(getattr(getattr(serializer, "Meta", None), "optional_fields", ()))
+    for name in list(fields):
+        if (
+            (only and name not in only)
+            or (name in omit and not omit[name])
+            or (name in optional and name not in only and name not in extra)
+        ):
+            del fields[name]
+            continue
+        sub_only, sub_omit, sub_extra = only.get(name, {}), omit.get(name, {}), extra.get(name, {})
+        if sub_only or sub_omit or sub_extra:
+            nested = nested_serializer(fields[name])
+            if nested is None:
+                raise ValidationError({FIELDS_PARAM: f"Поле {path}{name} не содержит вложенных полей."})
+            project_fields(nested, sub_only, sub_omit, sub_extra, f"{path}{name}.")
+
+
+class SparseFieldsetsSchema(AutoSchema):
+    """Параметры fields/omit в Swagger для GET-эндпоинтов с SparseFieldsetsMixin."""
+
+    def get_override_parameters(self):
+        parameters = super().get_override_parameters()
+        if self.method != "GET":
+            return parameters
+        return [
+            *parameters,
+            OpenApiParameter(
+                name=FIELDS_PARAM,
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Только эти поля через запятую; вложенные — через точку "
+                    "(например: id,title,speakers.full_name)."
+                ),
+            ),
+            OpenApiParameter(
+                name=OMIT_PARAM,
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Убрать поля через запятую; вложенные — через точку (например: description,speakers.bio).",
+            ),
+            OpenApiParameter(
+                name=INCLUDE_PARAM,
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Добавить необязательные поля, которых нет в ответе по умолчанию "
+                    "(например: description_html — очищенный HTML из Markdown)."
+                ),
+            ),
+        ]
+
+
+class SparseFieldsetsMixin:
+    """
+    ?fields= / ?omit= / ?include= и план выборки для list/retrieve:
+
+        class EventViewSet(ConditionalGetMixin, CachedResponseMixin, SparseFieldsetsMixin,
+                           viewsets.ReadOnlyModelViewSet):
+
+    Проекция применяется к сериализатору (get_serializer). Queryset страницы
+    (paginate_queryset) и объекта деталей (get_object) строится планировщиком
+    (apps.core.planner) по активному — уже спроецированному — сериализатору:
+    select_related / prefetch_related / only() ровно под выводимые поля, плюс ключи
+    cursor_ordering, которые читает курсорная пагинация. Связи в get_queryset()
+    вьюсета перечислять не нужно: число запросов не зависит от размера выдачи.
+    """
+
+    schema = SparseFieldsetsSchema()
+
+    def sparse_fieldsets(self):
+        params = self.request.query_params
+        return tuple(
+            parse_fieldset(params.get(param, "")) for param in (FIELDS_PARAM, OMIT_PARAM, INCLUDE_PARAM)
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        project_fields(nested_serializer(serializer), *self.sparse_fieldsets())
+        return serializer
+
+    def planned_queryset(self, queryset):
+        cursor_fields = [name.lstrip("-") for name in getattr(self, "cursor_ordering", ())]
+        return plan_queryset(queryset, self.get_serializer(), cursor_fields)
+
+    def paginate_queryset(self, queryset):
+        return super().paginate_queryset(self.planned_queryset(queryset))
+
+    def get_object(self):
+        # Как GenericAPIView.get_object(), но с планом выборки под сериализатор.
+        queryset = self.planned_queryset(self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, obj)
+        return obj
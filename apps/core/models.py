@@ -1,6 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.crypto import get_random_string
-from django.utils.text import slugify
+
+from apps.core.slugs import save_with_unique_slug, slug_base
 
 
 class TimeStampedModel(models.Model):
@@ -11,6 +14,62 @@ class TimeStampedModel(models.Model):
         abstract = True
 
 
+class AutoSlugModel(models.Model):
+    """
+    Пустой slug при сохранении подбирается из поля slug_source: base, base-2, ... одним
+    запросом, конфликт с параллельной записью — повторный подбор (apps.core.slugs).
+    Заданный вручную slug сохраняется как есть.
+    """
+    slug_source = None
+
+    class Meta:
+        abstract = True
+
+    def slug_base(self):
+        return slug_base(getattr(self, self.slug_source), fallback=self._meta.model_name)
+
+    def save(self, *args, **kwargs):
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            save_with_unique_slug(self, super().save, *args, **kwargs)
+
+
+class AnalyzedContentModel(models.Model):
+    """
+    Производные поля основного текста модели (analyzed_field): число слов, время чтения,
+    выдержка для карточек и оглавление по заголовкам. Пересчитываются в save(), если
+    сохраняется сам текст (см. apps.core.content_analysis). word_count = NULL — объект
+    ещё не анализировался (заполняется при migrate).
+    """
+    EXCERPT_LENGTH = 300
+    ANALYSIS_FIELDS = ("word_count", "read_time_minutes", "excerpt", "toc")
+    analyzed_field = None
+
+    word_count = models.PositiveIntegerField("Слов в тексте", null=True, blank=True, editable=False)
+    read_time_minutes = models.PositiveIntegerField("Время чтения (мин)", default=0, editable=False)
+    excerpt = models.CharField("Выдержка", max_length=EXCERPT_LENGTH, blank=True, editable=False)
+    toc = models.JSONField("Оглавление", default=list, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or self.analyzed_field in update_fields:
+            self.apply_content_analysis()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *self.ANALYSIS_FIELDS}
+        super().save(*args, **kwargs)
+
+    def apply_content_analysis(self):
+        from apps.core.content_analysis import analyze_content  # модуль импортирует эту модель
+
+        analysis = analyze_content(getattr(self, self.analyzed_field))
+        for name, value in analysis._asdict().items():
+            setattr(self, name, value)
+
+
 class ApiKey(models.Model):
     name = models.CharField("Название ключа", max_length=120, unique=True)
     key = models.CharField("Токен", max_length=40, unique=True, editable=False)
@@ -31,8 +90,10 @@ class ApiKey(models.Model):
         super().save(*args, **kwargs)
 
 
-class Tag(TimeStampedModel):
+class Tag(AutoSlugModel, TimeStampedModel):
     """Общие теги для событий и новостей."""
+    slug_source = "name"
+
     name = models.CharField("Название", max_length=100)
     slug = models.SlugField("URL-путь", max_length=120, unique=True)
 
@@ -44,7 +105,110 @@ class Tag(TimeStampedModel):
     def __str__(self):
         return self.name
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name, allow_unicode=True)
-        super().save(*args, **kwargs)
\ No newline at end of file
+
+class SearchDocument(models.Model):
+    """
+    Денормализованный поисковый документ: одна строка на Event / NewsArticle / Material.
+
+    text — заранее склеенный и нормализованный текст всех полей поиска (включая имена
+    спикеров, теги, категорию), поэтому поиск идёт по одной индексированной таблице без
+    JOIN и DISTINCT. Поддерживается сигналами моделей (см. apps.core.search).
+    """
+    KIND_EVENT = "event"
+    KIND_NEWS = "news"
+    KIND_MATERIAL = "material"
+    KIND_CHOICES = [
+        (KIND_EVENT, "Событие"),
+        (KIND_NEWS, "Новость"),
+        (KIND_MATERIAL, "Материал"),
+    ]
+
+    kind = models.CharField("Тип объекта", max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField("ID объекта")
+    title = models.CharField("Заголовок", max_length=300)
+    text = models.TextField("Текст для поиска", blank=True)
+    search_vector = SearchVectorField("Полнотекстовый вектор", null=True, editable=False)
+    updated_at = models.DateTimeField("Обновлён", auto_now=True)
+
+    class Meta:
+        verbose_name = "Поисковый документ"
+        verbose_name_plural = "Поисковые документы"
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="core_searchdoc_kind_object_uniq"),
+        ]
+        indexes = [
+            GinIndex(
+                fields=["text"], name="core_searchdoc_text_trgm", opclasses=["gin_trgm_ops"]
+            ),
+            GinIndex(fields=["search_vector"], name="core_searchdoc_vector_gin"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.object_id}: {self.title}"
+
+
+class SearchSuggestion(models.Model):
+    """
+    Подсказка для поиска при наборе: одна короткая строка на событие, новость, материал,
+    спикера или тег. Отдельная компактная таблица — автодополнение не читает основные
+    таблицы и не тянет длинные описания. Поддерживается сигналами (см. apps.core.search).
+    """
+    KIND_EVENT = SearchDocument.KIND_EVENT
+    KIND_NEWS = SearchDocument.KIND_NEWS
+    KIND_MATERIAL = SearchDocument.KIND_MATERIAL
+    KIND_SPEAKER = "speaker"
+    KIND_TAG = "tag"
+    KIND_CHOICES = [
+        *SearchDocument.KIND_CHOICES,
+        (KIND_SPEAKER, "Спикер"),
+        (KIND_TAG, "Тег"),
+    ]
+
+    kind = models.CharField("Тип объекта", max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField("ID объекта")
+    text = models.CharField("Текст подсказки", max_length=300)
+    normalized = models.CharField("Текст в нижнем регистре", max_length=300)
+    lookup = models.CharField("slug или id для URL деталей", max_length=300)
+
+    class Meta:
+        verbose_name = "Поисковая подсказка"
+        verbose_name_plural = "Поисковые подсказки"
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="core_suggest_kind_object_uniq"),
+        ]
+        indexes = [
+            # LIKE 'запрос%' для коротких (1–2 символа) запросов — триграммы на них не работают.
+            models.Index(
+                fields=["normalized"], name="core_suggest_prefix", opclasses=["varchar_pattern_ops"]
+            ),
+            # GiST, а не GIN: отдаёт N ближайших по word_similarity (ORDER BY <<-> LIMIT N),
+            # не вычисляя ранг для всех совпадений частого слова. siglen=64 (по умолчанию 12)
+            # — точнее сигнатуры для строк до 300 символов, меньше перепроверок строк.
+            GistIndex(
+                fields=["normalized"], name="core_suggest_trgm", opclasses=["gist_trgm_ops(siglen=64)"]
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.text}"
+
+
+class RenderedMarkdown(models.Model):
+    """
+    Кэш HTML, отрендеренного из Markdown (MDTextField) и очищенного от опасной разметки.
+
+    Ключ — sha256 исходного текста и версии конвейера (apps.core.markdown), поэтому
+    одинаковый текст рендерится один раз, а изменённый получает новую строку. Строку
+    разделяют все объекты с одинаковым текстом (копии события, серии); сигнал удаляет
+    строку прежнего текста, только когда этот текст не остался ни у одного объекта.
+    """
+    digest = models.CharField("Хеш исходного текста", max_length=64, primary_key=True)
+    html = models.TextField("HTML")
+    created_at = models.DateTimeField("Создан", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "HTML из Markdown"
+        verbose_name_plural = "HTML из Markdown"
+
+    def __str__(self):
+        return self.digest
@@ -0,0 +1,182 @@
+"""
+Пагинация списков: номера страниц по умолчанию, курсор (keyset) — по запросу клиента.
+
+PageNumberPagination на каждой странице считает COUNT(*) по всему отфильтрованному
+queryset и пропускает OFFSET строк — чем дальше страница, тем медленнее. Курсорный
+режим (?pagination=cursor, дальше — ссылки next/previous с ?cursor=...) не считает
+COUNT и продолжает выборку с последней показанной строки: условие по ключу
+сортировки вьюсета (cursor_ordering, последний ключ — уникальный id) и LIMIT
+page_size + 1. Страница 50 стоит столько же, сколько первая.
+"""
+import base64
+import json
+from functools import reduce
+from operator import and_, or_
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+PAGINATION_CURSOR = "cursor"
+
+
+class CursorOrPageNumberPagination(PageNumberPagination):
+    """
+    Номера страниц (count/next/previous/results) или, при ?pagination=cursor либо
+    ?cursor=..., курсор (next/previous/results, без count).
+
+    Вьюсет задаёт cursor_ordering — сортировку курсорного режима с уникальным последним
+    полем, например ("-date", "-time_start", "id"). Курсорный режим всегда сортирует по
+    ней, поэтому не сочетается с ?search= (сортировка по релевантности) и ?ordering=.
+    NULL учитываются так, как их сортирует PostgreSQL: первыми при DESC, последними при ASC.
+    """
+
+    pagination_query_param = "pagination"
+    cursor_query_param = "cursor"
+    incompatible_query_params = ("search", "ordering")
+    invalid_cursor_message = "Неверный курсор."
+    cursor_mode = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = (
+            request.query_params.get(self.pagination_query_param) == PAGINATION_CURSOR
+            or self.cursor_query_param in request.query_params
+        )
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        for param in self.incompatible_query_params:
+            if request.query_params.get(param, "").strip():
+                raise ValidationError(
+                    {param: f"Не поддерживается вместе с {self.pagination_query_param}={PAGINATION_CURSOR}."}
+                )
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.keys = [
+            (queryset.model._meta.get_field(name.lstrip("-")), name.startswith("-"))
+            for name in view.cursor_ordering
+        ]
+        values, reverse = self._decode_cursor(request)
+        keys = [(field, desc != reverse) for field, desc in self.keys]
+
+        queryset = queryset.order_by(*[f"-{field.name}" if desc else field.name for field, desc in keys])
+        if values is not None:
+            queryset = queryset.filter(self._after(keys, values))
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = values is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+        self.rows = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next or not self.rows:
+            return None
+        return self._cursor_link(self.rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if not self.has_previous or not self.rows:
+            return None
+        return self._cursor_link(self.rows[0], reverse=True)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters += [
+            {
+                "name": self.pagination_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    f"{PAGINATION_CURSOR} — курсорная пагинация для бесконечной ленты: "
+                    "без count, дальше переходить по ссылкам next/previous."
+                ),
+                "schema": {"type": "string", "enum": [PAGINATION_CURSOR]},
+            },
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Курсор из ссылок next/previous (курсорный режим).",
+                "schema": {"type": "string"},
+            },
+        ]
+        return parameters
+
+    def _after(self, keys, values):
+        """
+        Q «строка идёт после values» в порядке keys: (k1 после v1) OR (k1 = v1 AND k2 после
+        v2) OR ... Плюс условие-граница по первому ключу, чтобы PostgreSQL начал индексный
+        просмотр с нужного места, а не фильтровал строки с начала.
+        """
+        branches = []
+        equal = []
+        for (field, desc), value in zip(keys, values):
+            beyond = self._beyond(field, desc, value)
+            if beyond is not None:
+                branches.append(reduce(and_, [*equal, beyond]))
+            equal.append(Q(**{f"{field.name}__isnull": True}) if value is None else Q(**{field.name: value}))
+        condition = reduce(or_, branches) if branches else Q(pk__in=[])
+
+        field, desc = keys[0]
+        if values[0] is not None and (desc or not field.null):
+            condition &= Q(**{f"{field.name}__{'lte' if desc else 'gte'}": values[0]})
+        return condition
+
+    def _beyond(self, field, desc, value):
+        """Q «значение field строго после value»; None — после value ничего нет."""
+        name = field.name
+        if value is None:
+            return Q(**{f"{name}__isnull": False}) if desc else None
+        beyond = Q(**{f"{name}__{'lt' if desc else 'gt'}": value})
+        if field.null and not desc:
+            beyond |= Q(**{f"{name}__isnull": True})
+        return beyond
+
+    def _decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            raw_values = payload["v"]
+            if len(raw_values) != len(self.keys):
+                raise ValueError
+            values = [
+                None if raw is None else field.to_python(raw)
+                for (field, _), raw in zip(self.keys, raw_values)
+            ]
+            return values, bool(payload.get("r"))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message) from None
+
+    def _cursor_link(self, row, reverse):
+        values = []
+        for field, _ in self.keys:
+            value = getattr(row, field.attname)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        payload = {"v": values, "r": int(reverse)}
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        url = remove_query_param(url, self.pagination_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
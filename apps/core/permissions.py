@@ -1,6 +1,67 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
 from rest_framework.permissions import BasePermission
+
+from .cache import MISSING, LocalTTLCache
 from .models import ApiKey
 
+# Результат проверки ключа кэшируется в два уровня:
+# 1) LRU в памяти воркера (API_KEY_CACHE_LOCAL_TTL) — горячий путь без сети и БД;
+# 2) кэш Django API_KEY_CACHE_ALIAS (API_KEY_CACHE_TTL) — один запрос к БД на ключ.
+# Сигналы ApiKey (apps.core.signals) сбрасывают кэш Django и LRU текущего процесса.
+# В остальных воркерах отозванный ключ перестаёт работать:
+# - с общим кэшем (Redis) — не позже чем через API_KEY_CACHE_LOCAL_TTL секунд;
+# - с кэшем в памяти процесса (LocMemCache, по умолчанию) — не позже чем через
+#   API_KEY_CACHE_LOCAL_TTL + API_KEY_CACHE_TTL секунд: сброс виден только в воркере,
+#   обработавшем сохранение.
+# Отказ (is_valid=False) в LRU не попадает — поток случайных ключей не вытесняет
+# рабочие; в кэше Django он хранится API_KEY_CACHE_NEGATIVE_TTL секунд.
+_local_api_keys = LocalTTLCache(
+    maxsize=getattr(settings, "API_KEY_CACHE_MAXSIZE", 1024),
+    ttl=getattr(settings, "API_KEY_CACHE_LOCAL_TTL", 30),
+)
+
+
+def _api_key_cache_key(token):
+    # В общий кэш не кладём сам токен — только его хэш.
+    return "core:apikey:" + hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def is_valid_api_key(token):
+    """Активен ли ключ: локальный LRU → общий кэш → БД."""
+    cache_key = _api_key_cache_key(token)
+    is_valid = _local_api_keys.get(cache_key)
+    if is_valid is not MISSING:
+        return is_valid
+
+    shared = caches[getattr(settings, "API_KEY_CACHE_ALIAS", "default")]
+    is_valid = shared.get(cache_key)
+    if is_valid is None:
+        is_valid = ApiKey.objects.filter(key=token, is_active=True).exists()
+        if is_valid:
+            shared.set(cache_key, True, getattr(settings, "API_KEY_CACHE_TTL", 300))
+        else:
+            shared.set(cache_key, False, getattr(settings, "API_KEY_CACHE_NEGATIVE_TTL", 10))
+    if is_valid:
+        _local_api_keys.set(cache_key, True)
+    return is_valid
+
+
+def invalidate_api_key(token):
+    """Сбросить закэшированный результат проверки ключа (вызывается из сигналов ApiKey)."""
+    if not token:
+        return
+    cache_key = _api_key_cache_key(token)
+    _local_api_keys.delete(cache_key)
+    caches[getattr(settings, "API_KEY_CACHE_ALIAS", "default")].delete(cache_key)
+
+
+def clear_api_key_cache():
+    """Полностью очистить локальный кэш ключей (для тестов)."""
+    _local_api_keys.clear()
+
 
 class OnlyWithApiKeyOrFromFrontend(BasePermission):
     """
@@ -11,7 +72,7 @@ class OnlyWithApiKeyOrFromFrontend(BasePermission):
     def has_permission(self, request, view):
         # Проверяем токен
         token = request.headers.get("X-API-KEY") or request.GET.get("key")
-        if token and ApiKey.objects.filter(key=token, is_active=True).exists():
+        if token and is_valid_api_key(token):
             return True
 
         # Проверяем Referer / Origin
@@ -0,0 +1,94 @@
+"""
+Планировщик выборки по сериализатору: select_related / prefetch_related / only()
+из дерева полей активного сериализатора.
+
+Вьюсет не перечисляет связи вручную: что сериализатор выводит, то и загружается,
+причём одним запросом на уровень связи, а не на строку (N+1). Колонки каждой модели
+сужаются до полей, которые сериализатор читает (с учётом ?fields= / ?omit=).
+
+    ForeignKey / OneToOne (и обратный OneToOne) с вложенным сериализатором →
+    select_related + колонки связи;
+    M2M и обратные ForeignKey → Prefetch(queryset=...) с тем же планом для вложенного
+    сериализатора (его связи, его колонки);
+    поле-свойство, метод или путь с точкой → колонки этой модели не сужаются;
+    аннотация queryset (например, remaining_seats событий) → считается в том же запросе.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def nested_serializer(field):
+    """Сериализатор вложенного поля (для many=True — дочерний) или None."""
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    return field if isinstance(field, serializers.BaseSerializer) else None
+
+
+def plan_queryset(queryset, serializer, extra_fields=()):
+    """
+    queryset с select_related / prefetch_related / only() под serializer (или ListSerializer).
+    Связи, заданные в queryset заранее, сбрасываются — план их заменяет. extra_fields —
+    колонки, которые читаются помимо сериализатора (например, ключи курсора).
+    """
+    queryset = queryset.select_related(None).prefetch_related(None)
+    return _apply_plan(queryset, nested_serializer(serializer), extra_fields)
+
+
+def _apply_plan(queryset, serializer, extra_fields=()):
+    only, select, prefetch = _plan(serializer, queryset.model, annotations=queryset.query.annotations)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if only is not None:
+        queryset = queryset.only(*dict.fromkeys([*only, *extra_fields]))
+    return queryset
+
+
+def _plan(serializer, model, prefix="", annotations=()):
+    """
+    (only, select_related, prefetch_related) для полей serializer над model; пути — с prefix
+    (для моделей, подтянутых select_related). only = None — колонки не сужать.
+    annotations — имена аннотаций queryset верхнего уровня: only() их не отбрасывает.
+    """
+    only, select, prefetch = [f"{prefix}{model._meta.pk.name}"], [], []
+    restrict = True
+    for field in serializer.fields.values():
+        if field.source in annotations:
+            continue
+        if field.source == "*" or "." in field.source:
+            restrict = False
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            restrict = False
+            continue
+        nested = nested_serializer(field)
+        path = f"{prefix}{model_field.name}"
+
+        if model_field.many_to_many or model_field.one_to_many:
+            if nested is None:
+                prefetch.append(path)
+                continue
+            # Обратный ForeignKey раскладывает строки по родителям по своей колонке — она нужна.
+            back_link = () if model_field.many_to_many else (model_field.field.name,)
+            related = _apply_plan(model_field.related_model._default_manager.all(), nested, back_link)
+            prefetch.append(Prefetch(path, queryset=related))
+            continue
+        if not model_field.concrete and not (model_field.one_to_one and nested is not None):
+            restrict = False
+            continue
+
+        if model_field.concrete:  # у обратного OneToOne своей колонки нет
+            only.append(path)
+        if nested is not None and model_field.is_relation:
+            select.append(path)
+            nested_only, nested_select, nested_prefetch = _plan(
+                nested, model_field.related_model, f"{path}__"
+            )
+            only += nested_only or []
+            select += nested_select
+            prefetch += nested_prefetch
+    return (only if restrict else None), select, prefetch
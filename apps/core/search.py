@@ -0,0 +1,478 @@
+"""
+Поиск по событиям, новостям и материалам через денормализованную таблицу SearchDocument.
+
+Каждое приложение регистрирует свой тип документа (register_document) и поддерживает
+его сигналами: refresh_documents() пересобирает документы по id, delete_documents()
+удаляет. Вьюсеты ищут через ranked_documents(): одна таблица, GIN-индекс gin_trgm_ops
+по text, без JOIN со спикерами/тегами и без DISTINCT.
+
+Режимы (?search_mode=):
+- fuzzy (по умолчанию) — strict_word_similarity(query, text): похожесть запроса на лучшую
+  последовательность целых слов документа. В отличие от similarity() по всему полю,
+  не «размывается» на длинных описаниях и обслуживается индексом через оператор `%>>`;
+- fulltext — полнотекстовый поиск по search_vector (конфигурация russian, стемминг,
+  заголовок с весом A), ранг ts_rank; отбор через GIN-индекс по search_vector (`@@`);
+- hybrid — документы, найденные любым из способов, ранг — среднее двух оценок.
+
+Порог оператора `%>>` (pg_trgm.strict_word_similarity_threshold = min_rank) ставится
+до конца транзакции (set_config(..., true)), а не на всё соединение: с постоянными
+соединениями (CONN_MAX_AGE) порог иначе переходил бы к чужим запросам. Поэтому поиск
+выполняется в транзакции: у вьюсетов — SearchTransactionMixin, federated_search
+открывает её сам.
+"""
+import re
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Callable
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramStrictWordSimilarity,
+    TrigramWordDistance,
+)
+from django.db import connection, transaction
+from django.db.models import CharField, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Cast, Length
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from apps.core.models import SearchDocument, SearchSuggestion, Tag
+
+DEFAULT_MIN_RANK = 0.12
+
+SEARCH_MODE_FUZZY = "fuzzy"
+SEARCH_MODE_FULLTEXT = "fulltext"
+SEARCH_MODE_HYBRID = "hybrid"
+SEARCH_MODES = (SEARCH_MODE_FUZZY, SEARCH_MODE_FULLTEXT, SEARCH_MODE_HYBRID)
+
+# ts_rank / (ts_rank + 1): ранг полнотекстового поиска в диапазоне 0..1, как у триграмм.
+FULLTEXT_RANK_NORMALIZATION = 32
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class DocumentType:
+    model: type
+    build: Callable  # instance -> (title, [части текста])
+    select_related: tuple = ()
+    prefetch_related: tuple = ()
+    lookup_field: str = "pk"  # поле для URL деталей в общем поиске
+    public_filter: Q = None  # какие объекты видны в API (None — все)
+
+
+_document_types = {}
+
+
+@dataclass(frozen=True)
+class SuggestionType:
+    model: type
+    text_field: str
+    lookup_field: str = "pk"
+    public_filter: Q = None
+
+
+_suggestion_types = {}
+
+
+def register_document(
+    kind,
+    model,
+    build,
+    select_related=(),
+    prefetch_related=(),
+    m2m=(),
+    depends_on=(),
+    lookup_field="pk",
+    public_filter=None,
+):
+    """
+    Зарегистрировать тип поискового документа и подключить сигналы (из AppConfig.ready()).
+
+    m2m — пары (through-модель, обратное имя) для M2M, попадающих в текст
+    ((Event.tags.through, "events")…): m2m_changed в обе стороны пересобирает документы.
+    depends_on — пары (модель, related_name) для связанных объектов, чьи поля есть в тексте
+    (имя тега, ФИО спикера, название категории): их сохранение/удаление пересобирает документы.
+    lookup_field и public_filter нужны общему поиску (federated_search): значение для URL
+    деталей и условие видимости объекта в API (например, Q(is_published=True)).
+    """
+    _document_types[kind] = DocumentType(
+        model,
+        build,
+        tuple(select_related),
+        tuple(prefetch_related),
+        lookup_field,
+        public_filter,
+    )
+    uid = f"search-document:{kind}"
+
+    def on_save(sender, instance, **kwargs):
+        refresh_documents(kind, [instance.pk])
+
+    def on_delete(sender, instance, **kwargs):
+        delete_documents(kind, [instance.pk])
+
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=uid)
+    for through, reverse_name in m2m:
+        _connect_m2m(kind, through, reverse_name, uid)
+    for related_model, related_name in depends_on:
+        _connect_dependency(kind, related_model, related_name, uid)
+
+
+def _connect_m2m(kind, through, reverse_name, uid):
+    ids_attr = f"_search_document_ids_{kind}"
+
+    def on_m2m_changed(sender, instance, action, reverse, pk_set, **kwargs):
+        if not reverse:
+            if action in ("post_add", "post_remove", "post_clear"):
+                refresh_documents(kind, [instance.pk])
+            return
+        # Обратная сторона (tag.events.add(...)): для add/remove известен pk_set,
+        # для clear — запоминаем id до очистки.
+        if action == "pre_clear":
+            setattr(instance, ids_attr, list(getattr(instance, reverse_name).values_list("pk", flat=True)))
+        elif action in ("post_add", "post_remove"):
+            refresh_documents(kind, pk_set)
+        elif action == "post_clear":
+            refresh_documents(kind, getattr(instance, ids_attr, ()))
+
+    m2m_changed.connect(on_m2m_changed, sender=through, weak=False, dispatch_uid=uid)
+
+
+def _connect_dependency(kind, related_model, related_name, uid):
+    ids_attr = f"_search_document_ids_{kind}"
+
+    def related_ids(instance):
+        return list(getattr(instance, related_name).values_list("pk", flat=True))
+
+    def on_related_save(sender, instance, created, **kwargs):
+        if not created:
+            refresh_documents(kind, related_ids(instance))
+
+    def on_related_pre_delete(sender, instance, **kwargs):
+        setattr(instance, ids_attr, related_ids(instance))
+
+    def on_related_post_delete(sender, instance, **kwargs):
+        refresh_documents(kind, getattr(instance, ids_attr, ()))
+
+    dependency_uid = f"{uid}:{related_model._meta.label}"
+    post_save.connect(on_related_save, sender=related_model, weak=False, dispatch_uid=dependency_uid)
+    pre_delete.connect(on_related_pre_delete, sender=related_model, weak=False, dispatch_uid=dependency_uid)
+    post_delete.connect(on_related_post_delete, sender=related_model, weak=False, dispatch_uid=dependency_uid)
+
+
+def normalize_text(parts):
+    """Склеить части текста: пустые отбрасываются, пробелы схлопываются, нижний регистр."""
+    joined = " ".join(part for part in parts if part)
+    return _WHITESPACE_RE.sub(" ", joined).strip().lower()
+
+
+def refresh_documents(kind, ids):
+    """
+    Пересобрать документы для объектов kind с указанными id.
+
+    Upsert одним INSERT ... ON CONFLICT и один UPDATE для tsvector — независимо от числа id.
+    Документы объектов, которых больше нет, удаляются.
+    """
+    ids = set(ids)
+    if not ids:
+        return
+    doc_type = _document_types[kind]
+    objects = (
+        doc_type.model._default_manager.filter(pk__in=ids)
+        .select_related(*doc_type.select_related)
+        .prefetch_related(*doc_type.prefetch_related)
+    )
+    documents = []
+    for obj in objects:
+        title, parts = doc_type.build(obj)
+        documents.append(
+            SearchDocument(
+                kind=kind,
+                object_id=obj.pk,
+                title=title[:300],
+                text=normalize_text([title, *parts]),
+            )
+        )
+    if documents:
+        SearchDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=["kind", "object_id"],
+            update_fields=["title", "text", "updated_at"],
+        )
+        SearchDocument.objects.filter(
+            kind=kind, object_id__in=[doc.object_id for doc in documents]
+        ).update(search_vector=document_vector())
+    missing = ids - {doc.object_id for doc in documents}
+    if missing:
+        delete_documents(kind, missing)
+
+
+def delete_documents(kind, ids):
+    SearchDocument.objects.filter(kind=kind, object_id__in=list(ids)).delete()
+
+
+def rebuild_documents(kinds=None, batch_size=500):
+    """Полная пересборка (команда rebuild_search_documents, post_migrate на пустой таблице)."""
+    for kind in kinds or list(_document_types):
+        model = _document_types[kind].model
+        ids = list(model._default_manager.order_by("pk").values_list("pk", flat=True))
+        for start in range(0, len(ids), batch_size):
+            refresh_documents(kind, ids[start:start + batch_size])
+        SearchDocument.objects.filter(kind=kind).exclude(object_id__in=ids).delete()
+
+
+def document_vector():
+    """tsvector документа: заголовок весомее остального текста."""
+    return SearchVector("title", weight="A", config="russian") + SearchVector(
+        "text", weight="B", config="russian"
+    )
+
+
+def parse_min_rank(query_params):
+    """Порог релевантности из `?min_rank=` (0..1, по умолчанию DEFAULT_MIN_RANK)."""
+    min_rank_raw = query_params.get("min_rank")
+    try:
+        min_rank = float(min_rank_raw) if min_rank_raw is not None else DEFAULT_MIN_RANK
+    except (TypeError, ValueError):
+        min_rank = DEFAULT_MIN_RANK
+    return max(0.0, min(1.0, min_rank))
+
+
+def parse_search_mode(query_params):
+    """Режим из `?search_mode=`; неизвестное значение — fuzzy (как раньше)."""
+    mode = query_params.get("search_mode", "").strip().lower()
+    return mode if mode in SEARCH_MODES else SEARCH_MODE_FUZZY
+
+
+def search_transaction():
+    """Транзакция, в которой живёт порог %>>: уже открытая (ATOMIC_REQUESTS, тесты) или новая."""
+    return nullcontext() if connection.in_atomic_block else transaction.atomic()
+
+
+def set_trigram_threshold(name, value):
+    """
+    Порог оператора pg_trgm (similarity_threshold, strict_word_similarity_threshold…) до
+    конца текущей транзакции (search_transaction()). Вне транзакции порог не пережил бы
+    и этот запрос.
+    """
+    if not connection.in_atomic_block:
+        raise transaction.TransactionManagementError("Порог pg_trgm ставится внутри transaction.atomic().")
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT set_config(%s, %s, true)", [f"pg_trgm.{name}", str(value)])
+
+
+def ranked_documents(kind, query, min_rank, mode=SEARCH_MODE_FUZZY, set_threshold=True):
+    """
+    Документы kind с аннотацией search_rank, отобранные по режиму mode.
+
+    fuzzy: `text %>> query` ⇔ strict_word_similarity(query, text) >= порога, поэтому при
+    пороге = min_rank индексный оператор отбирает ровно нужные строки. При min_rank <= 0
+    подходят все документы и индекс ничего не отсекает — оператор не добавляем.
+    fulltext: отбор по `search_vector @@ query`, min_rank не применяется — ts_rank
+    несопоставим с триграммным порогом.
+    hybrid: `@@` ИЛИ `%>>` (BitmapOr двух GIN-индексов).
+    set_threshold=False — порог уже выставлен вызывающим кодом (federated_search).
+    """
+    if set_threshold:
+        _set_rank_threshold(min_rank, mode)
+    documents = SearchDocument.objects.filter(kind=kind)
+    if mode == SEARCH_MODE_FUZZY:
+        documents = documents.annotate(search_rank=TrigramStrictWordSimilarity(query, "text"))
+        if min_rank > 0:
+            documents = documents.filter(text__trigram_strict_word_similar=query)
+        return documents.filter(search_rank__gte=min_rank)
+
+    search_query = SearchQuery(query, config="russian", search_type="websearch")
+    fulltext_rank = SearchRank(
+        F("search_vector"), search_query, normalization=FULLTEXT_RANK_NORMALIZATION
+    )
+    if mode == SEARCH_MODE_FULLTEXT:
+        return documents.filter(search_vector=search_query).annotate(search_rank=fulltext_rank)
+
+    documents = documents.annotate(
+        search_rank=(fulltext_rank + TrigramStrictWordSimilarity(query, "text")) / Value(2.0)
+    )
+    if min_rank <= 0:
+        return documents
+    return documents.filter(
+        Q(search_vector=search_query) | Q(text__trigram_strict_word_similar=query)
+    )
+
+
+def _set_rank_threshold(min_rank, mode):
+    if mode != SEARCH_MODE_FULLTEXT and min_rank > 0:
+        set_trigram_threshold("strict_word_similarity_threshold", min_rank)
+
+
+def filter_by_search(queryset, kind, query, min_rank, mode=SEARCH_MODE_FUZZY):
+    """Оставить в queryset найденные объекты и добавить аннотацию search_rank."""
+    documents = ranked_documents(kind, query, min_rank, mode)
+    return queryset.filter(pk__in=documents.values("object_id")).annotate(
+        search_rank=Subquery(
+            documents.filter(object_id=OuterRef("pk")).values("search_rank")[:1]
+        )
+    )
+
+
+class SearchTransactionMixin:
+    """
+    Ставится первым у вьюсетов с ?search= (filter_by_search): list с поиском выполняется
+    в одной транзакции, и порог %>> действует на все его запросы (валидаторы, COUNT,
+    страница). Ответ из кэша к БД не обращается — пустая транзакция запросов не шлёт.
+    filter_by_search вьюсеты вызывают только в list: у остальных действий транзакции нет.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not request.query_params.get("search", "").strip():
+            return super().list(request, *args, **kwargs)
+        with search_transaction():
+            return super().list(request, *args, **kwargs)
+
+
+def federated_search(query, min_rank, mode=SEARCH_MODE_FUZZY, kinds=None, max_per_type=100):
+    """
+    Общий поиск по всем типам документов одним запросом (UNION ALL).
+
+    От каждого типа берутся не более max_per_type лучших документов (ORDER BY search_rank
+    LIMIT внутри ветки), поэтому объём работы ограничен независимо от размера таблиц.
+    Шкала search_rank общая — тот же режим и тот же порог для всех типов.
+    Возвращает список словарей kind/object_id/title/lookup/search_rank по убыванию ранга.
+    """
+    with search_transaction():
+        _set_rank_threshold(min_rank, mode)
+        return _federated_hits(query, min_rank, mode, kinds, max_per_type)
+
+
+def _federated_hits(query, min_rank, mode, kinds, max_per_type):
+    branches = []
+    for kind in kinds or list(_document_types):
+        doc_type = _document_types[kind]
+        documents = ranked_documents(kind, query, min_rank, mode, set_threshold=False)
+        if doc_type.public_filter is not None:
+            public = doc_type.model._default_manager.filter(doc_type.public_filter)
+            documents = documents.filter(object_id__in=public.values("pk"))
+        if doc_type.lookup_field == "pk":
+            lookup = Cast("object_id", CharField())
+        else:
+            lookup = Cast(
+                Subquery(
+                    doc_type.model._default_manager.filter(pk=OuterRef("object_id"))
+                    .order_by()
+                    .values(doc_type.lookup_field)[:1]
+                ),
+                CharField(),
+            )
+        branches.append(
+            documents.annotate(lookup=lookup)
+            .order_by("-search_rank", "object_id")
+            .values("kind", "object_id", "title", "lookup", "search_rank")[:max_per_type]
+        )
+    if not branches:
+        return []
+    combined = branches[0].union(*branches[1:], all=True) if len(branches) > 1 else branches[0]
+    return sorted(combined, key=lambda hit: (-hit["search_rank"], hit["kind"], hit["object_id"]))
+
+
+def register_suggestion(kind, model, text_field, lookup_field="pk", public_filter=None):
+    """
+    Зарегистрировать источник подсказок (SearchSuggestion) и подключить сигналы.
+
+    text_field — поле с текстом подсказки (title, full_name, name); объекты, не
+    проходящие public_filter, в подсказки не попадают.
+    """
+    _suggestion_types[kind] = SuggestionType(model, text_field, lookup_field, public_filter)
+    uid = f"search-suggestion:{kind}"
+
+    def on_save(sender, instance, **kwargs):
+        refresh_suggestions(kind, [instance.pk])
+
+    def on_delete(sender, instance, **kwargs):
+        SearchSuggestion.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=uid)
+
+
+def refresh_suggestions(kind, ids):
+    """Пересобрать подсказки kind для объектов с указанными id (upsert + удаление лишних)."""
+    ids = set(ids)
+    if not ids:
+        return
+    suggestion_type = _suggestion_types[kind]
+    objects = suggestion_type.model._default_manager.filter(pk__in=ids)
+    if suggestion_type.public_filter is not None:
+        objects = objects.filter(suggestion_type.public_filter)
+    suggestions = []
+    for pk, text, lookup in objects.values_list(
+        "pk", suggestion_type.text_field, suggestion_type.lookup_field
+    ):
+        text = _WHITESPACE_RE.sub(" ", text).strip()[:300]
+        suggestions.append(
+            SearchSuggestion(
+                kind=kind, object_id=pk, text=text, normalized=text.lower(), lookup=str(lookup)
+            )
+        )
+    if suggestions:
+        SearchSuggestion.objects.bulk_create(
+            suggestions,
+            update_conflicts=True,
+            unique_fields=["kind", "object_id"],
+            update_fields=["text", "normalized", "lookup"],
+        )
+    missing = ids - {suggestion.object_id for suggestion in suggestions}
+    if missing:
+        SearchSuggestion.objects.filter(kind=kind, object_id__in=list(missing)).delete()
+
+
+def rebuild_suggestions(kinds=None, batch_size=1000):
+    """Полная пересборка подсказок (команда rebuild_search_documents, post_migrate)."""
+    for kind in kinds or list(_suggestion_types):
+        model = _suggestion_types[kind].model
+        ids = list(model._default_manager.order_by("pk").values_list("pk", flat=True))
+        for start in range(0, len(ids), batch_size):
+            refresh_suggestions(kind, ids[start:start + batch_size])
+        SearchSuggestion.objects.filter(kind=kind).exclude(object_id__in=ids).delete()
+
+
+def suggest(query, kinds=None, limit=10):
+    """
+    Подсказки для строки query: сначала начинающиеся с неё (короткие выше), затем
+    ближайшие по word_similarity — начало любого слова, опечатки.
+
+    Не больше двух запросов, оба ограничены LIMIT по индексу: префикс — btree
+    varchar_pattern_ops (LIKE 'запрос%'), похожие — KNN по GiST gist_trgm_ops
+    (ORDER BY normalized <<-> запрос). Для запросов короче 3 символов триграммы
+    бесполезны — только префикс.
+    """
+    normalized = _WHITESPACE_RE.sub(" ", query).strip().lower()
+    if not normalized:
+        return []
+    suggestions = SearchSuggestion.objects.all()
+    if kinds:
+        suggestions = suggestions.filter(kind__in=kinds)
+    fields = ("kind", "object_id", "text", "lookup")
+    found = list(
+        suggestions.filter(normalized__startswith=normalized)
+        .order_by(Length("normalized"), "normalized")
+        .values(*fields)[:limit]
+    )
+    if len(found) >= limit or len(normalized) < 3:
+        return found
+    seen = {(hit["kind"], hit["object_id"]) for hit in found}
+    similar = (
+        suggestions.filter(normalized__trigram_word_similar=normalized)
+        .order_by(TrigramWordDistance(normalized, "normalized"))
+        .values(*fields)[:limit]
+    )
+    for hit in similar:
+        if (hit["kind"], hit["object_id"]) not in seen and len(found) < limit:
+            found.append(hit)
+    return found
+
+
+# Теги общие для событий и новостей — их подсказки регистрируются здесь, в core.
+register_suggestion(SearchSuggestion.KIND_TAG, Tag, "name", lookup_field="slug")
@@ -1,9 +1,60 @@
 from rest_framework import serializers
 
+from apps.core.markdown import render_markdown
 from apps.core.models import Tag
 
 
+class MarkdownHTMLField(serializers.ReadOnlyField):
+    """
+    Очищенный HTML поля MDTextField (source) — из кэша apps.core.markdown, без повторного
+    рендера одного текста. Объявляется в Meta.optional_fields: отдаётся по ?include=.
+    """
+
+    def to_representation(self, value):
+        return render_markdown(value)
+
+
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ("id", "name", "slug")
+
+
+class SearchHitSerializer(serializers.Serializer):
+    """Результат общего поиска: тип объекта, id, заголовок и значение для URL деталей."""
+
+    type = serializers.CharField(source="kind")
+    id = serializers.IntegerField(source="object_id")
+    title = serializers.CharField()
+    lookup = serializers.CharField(help_text="slug (события, новости) или id (материалы) для URL деталей.")
+    search_rank = serializers.FloatField()
+
+
+class SearchResponseSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    next = serializers.URLField(allow_null=True)
+    previous = serializers.URLField(allow_null=True)
+    facets = serializers.DictField(
+        child=serializers.IntegerField(),
+        help_text="Число найденных объектов по типам (не больше max_per_type).",
+    )
+    max_per_type = serializers.IntegerField()
+    results = SearchHitSerializer(many=True)
+
+
+class SuggestionSerializer(serializers.Serializer):
+    """Подсказка автодополнения: тип, id, текст и значение для URL деталей."""
+
+    type = serializers.CharField(source="kind")
+    id = serializers.IntegerField(source="object_id")
+    text = serializers.CharField()
+    lookup = serializers.CharField(help_text="slug (события, новости, теги) или id (материалы, спикеры).")
+
+
+class AdmissionStatusSerializer(serializers.Serializer):
+    """Состояние билета очереди допуска (apps.core.admission)."""
+
+    ticket = serializers.CharField(help_text="Билет: повторите запрос с ним в заголовке X-Admission-Ticket.")
+    admitted = serializers.BooleanField()
+    position = serializers.IntegerField(help_text="Сколько запросов допускается раньше этого билета.")
+    retry_after = serializers.IntegerField(help_text="Секунд до допуска.")
@@ -0,0 +1,100 @@
+from django.db import connection, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.core.cache import bump_generation
+from apps.core.markdown import forget_markdown, markdown_fields, render_markdown
+from apps.core.models import ApiKey, SearchDocument, SearchSuggestion
+from apps.core.permissions import invalidate_api_key
+from apps.core.search import rebuild_documents, rebuild_suggestions
+
+
+@receiver(pre_save, sender=ApiKey)
+def remember_previous_api_key(sender, instance, **kwargs):
+    """Запоминаем прежний токен: при смене ключа старый тоже нужно сбросить из кэша."""
+    instance._previous_key = None
+    if instance.pk:
+        instance._previous_key = (
+            ApiKey.objects.filter(pk=instance.pk).values_list("key", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=ApiKey)
+def invalidate_api_key_on_save(sender, instance, **kwargs):
+    invalidate_api_key(instance.key)
+    previous_key = getattr(instance, "_previous_key", None)
+    if previous_key and previous_key != instance.key:
+        invalidate_api_key(previous_key)
+
+
+@receiver(post_delete, sender=ApiKey)
+def invalidate_api_key_on_delete(sender, instance, **kwargs):
+    invalidate_api_key(instance.key)
+
+
+def _is_project_model(model):
+    app_config = model._meta.app_config  # None у служебных моделей (django_migrations)
+    return app_config is not None and app_config.name.startswith("apps.")
+
+
+def _bump_generation_on_commit(model):
+    # После коммита: иначе параллельный запрос успеет прочитать старые строки и сохранить
+    # их в кэш под новым поколением — до конца TTL.
+    transaction.on_commit(lambda: bump_generation(model))
+
+
+@receiver(post_save, dispatch_uid="core:bump-generation-save")
+@receiver(post_delete, dispatch_uid="core:bump-generation-delete")
+def bump_generation_on_change(sender, **kwargs):
+    """Любое сохранение/удаление модели проекта сбрасывает кэш ответов API (CachedResponseMixin)."""
+    if _is_project_model(sender):
+        _bump_generation_on_commit(sender)
+
+
+@receiver(m2m_changed, dispatch_uid="core:bump-generation-m2m")
+def bump_generation_on_m2m_change(sender, instance, action, model, **kwargs):
+    """M2M (event.tags.add(...) и обратная сторона) меняет обе модели связи."""
+    if not action.startswith("post_"):
+        return
+    for changed in (type(instance), model):
+        if _is_project_model(changed):
+            _bump_generation_on_commit(changed)
+
+
+def remember_previous_markdown(sender, instance, raw=False, **kwargs):
+    """pre_save моделей с MDTextField: прежний текст нужен, чтобы удалить его HTML."""
+    instance._previous_markdown = {}
+    if instance.pk and not raw:
+        fields = markdown_fields(sender)
+        previous = sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+        instance._previous_markdown = previous or {}
+
+
+def render_markdown_on_save(sender, instance, raw=False, **kwargs):
+    """post_save: отрендерить изменившийся текст сразу (первый запрос деталей не ждёт рендера)."""
+    if raw:
+        return
+    previous = getattr(instance, "_previous_markdown", {})
+    for name in markdown_fields(sender):
+        source = getattr(instance, name)
+        if previous.get(name) == source:
+            continue
+        forget_markdown(previous.get(name))
+        render_markdown(source)
+
+
+def forget_markdown_on_delete(sender, instance, **kwargs):
+    for name in markdown_fields(sender):
+        forget_markdown(getattr(instance, name))
+
+
+def fill_search_documents(sender, **kwargs):
+    """
+    post_migrate: собрать поисковые документы и подсказки, если таблицы пусты (первый
+    деплой на существующей БД). Дальше они поддерживаются сигналами.
+    """
+    tables = connection.introspection.table_names()
+    if SearchDocument._meta.db_table in tables and not SearchDocument.objects.exists():
+        rebuild_documents()
+    if SearchSuggestion._meta.db_table in tables and not SearchSuggestion.objects.exists():
+        rebuild_suggestions()
@@ -0,0 +1,108 @@
+"""
+Уникальные slug для Event, NewsArticle, Tag и content.Page (AutoSlugModel).
+
+Основа — slugify(источник); занята — base-2, base-3 и т.д. Занятые варианты основы читаются
+одним запросом: slug LIKE 'base%' идёт по индексу *_like, который Django создаёт для
+уникального SlugField в PostgreSQL, а ^base(-N)?$ отсекает чужие slug с тем же началом.
+Основа укорачивается с запасом под суффикс, чтобы base-N всегда помещался в поле.
+
+Между выбором slug и INSERT его может занять параллельная запись. Тогда сохранение
+откатывается до точки сохранения, и slug выбирается заново (до SLUG_ATTEMPTS раз) —
+вместо IntegrityError наружу.
+
+Импорт тысяч строк — bulk_create_with_slugs(): запрос занятых slug на пачку из
+SLUG_BATCH_SIZE основ; одинаковые основы внутри импорта тоже получают суффиксы.
+"""
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+SLUG_FIELD = "slug"
+SLUG_ATTEMPTS = 3
+SLUG_BATCH_SIZE = 500
+SUFFIX_RESERVE = 6  # «-99999»
+
+
+def slug_base(value, fallback):
+    """Основа slug из текста; пустая (текст без букв и цифр) — fallback."""
+    return slugify(value or "", allow_unicode=True) or fallback
+
+
+def _trimmed(base, max_length):
+    return base[: max_length - SUFFIX_RESERVE].rstrip("-")
+
+
+def _taken_slugs(model, bases):
+    conditions = (
+        Q(slug__startswith=base, slug__regex=rf"^{re.escape(base)}(-[0-9]+)?$") for base in set(bases)
+    )
+    return set(model._default_manager.filter(reduce(or_, conditions)).values_list(SLUG_FIELD, flat=True))
+
+
+def allocate_slugs(model, bases):
+    """
+    Свободные slug модели для bases — по одному на основу, в том же порядке. Один запрос
+    на каждые SLUG_BATCH_SIZE основ.
+    """
+    max_length = model._meta.get_field(SLUG_FIELD).max_length
+    bases = [_trimmed(base, max_length) for base in bases]
+    slugs = []
+    for start in range(0, len(bases), SLUG_BATCH_SIZE):
+        batch = bases[start:start + SLUG_BATCH_SIZE]
+        taken = _taken_slugs(model, batch) | set(slugs)
+        for base in batch:
+            slug, counter = base, 2
+            while slug in taken:
+                slug, counter = f"{base}-{counter}", counter + 1
+            taken.add(slug)
+            slugs.append(slug)
+    return slugs
+
+
+def _conflicts(model, slugs, exclude_pk=None):
+    return model._default_manager.filter(slug__in=slugs).exclude(pk=exclude_pk).exists()
+
+
+def save_with_unique_slug(instance, save, *args, **kwargs):
+    """save(*args, **kwargs) с подобранным slug; при конфликте с параллельной записью — заново."""
+    model = type(instance)
+    base = instance.slug_base()
+    for attempt in range(1, SLUG_ATTEMPTS + 1):
+        (instance.slug,) = allocate_slugs(model, [base])
+        try:
+            with transaction.atomic():
+                save(*args, **kwargs)
+            return
+        except IntegrityError:
+            if attempt == SLUG_ATTEMPTS or not _conflicts(model, [instance.slug], instance.pk):
+                instance.slug = ""
+                raise
+
+
+def bulk_create_with_slugs(objects, bases=None, **bulk_create_kwargs):
+    """
+    bulk_create объектов одной модели AutoSlugModel с подобранными slug. bases — основы по
+    объектам (по умолчанию slug_base() у объектов без slug; None — оставить slug объекта).
+    При конфликте с параллельной записью slug подбираются заново.
+    """
+    objects = list(objects)
+    if not objects:
+        return objects
+    model = type(objects[0])
+    if bases is None:
+        bases = [None if obj.slug else obj.slug_base() for obj in objects]
+    pending = [(obj, base) for obj, base in zip(objects, bases) if base is not None]
+    for attempt in range(1, SLUG_ATTEMPTS + 1):
+        slugs = allocate_slugs(model, [base for _, base in pending])
+        for (obj, _), slug in zip(pending, slugs):
+            obj.slug = slug
+        try:
+            with transaction.atomic():
+                return model._default_manager.bulk_create(objects, **bulk_create_kwargs)
+        except IntegrityError:
+            if attempt == SLUG_ATTEMPTS or not _conflicts(model, slugs):
+                raise
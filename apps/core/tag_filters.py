@@ -0,0 +1,119 @@
+"""
+Фильтр списков по тегам: EXISTS по таблице связи M2M вместо JOIN + DISTINCT.
+
+JOIN по tags__slug размножал строки объекта (по строке на совпавший тег), и DISTINCT
+по всем колонкам убирал дубли уже после сортировки: ни индексного порядка, ни дешёвого
+COUNT. Здесь каждое условие — полусоединение EXISTS по (объект, тег) в таблице связи,
+строка объекта в выборке остаётся одна и DISTINCT не нужен.
+
+Параметры запроса (слаги через запятую):
+    tags_any (и прежний tags) — есть хотя бы один из тегов;
+    tags_all (и прежний tag)  — есть все теги;
+    tags_exclude              — нет ни одного из тегов.
+
+Слаги переводятся в id по словарю slug → id в памяти процесса. Словарь привязан
+к поколению модели Tag (apps.core.cache): любое изменение тегов его сбрасывает.
+"""
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+
+from apps.core.cache import MISSING, LocalTTLCache, get_generations
+from apps.core.models import Tag
+
+TAGS_ANY_PARAMS = ("tags", "tags_any")
+TAGS_ALL_PARAMS = ("tag", "tags_all")
+TAGS_EXCLUDE_PARAMS = ("tags_exclude",)
+MAX_TAGS_PER_PARAM = 20
+
+_local_tag_ids = LocalTTLCache(maxsize=4, ttl=settings.TAG_ID_CACHE_LOCAL_TTL)
+
+
+def tag_ids_by_slug():
+    """Словарь slug → id всех тегов (тегов немного — грузится целиком, одним запросом)."""
+    (generation,) = get_generations([Tag])
+    ids = _local_tag_ids.get(generation)
+    if ids is MISSING:
+        ids = dict(Tag.objects.values_list("slug", "id"))
+        _local_tag_ids.set(generation, ids)
+    return ids
+
+
+def parse_tag_slugs(query_params, names):
+    """Слаги из параметров names (через запятую, без пустых и повторов)."""
+    slugs = []
+    for name in names:
+        param_slugs = [slug.strip() for slug in query_params.get(name, "").split(",") if slug.strip()]
+        if len(param_slugs) > MAX_TAGS_PER_PARAM:
+            raise ValidationError({name: f"Не больше {MAX_TAGS_PER_PARAM} тегов."})
+        slugs += param_slugs
+    return list(dict.fromkeys(slugs))
+
+
+def filter_by_tags(queryset, query_params, field_name="tags"):
+    """Отфильтровать queryset по параметрам tags_any / tags_all / tags_exclude (и tag / tags)."""
+    any_slugs = parse_tag_slugs(query_params, TAGS_ANY_PARAMS)
+    all_slugs = parse_tag_slugs(query_params, TAGS_ALL_PARAMS)
+    exclude_slugs = parse_tag_slugs(query_params, TAGS_EXCLUDE_PARAMS)
+    if not (any_slugs or all_slugs or exclude_slugs):
+        return queryset
+
+    ids = tag_ids_by_slug()
+    any_ids = [ids[slug] for slug in any_slugs if slug in ids]
+    all_ids = [ids[slug] for slug in all_slugs if slug in ids]
+    exclude_ids = [ids[slug] for slug in exclude_slugs if slug in ids]
+    # Несуществующий тег: в tags_all — совпадений нет; в tags_any / tags_exclude не участвует.
+    if (any_slugs and not any_ids) or len(all_ids) < len(all_slugs):
+        return queryset.none()
+
+    field = queryset.model._meta.get_field(field_name)
+    through = field.remote_field.through
+    owner, tag = field.m2m_field_name(), field.m2m_reverse_field_name()
+
+    def having(tag_ids):
+        return Exists(through.objects.filter(**{owner: OuterRef("pk"), f"{tag}__in": tag_ids}))
+
+    if any_ids:
+        queryset = queryset.filter(having(any_ids))
+    for tag_id in all_ids:
+        queryset = queryset.filter(having([tag_id]))
+    if exclude_ids:
+        queryset = queryset.filter(~having(exclude_ids))
+    return queryset
+
+
+def tag_filter_parameters(object_name):
+    """Параметры фильтра по тегам для OpenAPI (object_name — «события», «новости»)."""
+    return [
+        OpenApiParameter(
+            name="tags_any",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=f"Слаги тегов через запятую: {object_name} хотя бы с одним из тегов.",
+        ),
+        OpenApiParameter(
+            name="tags_all",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=f"Слаги тегов через запятую: {object_name} со всеми тегами.",
+        ),
+        OpenApiParameter(
+            name="tags_exclude",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=f"Слаги тегов через запятую: {object_name} без этих тегов.",
+        ),
+        OpenApiParameter(
+            name="tag",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Слаг тега (например: sobytiya); то же, что tags_all с одним тегом.",
+        ),
+        OpenApiParameter(
+            name="tags",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Слаги тегов через запятую; то же, что tags_any.",
+        ),
+    ]
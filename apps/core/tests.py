@@ -1,9 +1,33 @@
-"""Проверка DocsOrApiKey и OnlyWithApiKeyOrFromFrontend (без БД)."""
+"""Проверка DocsOrApiKey и OnlyWithApiKeyOrFromFrontend и кэша API-ключей."""
+from datetime import date, time
+from io import StringIO
 from unittest.mock import MagicMock, patch
 
-from django.test import RequestFactory, SimpleTestCase
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.transaction import TransactionManagementError
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-from apps.core.permissions import DocsOrApiKey, OnlyWithApiKeyOrFromFrontend
+from apps.core.content_analysis import analyze_content
+from apps.core.management.commands.search_index_check import seq_scans, trigram_indexes
+from apps.core.markdown import markdown_digest
+from apps.core.models import ApiKey, RenderedMarkdown, SearchDocument, Tag
+from apps.core.permissions import (
+    DocsOrApiKey,
+    OnlyWithApiKeyOrFromFrontend,
+    clear_api_key_cache,
+    invalidate_api_key,
+    is_valid_api_key,
+)
+from apps.core.search import federated_search, set_trigram_threshold
+from apps.core.slugs import allocate_slugs, bulk_create_with_slugs
+from apps.events.models import Event, Speaker
+from apps.materials.models import Material, MaterialCategory
+from apps.news.models import NewsArticle
+from apps.pages.models import Page
 
 
 class ApiAccessProtectionTests(SimpleTestCase):
@@ -12,6 +36,8 @@ class ApiAccessProtectionTests(SimpleTestCase):
     def setUp(self):
         self.factory = RequestFactory()
         self.view = MagicMock()
+        clear_api_key_cache()
+        cache.clear()
 
     @patch("apps.core.permissions.ApiKey.objects.filter")
     def test_only_api_key_denies_without_key_or_trusted_origin(self, mock_filter):
@@ -65,3 +91,632 @@ class ApiAccessProtectionTests(SimpleTestCase):
         perm = DocsOrApiKey()
         request = self.factory.get("/api/v1/core/tags/")
         self.assertFalse(perm.has_permission(request, self.view))
+
+
+class ApiKeyCacheTests(SimpleTestCase):
+    """Повторная проверка ключа не ходит в БД; сброс кэша заставляет перечитать ключ."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.view = MagicMock()
+        clear_api_key_cache()
+        cache.clear()
+
+    @patch("apps.core.permissions.ApiKey.objects.filter")
+    def test_valid_key_is_checked_in_db_once(self, mock_filter):
+        mock_filter.return_value.exists.return_value = True
+        perm = OnlyWithApiKeyOrFromFrontend()
+        request = self.factory.get("/api/v1/core/tags/", HTTP_X_API_KEY="cached-key")
+        for _ in range(3):
+            self.assertTrue(perm.has_permission(request, self.view))
+        self.assertEqual(mock_filter.call_count, 1)
+
+    @patch("apps.core.permissions.ApiKey.objects.filter")
+    def test_shared_cache_is_used_when_local_cache_is_empty(self, mock_filter):
+        mock_filter.return_value.exists.return_value = True
+        perm = OnlyWithApiKeyOrFromFrontend()
+        request = self.factory.get("/api/v1/core/tags/", HTTP_X_API_KEY="shared-key")
+        self.assertTrue(perm.has_permission(request, self.view))
+        clear_api_key_cache()  # как будто запрос пришёл в другой воркер
+        self.assertTrue(perm.has_permission(request, self.view))
+        self.assertEqual(mock_filter.call_count, 1)
+
+    @patch("apps.core.permissions.ApiKey.objects.filter")
+    def test_invalidate_forces_db_lookup(self, mock_filter):
+        mock_filter.return_value.exists.return_value = True
+        perm = OnlyWithApiKeyOrFromFrontend()
+        request = self.factory.get("/api/v1/core/tags/", HTTP_X_API_KEY="revoked-key")
+        self.assertTrue(perm.has_permission(request, self.view))
+        mock_filter.return_value.exists.return_value = False
+        invalidate_api_key("revoked-key")
+        self.assertFalse(perm.has_permission(request, self.view))
+        self.assertEqual(mock_filter.call_count, 2)
+
+    @patch("apps.core.permissions.ApiKey.objects.filter")
+    @patch("apps.core.permissions._local_api_keys.maxsize", 2)
+    def test_invalid_keys_do_not_evict_valid_ones(self, mock_filter):
+        mock_filter.return_value.exists.return_value = True
+        self.assertTrue(is_valid_api_key("valid-key"))
+        mock_filter.return_value.exists.return_value = False
+        for token in ("junk-1", "junk-2", "junk-3", "junk-1"):
+            self.assertFalse(is_valid_api_key(token))
+        self.assertEqual(mock_filter.call_count, 4)  # повторный junk-1 — из кэша Django
+        cache.clear()  # рабочий ключ по-прежнему в LRU воркера
+        self.assertTrue(is_valid_api_key("valid-key"))
+        self.assertEqual(mock_filter.call_count, 4)
+
+
+class ApiKeySignalsTests(TestCase):
+    """Сигналы ApiKey сбрасывают кэш: отключённый или удалённый ключ сразу перестаёт работать."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.view = MagicMock()
+        clear_api_key_cache()
+        cache.clear()
+        self.api_key = ApiKey.objects.create(name="signals-key", is_active=True)
+
+    def _request(self, token):
+        return self.factory.get("/api/v1/core/tags/", HTTP_X_API_KEY=token)
+
+    def test_deactivated_key_is_rejected(self):
+        perm = OnlyWithApiKeyOrFromFrontend()
+        self.assertTrue(perm.has_permission(self._request(self.api_key.key), self.view))
+        self.api_key.is_active = False
+        self.api_key.save()
+        self.assertFalse(perm.has_permission(self._request(self.api_key.key), self.view))
+
+    def test_deleted_key_is_rejected(self):
+        perm = OnlyWithApiKeyOrFromFrontend()
+        token = self.api_key.key
+        self.assertTrue(perm.has_permission(self._request(token), self.view))
+        self.api_key.delete()
+        self.assertFalse(perm.has_permission(self._request(token), self.view))
+
+    def test_rotated_key_invalidates_previous_token(self):
+        perm = OnlyWithApiKeyOrFromFrontend()
+        old_token = self.api_key.key
+        self.assertTrue(perm.has_permission(self._request(old_token), self.view))
+        self.api_key.key = "rotated-token"
+        self.api_key.save(update_fields=["key"])
+        self.assertFalse(perm.has_permission(self._request(old_token), self.view))
+        self.assertTrue(perm.has_permission(self._request("rotated-token"), self.view))
+
+
+class SearchIndexCheckCommandTests(TestCase):
+    """manage.py search_index_check: индексы на месте, планы поисковых запросов проверяются."""
+
+    def test_declared_trigram_indexes_cover_search_tables(self):
+        self.assertEqual(trigram_indexes(), ["core_searchdoc_text_trgm", "core_suggest_trgm"])
+
+    def test_command_passes_on_migrated_database(self):
+        out = StringIO()
+        call_command("search_index_check", "--query", "meetup", stdout=out, stderr=StringIO())
+        self.assertIn("events", out.getvalue())
+
+    def test_command_fails_when_index_is_missing(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX core_searchdoc_text_trgm")
+        with self.assertRaises(CommandError):
+            call_command("search_index_check", stdout=StringIO(), stderr=StringIO())
+
+    def test_seq_scans_walks_nested_plan(self):
+        plan = {
+            "Node Type": "Nested Loop",
+            "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "events_event"},
+                {"Node Type": "Bitmap Heap Scan", "Relation Name": "news_newsarticle"},
+            ],
+        }
+        self.assertEqual(seq_scans(plan), ["events_event"])
+
+
+class SearchDocumentSignalsTests(TestCase):
+    """SearchDocument поддерживается сигналами: сохранение, M2M в обе стороны, связанные объекты."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tag = Tag.objects.create(name="Agile", slug="agile")
+        cls.event = Event.objects.create(
+            title="Scrum Meetup",
+            slug="scrum-meetup",
+            description="Ретроспективы и планирование.",
+            date=date(2026, 5, 1),
+            time_start=time(19, 0),
+        )
+
+    def _text(self):
+        return SearchDocument.objects.get(kind=SearchDocument.KIND_EVENT, object_id=self.event.pk).text
+
+    def test_document_created_and_normalized(self):
+        self.assertEqual(self._text(), "scrum meetup ретроспективы и планирование.")
+
+    def test_m2m_changes_update_document(self):
+        self.event.tags.add(self.tag)
+        self.assertIn("agile", self._text())
+        self.tag.events.clear()
+        self.assertNotIn("agile", self._text())
+
+        speaker = Speaker.objects.create(full_name="Анна Петрова")
+        speaker.events.add(self.event)
+        self.assertIn("анна петрова", self._text())
+
+    def test_related_rename_and_delete_update_document(self):
+        self.event.tags.add(self.tag)
+        self.tag.name = "Kanban"
+        self.tag.save()
+        self.assertIn("kanban", self._text())
+        self.tag.delete()
+        self.assertNotIn("kanban", self._text())
+
+    def test_event_delete_removes_document(self):
+        event_id = self.event.pk
+        self.event.delete()
+        self.assertFalse(
+            SearchDocument.objects.filter(kind=SearchDocument.KIND_EVENT, object_id=event_id).exists()
+        )
+
+    def test_rebuild_command_restores_documents(self):
+        SearchDocument.objects.all().delete()
+        call_command("rebuild_search_documents", stdout=StringIO())
+        self.assertIn("scrum meetup", self._text())
+
+
+class FederatedSearchApiTests(TestCase):
+    """/api/v1/core/search/: общая выдача, facets по типам, лимит на тип — одним запросом."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-search-key", is_active=True)
+        cls.event = Event.objects.create(
+            title="Product Discovery Meetup",
+            slug="product-discovery-meetup",
+            date=date(2026, 6, 1),
+            time_start=time(19, 0),
+        )
+        cls.article = NewsArticle.objects.create(
+            title="Product Discovery Basics",
+            slug="product-discovery-basics",
+            publication_date=timezone.now(),
+            is_published=True,
+        )
+        NewsArticle.objects.create(
+            title="Product Discovery Draft",
+            slug="product-discovery-draft",
+            publication_date=timezone.now(),
+            is_published=False,
+        )
+        category = MaterialCategory.objects.create(slug="books", title="Books")
+        cls.material = Material.objects.create(title="Product Discovery Checklist", category=category)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+        is_valid_api_key(self.api_key.key)  # проверка ключа из кэша — в assertNumQueries только поиск
+
+    def test_returns_hits_of_all_types_with_facets(self):
+        with self.assertNumQueries(2):  # set_config порога (до конца транзакции) + один UNION ALL
+            response = self.client.get("/api/v1/core/search/", {"search": "product discovery"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["facets"], {"event": 1, "news": 1, "material": 1})
+        hits = {(hit["type"], hit["lookup"]) for hit in response.data["results"]}
+        self.assertEqual(
+            hits,
+            {
+                ("event", self.event.slug),
+                ("news", self.article.slug),
+                ("material", str(self.material.pk)),
+            },
+        )
+        ranks = [hit["search_rank"] for hit in response.data["results"]]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+    def test_type_filter_keeps_facets(self):
+        response = self.client.get("/api/v1/core/search/", {"search": "product discovery", "type": "news"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([hit["type"] for hit in response.data["results"]], ["news"])
+        self.assertEqual(response.data["facets"]["event"], 1)
+
+    @override_settings(SEARCH_MAX_RESULTS_PER_TYPE=1)
+    def test_max_per_type(self):
+        Event.objects.create(
+            title="Product Discovery Meetup #2",
+            slug="product-discovery-meetup-2",
+            date=date(2026, 7, 1),
+            time_start=time(19, 0),
+        )
+        response = self.client.get("/api/v1/core/search/", {"search": "product discovery"})
+        self.assertEqual(response.data["facets"]["event"], 1)
+        self.assertEqual(response.data["max_per_type"], 1)
+
+    def test_validation(self):
+        self.assertEqual(self.client.get("/api/v1/core/search/").status_code, 400)
+        response = self.client.get("/api/v1/core/search/", {"search": "product", "type": "pages"})
+        self.assertEqual(response.status_code, 400)
+
+
+class SearchThresholdTests(TransactionTestCase):
+    """Порог pg_trgm живёт до конца транзакции поиска и не остаётся на соединении."""
+
+    def threshold(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT current_setting('pg_trgm.strict_word_similarity_threshold', true)")
+            return cursor.fetchone()[0]
+
+    def test_threshold_does_not_leak(self):
+        api_key = ApiKey.objects.create(name="tests-threshold-key", is_active=True)
+        Event.objects.create(
+            title="Product Discovery", slug="product-discovery", date=date(2026, 6, 1), time_start=time(19, 0)
+        )
+        client = APIClient()
+        client.credentials(HTTP_X_API_KEY=api_key.key)
+        before = self.threshold()
+
+        hits = federated_search("produkt discovery", min_rank=0.2)
+        self.assertEqual([hit["lookup"] for hit in hits], ["product-discovery"])
+        self.assertEqual(self.threshold(), before)
+
+        response = client.get("/api/v1/events/events/", {"search": "produkt discovery", "min_rank": "0.2"})
+        self.assertEqual([row["slug"] for row in response.data["results"]], ["product-discovery"])
+        self.assertEqual(self.threshold(), before)
+        with self.assertRaises(TransactionManagementError):
+            set_trigram_threshold("strict_word_similarity_threshold", 0.2)
+
+    def test_detail_ignores_search(self):
+        api_key = ApiKey.objects.create(name="tests-threshold-detail-key", is_active=True)
+        Event.objects.create(title="Kanban", slug="kanban", date=date(2026, 6, 1), time_start=time(19, 0))
+        NewsArticle.objects.create(title="Kanban", slug="kanban", is_published=True)
+        category = MaterialCategory.objects.create(slug="kanban", title="Kanban")
+        material = Material.objects.create(title="Kanban", category=category)
+        client = APIClient()
+        client.credentials(HTTP_X_API_KEY=api_key.key)
+        for url in (
+            "/api/v1/events/events/kanban/",
+            "/api/v1/news/articles/kanban/",
+            f"/api/v1/materials/materials/{material.pk}/",
+        ):
+            response = client.get(url, {"search": "другое", "min_rank": "0.2"})
+            self.assertEqual(response.status_code, 200, url)
+
+
+class SuggestApiTests(TestCase):
+    """/api/v1/core/suggest/: подсказки из SearchSuggestion, поддерживаемой сигналами."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-suggest-key", is_active=True)
+        cls.tag = Tag.objects.create(name="Agile", slug="agile")
+        cls.speaker = Speaker.objects.create(full_name="Анна Петрова")
+        cls.event = Event.objects.create(
+            title="Product Discovery Meetup",
+            slug="product-discovery-meetup",
+            date=date(2026, 6, 1),
+            time_start=time(19, 0),
+        )
+        cls.draft = NewsArticle.objects.create(
+            title="Product Roadmap Draft",
+            slug="product-roadmap-draft",
+            publication_date=timezone.now(),
+            is_published=False,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+        is_valid_api_key(self.api_key.key)
+
+    def _suggest(self, **params):
+        response = self.client.get("/api/v1/core/suggest/", params)
+        self.assertEqual(response.status_code, 200)
+        return [(row["type"], row["text"]) for row in response.data]
+
+    def test_prefix_and_word_matches(self):
+        with self.assertNumQueries(1):  # короткий запрос — только префикс
+            self.assertEqual(self._suggest(q="ag"), [("tag", "Agile")])
+        self.assertEqual(self._suggest(q="Петрова"), [("speaker", "Анна Петрова")])
+        self.assertEqual(self._suggest(q="discovry"), [("event", "Product Discovery Meetup")])
+        self.assertEqual(self._suggest(q="prod"), [("event", "Product Discovery Meetup")])
+
+    def test_type_and_limit(self):
+        self.assertEqual(self._suggest(q="ан", type="speaker"), [("speaker", "Анна Петрова")])
+        Tag.objects.create(name="Agile Coaching", slug="agile-coaching")
+        self.assertEqual(self._suggest(q="agile", limit="1"), [("tag", "Agile")])
+        self.assertEqual(
+            self.client.get("/api/v1/core/suggest/", {"q": "a", "type": "page"}).status_code, 400
+        )
+
+    def test_signals_keep_suggestions_in_sync(self):
+        self.draft.is_published = True
+        self.draft.save()
+        self.assertIn(("news", "Product Roadmap Draft"), self._suggest(q="product"))
+
+        self.event.title = "Product Delivery Meetup"
+        self.event.save()
+        self.assertIn(("event", "Product Delivery Meetup"), self._suggest(q="product"))
+
+        self.event.delete()
+        self.draft.is_published = False
+        self.draft.save()
+        self.assertEqual(self._suggest(q="product"), [])
+
+
+class ResponseCacheTests(TestCase):
+    """CachedResponseMixin: повторное чтение без БД, сброс по post_save и m2m_changed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-response-cache-key", is_active=True)
+        cls.tag = Tag.objects.create(name="Agile", slug="agile")
+        cls.event = Event.objects.create(
+            title="Scrum Meetup",
+            slug="scrum-meetup",
+            date=date(2026, 5, 1),
+            time_start=time(19, 0),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+        is_valid_api_key(self.api_key.key)
+
+    def test_repeated_read_skips_database(self):
+        first = self.client.get("/api/v1/core/tags/", {"page": 1})
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/v1/core/tags/", {"page": "1"})
+        self.assertEqual(first.json(), second.json())
+
+    def test_save_invalidates(self):
+        self.client.get("/api/v1/core/tags/agile/")
+        self.tag.name = "Kanban"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.save()
+            # Поколение меняется только после коммита: до него читается прежний ответ.
+            self.assertEqual(self.client.get("/api/v1/core/tags/agile/").data["name"], "Agile")
+        self.assertEqual(self.client.get("/api/v1/core/tags/agile/").data["name"], "Kanban")
+
+    def test_m2m_change_invalidates(self):
+        url = f"/api/v1/events/events/{self.event.slug}/"
+        self.assertEqual(self.client.get(url).data["tags"], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.events.add(self.event)
+        self.assertEqual([tag["slug"] for tag in self.client.get(url).data["tags"]], ["agile"])
+
+    @override_settings(RESPONSE_CACHE_TTL=0)
+    def test_disabled(self):
+        self.client.get("/api/v1/core/tags/")
+        with self.assertNumQueries(3):  # валидатор ETag + COUNT + страница
+            self.client.get("/api/v1/core/tags/")
+
+
+class ConditionalGetTests(TestCase):
+    """ETag / Last-Modified: 304 без сериализации, новый ETag после изменений (в т.ч. M2M)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-conditional-key", is_active=True)
+        cls.tag = Tag.objects.create(name="Agile", slug="agile")
+        cls.event = Event.objects.create(
+            title="Scrum Meetup",
+            slug="scrum-meetup",
+            date=date(2026, 5, 1),
+            time_start=time(19, 0),
+        )
+        cls.page = Page.objects.create(name="Главная", slug="home")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+        is_valid_api_key(self.api_key.key)
+
+    def test_list_not_modified(self):
+        response = self.client.get("/api/v1/core/tags/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+        with self.assertNumQueries(0):  # валидаторы лежат рядом с закэшированным ответом
+            not_modified = self.client.get("/api/v1/core/tags/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+        etag = self.client.get("/api/v1/materials/categories/")["ETag"]
+        with self.assertNumQueries(1):  # без кэша ответов — только MAX(updated_at) + COUNT
+            not_modified = self.client.get("/api/v1/materials/categories/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+
+        self.tag.name = "Kanban"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.save()
+        changed = self.client.get("/api/v1/core/tags/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], response["ETag"])
+
+    def test_detail_etag_changes_on_m2m(self):
+        url = f"/api/v1/events/events/{self.event.slug}/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.tags.add(self.tag)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_modified_since(self):
+        url = f"/api/v1/events/events/{self.event.slug}/"
+        last_modified = self.client.get(url)["Last-Modified"]
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        self.assertEqual(self.client.get("/api/v1/events/events/missing/").status_code, 404)
+
+    def test_page_detail(self):
+        response = self.client.get("/api/pages/home/")
+        self.assertEqual(response.status_code, 200)
+        not_modified = self.client.get("/api/pages/home/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(self.client.get("/api/pages/missing/").status_code, 404)
+
+
+class MarkdownHtmlTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-markdown-key", is_active=True)
+        cls.event = Event.objects.create(
+            title="Markdown Meetup",
+            slug="markdown-meetup",
+            description="**Программа** <script>alert(1)</script> [ссылка](javascript:alert(1))",
+            date=date(2026, 5, 1),
+            time_start=time(19, 0),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+        self.url = f"/api/v1/events/events/{self.event.slug}/"
+
+    def test_html_is_optional_and_sanitized(self):
+        self.assertNotIn("description_html", self.client.get(self.url).data)
+        html = self.client.get(self.url, {"include": "description_html"}).data["description_html"]
+        self.assertIn("<strong>Программа</strong>", html)
+        self.assertNotIn("<script", html)
+        self.assertNotIn("javascript:", html)
+        fields_only = self.client.get(self.url, {"fields": "title,description_html"}).data
+        self.assertEqual(set(fields_only), {"title", "description_html"})
+
+    def test_rendered_once_per_content(self):
+        """HTML рендерится при сохранении; запросы деталей берут его из кэша, правка удаляет старую запись."""
+        old_digest = markdown_digest(self.event.description)
+        self.assertTrue(RenderedMarkdown.objects.filter(digest=old_digest).exists())
+        with patch("apps.core.markdown.render_to_html") as render:
+            for _ in range(2):
+                cache.clear()
+                self.client.get(self.url, {"include": "description_html"})
+        render.assert_not_called()
+
+        self.event.description = "Новая *программа*"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        self.assertFalse(RenderedMarkdown.objects.filter(digest=old_digest).exists())
+        self.assertTrue(RenderedMarkdown.objects.filter(digest=markdown_digest(self.event.description)).exists())
+        html = self.client.get(self.url, {"include": "description_html"}).data["description_html"]
+        self.assertIn("<em>программа</em>", html)
+
+    def test_shared_content_kept(self):
+        """Правка и удаление копии не удаляют HTML текста, который остался у оригинала."""
+        digest = markdown_digest(self.event.description)
+        copy = Event.objects.create(
+            title="Markdown Meetup (копия)",
+            slug="markdown-meetup-copy",
+            description=self.event.description,
+            date=date(2026, 6, 1),
+            time_start=time(19, 0),
+        )
+        copy.description = "Другая программа"
+        with self.captureOnCommitCallbacks(execute=True):
+            copy.save()
+        self.assertTrue(RenderedMarkdown.objects.filter(digest=digest).exists())
+
+        copy.description = self.event.description
+        copy.save()
+        copy.delete()
+        self.assertTrue(RenderedMarkdown.objects.filter(digest=digest).exists())
+        with patch("apps.core.markdown.render_to_html") as render:
+            cache.clear()
+            self.client.get(self.url, {"include": "description_html"})
+        render.assert_not_called()
+
+        self.event.delete()
+        self.assertFalse(RenderedMarkdown.objects.filter(digest=digest).exists())
+
+
+class ContentAnalysisTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-analysis-key", is_active=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+
+    @override_settings(CONTENT_READ_WORDS_PER_MINUTE=2)
+    def test_analyze_content(self):
+        analysis = analyze_content("# Итоги\n\nPM-менеджер &amp; **команда**.\n\n## Q & A\n\n## Q & A\n")
+        self.assertEqual(analysis.word_count, 7)
+        self.assertEqual(analysis.read_time_minutes, 4)
+        self.assertEqual(analysis.excerpt, "PM-менеджер & команда.")
+        self.assertEqual(
+            analysis.toc,
+            [
+                {"level": 1, "title": "Итоги", "anchor": "итоги"},
+                {"level": 2, "title": "Q & A", "anchor": "q-a"},
+                {"level": 2, "title": "Q & A", "anchor": "q-a_1"},
+            ],
+        )
+        long_excerpt = analyze_content("слово " * 100).excerpt
+        self.assertLessEqual(len(long_excerpt), 300)
+        self.assertTrue(long_excerpt.endswith("слово…"))
+        self.assertEqual(analyze_content(""), (0, 0, "", []))
+
+    def test_fields_updated_on_save(self):
+        article = NewsArticle.objects.create(
+            title="Итоги", slug="itogi", content="## Программа\n\n" + "текст " * 450, is_published=True
+        )
+        self.assertEqual((article.word_count, article.read_time_minutes), (451, 3))
+        self.assertEqual(article.toc[0]["anchor"], "программа")
+
+        article.title = "Итоги года"
+        with patch("apps.core.content_analysis.analyze_content") as analyze:
+            article.save(update_fields=["title"])
+        analyze.assert_not_called()
+
+        article.content = "Коротко."
+        article.save(update_fields=["content"])
+        article.refresh_from_db()
+        self.assertEqual((article.word_count, article.read_time_minutes, article.excerpt), (1, 1, "Коротко."))
+
+        data = self.client.get("/api/v1/news/articles/", {"fields": "slug,excerpt,read_time_minutes"}).data
+        self.assertEqual(data["results"], [{"slug": "itogi", "excerpt": "Коротко.", "read_time_minutes": 1}])
+        html = self.client.get("/api/v1/news/articles/itogi/", {"include": "content_html"}).data["content_html"]
+        self.assertEqual(html, "<p>Коротко.</p>")
+
+    def test_anchors_match_html(self):
+        article = NewsArticle.objects.create(
+            title="Якоря", slug="yakorya", content="## Шаг 1\n\nтекст", is_published=True
+        )
+        html = self.client.get(f"/api/v1/news/articles/{article.slug}/", {"include": "content_html"}).data
+        self.assertIn(f'<h2 id="{article.toc[0]["anchor"]}">Шаг 1</h2>', html["content_html"])
+
+    def test_analyze_content_command(self):
+        article = NewsArticle.objects.create(title="Без анализа", slug="bez-analiza", content="раз два три")
+        NewsArticle.objects.filter(pk=article.pk).update(word_count=None, excerpt="")
+        call_command("analyze_content", "--pending", stdout=StringIO())
+        article.refresh_from_db()
+        self.assertEqual((article.word_count, article.excerpt), (3, "раз два три"))
+
+
+class UniqueSlugTests(TestCase):
+    def test_collisions_get_suffixes(self):
+        Tag.objects.create(name="Agile coach")
+        slugs = [Tag.objects.create(name="Agile").slug for _ in range(3)]
+        self.assertEqual(slugs, ["agile", "agile-2", "agile-3"])
+        with self.assertNumQueries(1):
+            slugs = allocate_slugs(Tag, ["agile", "scrum", "agile-coach"])
+        self.assertEqual(slugs, ["agile-4", "scrum", "agile-coach-2"])
+
+        event = Event.objects.create(title="!!!", date=date(2026, 5, 1), time_start=time(19, 0))
+        self.assertEqual(event.slug, "event")
+        self.assertEqual(Tag.objects.create(name="Свой", slug="svoy").slug, "svoy")
+
+    def test_retry_after_concurrent_insert(self):
+        Tag.objects.create(name="Kanban")
+        # Между подбором и INSERT slug «kanban» занят параллельной записью.
+        with patch("apps.core.slugs.allocate_slugs", side_effect=[["kanban"], ["kanban-2"]]) as allocate:
+            tag = Tag.objects.create(name="Kanban")
+        self.assertEqual((tag.slug, allocate.call_count), ("kanban-2", 2))
+
+    def test_bulk_create_with_slugs(self):
+        Tag.objects.create(name="Lean")
+        tags = bulk_create_with_slugs(
+            [Tag(name="Lean"), Tag(name="Lean"), Tag(name="Свой", slug="svoy"), Tag(name="Scrum")]
+        )
+        self.assertEqual([tag.slug for tag in tags], ["lean-2", "lean-3", "svoy", "scrum"])
+        self.assertEqual(Tag.objects.filter(slug__startswith="lean").count(), 3)
@@ -1,11 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from apps.core.views import TagViewSet
+from apps.core.views import SearchAPIView, SuggestAPIView, TagViewSet
 
 router = DefaultRouter()
 router.register(r"tags", TagViewSet, basename="tag")
 
 urlpatterns = [
+    path("search/", SearchAPIView.as_view(), name="search"),
+    path("suggest/", SuggestAPIView.as_view(), name="suggest"),
     path("", include(router.urls)),
 ]
@@ -1,14 +1,166 @@
-from drf_spectacular.utils import extend_schema
-from rest_framework import viewsets
+from django.conf import settings
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import generics, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
-from apps.core.models import Tag
-from apps.core.serializers import TagSerializer
+from apps.core.mixins import CachedResponseMixin, ConditionalGetMixin, SparseFieldsetsMixin
+from apps.core.models import SearchDocument, SearchSuggestion, Tag
+from apps.core.search import (
+    SEARCH_MODES,
+    federated_search,
+    parse_min_rank,
+    parse_search_mode,
+    suggest,
+)
+from apps.core.serializers import (
+    SearchHitSerializer,
+    SearchResponseSerializer,
+    SuggestionSerializer,
+    TagSerializer,
+)
+
+SEARCH_KINDS = [kind for kind, _ in SearchDocument.KIND_CHOICES]
+SUGGEST_KINDS = [kind for kind, _ in SearchSuggestion.KIND_CHOICES]
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 20
+
+
+def parse_types(query_params, allowed):
+    """Типы из `?type=a,b`; неизвестные — 400."""
+    types = [t.strip() for t in query_params.get("type", "").split(",") if t.strip()]
+    unknown = set(types) - set(allowed)
+    if unknown:
+        raise ValidationError({"type": f"Неизвестные типы: {', '.join(sorted(unknown))}."})
+    return types
 
 
 @extend_schema(tags=["core"])
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(
+    ConditionalGetMixin, CachedResponseMixin, SparseFieldsetsMixin, viewsets.ReadOnlyModelViewSet
+):
     """Список и детали тегов (для фильтров событий/новостей)."""
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
+    cache_models = (Tag,)
     lookup_field = "slug"
     lookup_url_kwarg = "slug"
+
+
+@extend_schema(tags=["core"])
+class SearchAPIView(generics.GenericAPIView):
+    """
+    Общий поиск по событиям, новостям и материалам одним запросом к БД.
+
+    GET /api/v1/core/search/?search=...
+    Выдача отсортирована по search_rank (общая шкала для всех типов); facets — число
+    найденных объектов по типам. От каждого типа берётся не больше SEARCH_MAX_RESULTS_PER_TYPE
+    лучших совпадений.
+    """
+
+    serializer_class = SearchHitSerializer
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="search",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description="Поисковая строка.",
+            ),
+            OpenApiParameter(
+                name="type",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Типы через запятую: event, news, material (facets считаются по всем типам).",
+            ),
+            OpenApiParameter(
+                name="min_rank",
+                type=float,
+                location=OpenApiParameter.QUERY,
+                description="Порог релевантности для триграммного поиска (по умолчанию 0.12; в режиме fulltext не применяется).",
+            ),
+            OpenApiParameter(
+                name="search_mode",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                enum=SEARCH_MODES,
+                description="Режим поиска: fuzzy (по умолчанию), fulltext, hybrid.",
+            ),
+        ],
+        responses=SearchResponseSerializer,
+    )
+    def get(self, request, *args, **kwargs):
+        search_query = request.query_params.get("search", "").strip()
+        if not search_query:
+            raise ValidationError({"search": "Укажите поисковую строку."})
+        types = parse_types(request.query_params, SEARCH_KINDS)
+
+        max_per_type = settings.SEARCH_MAX_RESULTS_PER_TYPE
+        hits = federated_search(
+            search_query,
+            parse_min_rank(request.query_params),
+            parse_search_mode(request.query_params),
+            max_per_type=max_per_type,
+        )
+        facets = dict.fromkeys(SEARCH_KINDS, 0)
+        for hit in hits:
+            facets[hit["kind"]] += 1
+        if types:
+            hits = [hit for hit in hits if hit["kind"] in types]
+
+        page = self.paginate_queryset(hits)
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        response.data["facets"] = facets
+        response.data["max_per_type"] = max_per_type
+        return response
+
+
+@extend_schema(tags=["core"])
+class SuggestAPIView(generics.GenericAPIView):
+    """
+    Подсказки при наборе в строке поиска: названия событий, новостей, материалов,
+    ФИО спикеров и теги.
+
+    GET /api/v1/core/suggest/?q=...
+    Читает только компактную таблицу SearchSuggestion (один индексный запрос), без
+    пагинации: возвращает не больше limit подсказок.
+    """
+
+    serializer_class = SuggestionSerializer
+    pagination_class = None
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description="Набранный текст (от 1 символа).",
+            ),
+            OpenApiParameter(
+                name="type",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Типы через запятую: event, news, material, speaker, tag.",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description=f"Сколько подсказок вернуть (по умолчанию {SUGGEST_DEFAULT_LIMIT}, не больше {SUGGEST_MAX_LIMIT}).",
+            ),
+        ],
+        responses=SuggestionSerializer(many=True),
+    )
+    def get(self, request, *args, **kwargs):
+        types = parse_types(request.query_params, SUGGEST_KINDS)
+        try:
+            limit = int(request.query_params.get("limit", SUGGEST_DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            limit = SUGGEST_DEFAULT_LIMIT
+        limit = max(1, min(SUGGEST_MAX_LIMIT, limit))
+        suggestions = suggest(request.query_params.get("q", ""), types, limit)
+        return Response(self.get_serializer(suggestions, many=True).data)
@@ -1,11 +1,13 @@
+from django import forms
 from django.contrib import admin
 from django.http import HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import path, reverse
 from django.contrib import messages
-from django.utils.text import slugify
 
-from .models import Speaker, Event, EventSegment, EventRegistration, EventGallery
+from .models import Speaker, Event, EventSegment, EventRegistration, EventGallery, EventSeries
+from .seats import has_free_seat
+from .series import copy_event, materialize_series
 
 
 @admin.register(Speaker)
@@ -30,10 +32,10 @@ class EventAdmin(admin.ModelAdmin):
         "title", "date", "time_start", "event_type", "format", "status",
         "is_featured", "capacity", "created_at",
     )
-    list_filter = ("status", "event_type", "format", "is_featured")
+    list_filter = ("status", "event_type", "format", "is_featured", "series")
     search_fields = ("title", "location_city")
     prepopulated_fields = {"slug": ("title",)}
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("word_count", "read_time_minutes", "created_at", "updated_at")
     filter_horizontal = ("tags", "speakers")
     inlines = [EventSegmentInline]
     date_hierarchy = "date"
@@ -56,55 +58,7 @@ class EventAdmin(admin.ModelAdmin):
         if not request.user.has_perm("events.add_event"):
             return HttpResponseForbidden()
         original = get_object_or_404(Event, pk=object_id)
-        base_slug = slugify(original.title, allow_unicode=True) + "-копия"
-        if len(base_slug) > 220:
-            base_slug = base_slug[:217] + "-"
-        slug = base_slug
-        counter = 2
-        while Event.objects.filter(slug=slug).exists():
-            suffix = f"-{counter}"
-            slug = (base_slug + suffix)[:220]
-            counter += 1
-        new_event = Event(
-            title=original.title,
-            slug=slug,
-            short_description=original.short_description,
-            description=original.description,
-            date=original.date,
-            time_start=original.time_start,
-            time_end=original.time_end,
-            format=original.format,
-            location_address=original.location_address,
-            location_city=original.location_city,
-            location_venue=original.location_venue,
-            online_url=original.online_url,
-            online_platform=original.online_platform,
-            event_type=original.event_type,
-            cover_image=None,
-            capacity=original.capacity,
-            price=original.price,
-            registration_type=original.registration_type,
-            status="draft",
-            cancellation_reason=original.cancellation_reason,
-            meta_title=original.meta_title,
-            meta_description=original.meta_description,
-            is_featured=original.is_featured,
-        )
-        new_event.save()
-        new_event.tags.set(original.tags.all())
-        new_event.speakers.set(original.speakers.all())
-        for seg in original.segments.all():
-            new_seg = EventSegment(
-                event=new_event,
-                title=seg.title,
-                description=seg.description,
-                time_start=seg.time_start,
-                time_end=seg.time_end,
-                order=seg.order,
-                location=seg.location,
-            )
-            new_seg.save()
-            new_seg.speakers.set(seg.speakers.all())
+        (new_event,) = copy_event(original, [original.date], [original.slug_base() + "-копия"])
         messages.success(
             request,
             "Событие успешно продублировано. Измените при необходимости дату и название.",
@@ -112,6 +66,27 @@ class EventAdmin(admin.ModelAdmin):
         return redirect(reverse("admin:events_event_change", args=[new_event.pk]))
 
 
+@admin.register(EventSeries)
+class EventSeriesAdmin(admin.ModelAdmin):
+    list_display = ("title", "template", "frequency", "interval", "starts_on", "occurrences", "created_at")
+    list_filter = ("frequency",)
+    search_fields = ("title", "template__title")
+    autocomplete_fields = ("template",)
+    actions = ["materialize"]
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        self._report(request, [obj])
+
+    @admin.action(description="Создать недостающие события серии")
+    def materialize(self, request, queryset):
+        self._report(request, queryset.select_related("template"))
+
+    def _report(self, request, series_list):
+        created = sum(len(materialize_series(series)) for series in series_list)
+        messages.info(request, f"Создано событий-черновиков: {created}. Проверьте их и опубликуйте.")
+
+
 @admin.register(EventSegment)
 class EventSegmentAdmin(admin.ModelAdmin):
     list_display = ("event", "title", "time_start", "time_end", "order")
@@ -121,8 +96,31 @@ class EventSegmentAdmin(admin.ModelAdmin):
     ordering = ("event", "order", "time_start")
 
 
+class EventRegistrationAdminForm(forms.ModelForm):
+    class Meta:
+        model = EventRegistration
+        fields = "__all__"
+
+    def clean(self):
+        # Окончательно место занимается при сохранении (apps.events.seats); здесь — понятная
+        # ошибка формы вместо исключения, если лимит уже исчерпан.
+        cleaned_data = super().clean()
+        event, status = cleaned_data.get("event"), cleaned_data.get("status")
+        if event is None or status not in EventRegistration.SEAT_STATUSES:
+            return cleaned_data
+        held = self.instance.pk is not None and self.instance.holds_seat and self.instance.event_id == event.pk
+        if not held and not has_free_seat(event.pk):
+            self.add_error(
+                "status",
+                "Свободных мест нет: увеличьте лимит события, отмените другую регистрацию "
+                "или поставьте статус «Лист ожидания».",
+            )
+        return cleaned_data
+
+
 @admin.register(EventRegistration)
 class EventRegistrationAdmin(admin.ModelAdmin):
+    form = EventRegistrationAdminForm
     list_display = ("user", "event", "status", "attendance_status", "created_at")
     list_filter = ("status", "attendance_status")
     search_fields = ("user__email", "event__title")
@@ -5,3 +5,11 @@ class EventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.events'
     verbose_name = 'События'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from apps.events import search  # noqa: F401
+        from apps.events import signals
+
+        post_migrate.connect(signals.fill_event_seats, sender=self)
@@ -0,0 +1,111 @@
+"""
+Календарь событий: дни месяца с числом событий и короткими карточками (тип, формат,
+время начала) — для сетки месяца на сайте, без листания списка событий.
+
+Месяц собирается одним запросом: диапазон по date (индекс events_event_cursor_idx),
+GROUP BY date, карточки дня — jsonb_agg по времени начала. В календаре только события
+со статусами LISTED_EVENT_STATUSES — те же, что в upcoming / past.
+
+Ответ месяца хранится в общем кэше под поколением области «календарь месяца»
+(apps.core.cache.get_scope_generation). Сигналы Event (apps.events.signals) меняют
+поколение месяцев, в которые событие попадало до и после правки, поэтому правка
+октябрьского события не сбрасывает ноябрь. Поколение же служит ETag: на актуальный
+If-None-Match — 304 без обращений к БД. Изменения в обход save()/delete()
+(queryset.update) видны через RESPONSE_CACHE_TTL.
+"""
+import re
+from datetime import date
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import JSONObject
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from apps.core.cache import bump_scope_generation, get_scope_generation
+from apps.events.models import LISTED_EVENT_STATUSES, Event
+
+MONTH_PARAM = "month"
+MONTH_RE = re.compile(r"^(\d{4})-(\d{2})$")
+
+CALENDAR_EVENT_FIELDS = ("id", "slug", "title", "event_type", "format", "status", "time_start", "time_end")
+
+
+def parse_month(query_params):
+    """Первый день месяца из ?month=YYYY-MM; без параметра — текущий месяц."""
+    raw = query_params.get(MONTH_PARAM, "").strip()
+    if not raw:
+        return timezone.localdate().replace(day=1)
+    match = MONTH_RE.match(raw)
+    try:
+        return date(int(match[1]), int(match[2]), 1)
+    except (TypeError, ValueError):
+        raise ValidationError({MONTH_PARAM: "Ожидается месяц YYYY-MM."})
+
+
+def next_month(first_day):
+    if first_day.month == 12:
+        return first_day.replace(year=first_day.year + 1, month=1)
+    return first_day.replace(month=first_day.month + 1)
+
+
+def calendar_scope(day):
+    """Область поколения календаря месяца, в который попадает day."""
+    return f"events:calendar:{day:%Y-%m}"
+
+
+def calendar_days(first_day):
+    """Дни месяца с событиями: [{date, count, events: [карточки]}] — один GROUP BY."""
+    rows = (
+        Event.objects.filter(
+            status__in=LISTED_EVENT_STATUSES, date__gte=first_day, date__lt=next_month(first_day)
+        )
+        .values("date")
+        .annotate(
+            count=Count("pk"),
+            events=JSONBAgg(
+                JSONObject(**{name: name for name in CALENDAR_EVENT_FIELDS}),
+                ordering=("time_start", "id"),
+            ),
+        )
+        .order_by("date")
+    )
+    return [{"date": row["date"].isoformat(), "count": row["count"], "events": row["events"]} for row in rows]
+
+
+def calendar_generation(first_day):
+    """Поколение календаря месяца — ключ кэша и ETag ответа."""
+    return get_scope_generation(calendar_scope(first_day))
+
+
+def calendar_month(first_day, generation):
+    """
+    Данные ответа календаря месяца: из кэша или одним запросом к БД. generation читается
+    до выборки: правка, пришедшая во время сборки, сменит поколение, и собранный ответ
+    просто не будет прочитан.
+    """
+    key = f"events:calendar:{first_day:%Y-%m}:{generation}"
+    cache = caches[settings.RESPONSE_CACHE_ALIAS]
+    data = cache.get(key)
+    if data is None:
+        days = calendar_days(first_day)
+        data = {"month": f"{first_day:%Y-%m}", "count": sum(day["count"] for day in days), "days": days}
+        if settings.RESPONSE_CACHE_TTL:
+            cache.set(key, data, settings.RESPONSE_CACHE_TTL)
+    return data
+
+
+def invalidate_calendar(days):
+    """Сбросить календарь месяцев, в которые попадают даты days, после коммита."""
+    date_field = Event._meta.get_field("date")
+    scopes = {calendar_scope(date_field.to_python(day)) for day in days if day}
+
+    def bump():
+        for scope in scopes:
+            bump_scope_generation(scope)
+
+    if scopes:
+        transaction.on_commit(bump)
@@ -0,0 +1,246 @@
+"""
+iCalendar-ленты (RFC 5545) для подписки в календарях: все события на сайте, события
+тега и регистрации пользователя. Сегменты программы (EventSegment) идут в ленте
+отдельными VEVENT рядом со своим событием.
+
+Календари опрашивают подписки часто, поэтому повторный опрос ленты почти не трогает БД:
+
+- версия ленты — поколения Event / EventSegment / Tag (apps.core.cache), у личной
+  ленты ещё поколение регистраций пользователя, плюс текущая дата (окно
+  EVENT_FEED_PAST_DAYS сдвигается раз в день). Версия читается только из кэша и
+  служит ETag: на актуальный If-None-Match — 304 без запросов к БД;
+- тело ленты хранится в кэше ответов под версией. При промахе лента отдаётся потоком
+  (StreamingHttpResponse) по мере чтения событий пачками и попадает в кэш, когда
+  поток дочитан до конца.
+
+Личная лента открывается по подписанной ссылке (feed_token): календарь не передаст ни
+сессию, ни ключ в заголовке, поэтому секрет — сама ссылка.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F, Prefetch
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import quote_etag
+
+from apps.core.cache import bump_scope_generation, get_generations, get_scope_generation
+from apps.core.mixins import conditional_response
+from apps.core.models import Tag
+from apps.core.tag_filters import filter_by_tags
+from apps.events.models import LISTED_EVENT_STATUSES, Event, EventSegment
+
+FEED_CONTENT_TYPE = "text/calendar; charset=utf-8"
+FEED_MODELS = (Event, EventSegment, Tag)
+FEED_TOKEN_SALT = "events.feeds.registrations"
+UID_DOMAIN = "pm-meetup"
+CHUNK_SIZE = 500
+
+EVENT_FIELDS = (
+    "id", "title", "short_description", "date", "time_start", "starts_at", "ends_at", "format",
+    "event_type", "location_address", "location_city", "location_venue", "online_url", "status",
+    "updated_at",
+)
+SEGMENT_FIELDS = ("id", "event_id", "title", "description", "time_start", "time_end", "location", "updated_at")
+# Регистрации в личной ленте и статус VEVENT для них.
+REGISTRATION_FEED_STATUSES = {"confirmed": "CONFIRMED", "pending": "TENTATIVE", "waitlisted": "TENTATIVE"}
+
+
+def escape_text(value):
+    """Значение типа TEXT: \\, ; и , экранируются, переводы строк — \\n."""
+    value = value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+    return value.replace("\r\n", "\\n").replace("\n", "\\n").replace("\r", "\\n")
+
+
+def fold(line):
+    """Строка свойства с CRLF, длинная — перенесена по 75 октетов (не разрывая символы UTF-8)."""
+    parts, current, size = [], "", 0
+    for char in line:
+        width = len(char.encode())
+        if size + width > 75:
+            parts.append(current)
+            current, size = " ", 1
+        current += char
+        size += width
+    parts.append(current)
+    return "\r\n".join(parts) + "\r\n"
+
+
+def prop(name, value):
+    return fold(f"{name}:{value}")
+
+
+def text_prop(name, value):
+    return prop(name, escape_text(value)) if value else ""
+
+
+def utc_stamp(moment):
+    return moment.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def event_location(event):
+    place = ", ".join(part for part in (event.location_venue, event.location_address, event.location_city) if part)
+    if event.format == "online":
+        return event.online_url or place
+    return place
+
+
+def event_status(event):
+    if event.status == "cancelled":
+        return "CANCELLED"
+    return REGISTRATION_FEED_STATUSES.get(getattr(event, "registration_status", None), "CONFIRMED")
+
+
+def event_component(event):
+    lines = [
+        "BEGIN:VEVENT\r\n",
+        prop("UID", f"event-{event.pk}@{UID_DOMAIN}"),
+        prop("DTSTAMP", utc_stamp(event.updated_at)),
+        prop("DTSTART", utc_stamp(event.starts_at)),
+        prop("DTEND", utc_stamp(event.ends_at)) if event.ends_at > event.starts_at else "",
+        text_prop("SUMMARY", event.title),
+        text_prop("DESCRIPTION", event.short_description),
+        text_prop("LOCATION", event_location(event)),
+        text_prop("CATEGORIES", event.get_event_type_display()),
+        prop("STATUS", event_status(event)),
+        "END:VEVENT\r\n",
+    ]
+    return "".join(lines)
+
+
+def segment_component(event, segment, zone):
+    # Сегмент раньше начала события — уже после полуночи; окончание раньше начала — тоже.
+    day = event.date + timedelta(days=1) if segment.time_start < event.time_start else event.date
+    start = datetime.combine(day, segment.time_start, tzinfo=zone)
+    end = datetime.combine(day, segment.time_end, tzinfo=zone)
+    if end < start:
+        end += timedelta(days=1)
+    lines = [
+        "BEGIN:VEVENT\r\n",
+        prop("UID", f"segment-{segment.pk}@{UID_DOMAIN}"),
+        prop("DTSTAMP", utc_stamp(segment.updated_at)),
+        prop("DTSTART", utc_stamp(start)),
+        prop("DTEND", utc_stamp(end)) if end > start else "",
+        text_prop("SUMMARY", f"{event.title}: {segment.title}"),
+        text_prop("DESCRIPTION", segment.description),
+        text_prop("LOCATION", segment.location or event_location(event)),
+        prop("RELATED-TO", f"event-{event.pk}@{UID_DOMAIN}"),
+        prop("STATUS", event_status(event)),
+        "END:VEVENT\r\n",
+    ]
+    return "".join(lines)
+
+
+def calendar_chunks(events, title):
+    """Тело ленты частями: заголовок календаря, по части на событие с сегментами, конец."""
+    yield "".join(
+        [
+            "BEGIN:VCALENDAR\r\n",
+            "VERSION:2.0\r\n",
+            "PRODID:-//PM Meetup//Events//RU\r\n",
+            "CALSCALE:GREGORIAN\r\n",
+            "METHOD:PUBLISH\r\n",
+            text_prop("X-WR-CALNAME", title),
+            prop("X-WR-TIMEZONE", settings.TIME_ZONE),
+        ]
+    )
+    zone = ZoneInfo(settings.TIME_ZONE)
+    for event in events.iterator(chunk_size=CHUNK_SIZE):
+        yield event_component(event) + "".join(
+            segment_component(event, segment, zone) for segment in event.segments.all()
+        )
+    yield "END:VCALENDAR\r\n"
+
+
+def feed_events(queryset):
+    """События ленты: окно EVENT_FEED_PAST_DAYS, ближайшие первыми, сегменты — одним запросом на пачку."""
+    since = timezone.now() - timedelta(days=settings.EVENT_FEED_PAST_DAYS)
+    segments = EventSegment.objects.only(*SEGMENT_FIELDS).order_by("order", "time_start")
+    return (
+        queryset.filter(starts_at__gte=since)
+        .only(*EVENT_FIELDS)
+        .prefetch_related(Prefetch("segments", queryset=segments))
+        .order_by("starts_at", "id")
+    )
+
+
+def listed_events():
+    return feed_events(Event.objects.filter(status__in=LISTED_EVENT_STATUSES))
+
+
+def tag_events(slug):
+    return feed_events(filter_by_tags(Event.objects.filter(status__in=LISTED_EVENT_STATUSES), {"tag": slug}))
+
+
+def registered_events(user_id):
+    # Регистрация на событие у пользователя одна (unique_together) — JOIN не размножает строки.
+    registered = Event.objects.filter(
+        registrations__user_id=user_id, registrations__status__in=REGISTRATION_FEED_STATUSES
+    ).annotate(registration_status=F("registrations__status"))
+    return feed_events(registered)
+
+
+def registrations_scope(user_id):
+    return f"events:feed:registrations:{user_id}"
+
+
+def invalidate_registrations_feed(user_id):
+    """Сменить версию личной ленты пользователя после коммита."""
+    transaction.on_commit(lambda: bump_scope_generation(registrations_scope(user_id)))
+
+
+def feed_token(user_id):
+    """Секрет ссылки на личную ленту: подписанный id пользователя."""
+    return signing.dumps(user_id, salt=FEED_TOKEN_SALT)
+
+
+def feed_token_user(token):
+    """id пользователя из feed_token; None — подпись не сошлась."""
+    try:
+        return signing.loads(token, salt=FEED_TOKEN_SALT)
+    except signing.BadSignature:
+        return None
+
+
+def feed_version(key, scopes=()):
+    """Версия ленты key: из поколений в кэше и текущей даты — без запросов к БД."""
+    generations = [*get_generations(FEED_MODELS), *(get_scope_generation(scope) for scope in scopes)]
+    raw = "|".join([key, timezone.localdate().isoformat(), *(str(generation) for generation in generations)])
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def _cached_stream(chunks, cache_key):
+    collected = []
+    for chunk in chunks:
+        collected.append(chunk)
+        yield chunk
+    if settings.EVENT_FEED_CACHE_TTL:
+        caches[settings.RESPONSE_CACHE_ALIAS].set(cache_key, "".join(collected), settings.EVENT_FEED_CACHE_TTL)
+
+
+def _feed_body(request, version, filename, title, get_events):
+    cache_key = f"events:feed:{version}"
+    body = caches[settings.RESPONSE_CACHE_ALIAS].get(cache_key)
+    if body is not None:
+        response = HttpResponse(body, content_type=FEED_CONTENT_TYPE)
+    else:
+        chunks = calendar_chunks(get_events(), title)
+        response = StreamingHttpResponse(_cached_stream(chunks, cache_key), content_type=FEED_CONTENT_TYPE)
+    response["Content-Disposition"] = f'inline; filename="{filename}.ics"'
+    return response
+
+
+def feed_response(request, key, filename, title, get_events, scopes=()):
+    """
+    Ответ ленты: 304 по If-None-Match, тело из кэша или поток. get_events() — queryset
+    событий (feed_events), вызывается только при промахе кэша.
+    """
+    version = feed_version(key, scopes)
+    return conditional_response(
+        request, (quote_etag(version), None), _feed_body, version, filename, title, get_events
+    )
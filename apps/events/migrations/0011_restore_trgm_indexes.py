@@ -0,0 +1,68 @@
+"""
+Возвращает триграммные индексы, удалённые в 0003 (они не были объявлены в Meta.indexes),
+и добавляет индекс для short_description — все поля search_rank в EventViewSet.
+"""
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ("core", "0002_enable_pg_trgm"),
+        ("events", "0010_alter_event_short_description"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="event",
+            index=GinIndex(
+                fields=["title"],
+                name="events_event_title_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="event",
+            index=GinIndex(
+                fields=["short_description"],
+                name="events_event_short_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="event",
+            index=GinIndex(
+                fields=["description"],
+                name="events_event_desc_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="event",
+            index=GinIndex(
+                fields=["location_city"],
+                name="events_event_city_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="event",
+            index=GinIndex(
+                fields=["location_venue"],
+                name="events_event_venue_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="speaker",
+            index=GinIndex(
+                fields=["full_name"],
+                name="events_speaker_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
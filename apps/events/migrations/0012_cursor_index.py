@@ -0,0 +1,24 @@
+"""
+Индекс под ключ курсорной пагинации EventViewSet (-date, -time_start, id).
+"""
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ("events", "0011_restore_trgm_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="event",
+            index=models.Index(
+                fields=["-date", "-time_start", "id"],
+                name="events_event_cursor_idx",
+            ),
+        ),
+    ]
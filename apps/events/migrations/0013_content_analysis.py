@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_cursor_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Выдержка'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='read_time_minutes',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Время чтения (мин)'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='toc',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Оглавление'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='word_count',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Слов в тексте'),
+        ),
+    ]
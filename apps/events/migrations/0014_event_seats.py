@@ -0,0 +1,24 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0013_content_analysis'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSeats',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='seats', serialize=False, to='events.event', verbose_name='Событие')),
+                ('capacity', models.PositiveIntegerField(default=0, help_text='Копия Event.capacity; 0 — без лимита', verbose_name='Лимит участников')),
+                ('taken', models.PositiveIntegerField(default=0, verbose_name='Занято мест')),
+            ],
+            options={
+                'verbose_name': 'Места события',
+                'verbose_name_plural': 'Места событий',
+            },
+        ),
+    ]
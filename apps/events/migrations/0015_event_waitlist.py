@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0014_event_seats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventregistration',
+            name='waitlist_ticket',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Позиция в очереди — номер минус EventSeats.waitlist_head', null=True, verbose_name='Номер в листе ожидания'),
+        ),
+        migrations.AddField(
+            model_name='eventseats',
+            name='waitlist_head',
+            field=models.PositiveIntegerField(default=0, help_text='Номер последнего, кто вышел из начала очереди', verbose_name='Голова листа ожидания'),
+        ),
+        migrations.AddField(
+            model_name='eventseats',
+            name='waitlist_tail',
+            field=models.PositiveIntegerField(default=0, verbose_name='Последний номер листа ожидания'),
+        ),
+        migrations.AlterField(
+            model_name='eventregistration',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Ожидает подтверждения'), ('confirmed', 'Подтверждена'), ('waitlisted', 'Лист ожидания'), ('cancelled', 'Отменена')], default='pending', max_length=20, verbose_name='Статус'),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(condition=models.Q(('status', 'waitlisted')), fields=['event', 'waitlist_ticket'], name='events_waitlist_idx'),
+        ),
+    ]
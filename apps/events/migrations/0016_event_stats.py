@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0015_event_waitlist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventStats',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='events.event', verbose_name='Событие')),
+                ('registered', models.PositiveIntegerField(default=0, help_text='Регистрации со статусом pending или confirmed', verbose_name='Зарегистрировано')),
+                ('confirmed', models.PositiveIntegerField(default=0, verbose_name='Подтверждено')),
+                ('waitlisted', models.PositiveIntegerField(default=0, verbose_name='В листе ожидания')),
+                ('attended', models.PositiveIntegerField(default=0, verbose_name='Посетили')),
+                ('no_show', models.PositiveIntegerField(default=0, verbose_name='Не явились')),
+            ],
+            options={
+                'verbose_name': 'Статистика события',
+                'verbose_name_plural': 'Статистика событий',
+            },
+        ),
+    ]
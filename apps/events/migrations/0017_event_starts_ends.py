@@ -0,0 +1,28 @@
+import datetime
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_renderedmarkdown'),
+        ('events', '0016_event_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='ends_at',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(then=models.Func(models.Value('Europe/Minsk'), models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('date'), '+', models.F('time_start')), output_field=models.DateTimeField()), function='timezone', output_field=models.DateTimeField()), time_end__isnull=True), models.When(then=models.Func(models.Value('Europe/Minsk'), models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('date'), '+', models.Value(datetime.timedelta(days=1))), '+', models.F('time_end')), output_field=models.DateTimeField()), function='timezone', output_field=models.DateTimeField()), time_end__lt=models.F('time_start')), default=models.Func(models.Value('Europe/Minsk'), models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('date'), '+', models.F('time_end')), output_field=models.DateTimeField()), function='timezone', output_field=models.DateTimeField())), output_field=models.DateTimeField(), verbose_name='Окончание'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='starts_at',
+            field=models.GeneratedField(db_persist=True, expression=models.Func(models.Value('Europe/Minsk'), models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('date'), '+', models.F('time_start')), output_field=models.DateTimeField()), function='timezone', output_field=models.DateTimeField()), output_field=models.DateTimeField(), verbose_name='Начало'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('status__in', ('published', 'registration_closed', 'completed'))), fields=['starts_at', 'id'], name='events_event_listed_start_idx'),
+        ),
+    ]
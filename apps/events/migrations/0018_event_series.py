@@ -0,0 +1,37 @@
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0017_event_starts_ends'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(max_length=200, verbose_name='Название серии')),
+                ('frequency', models.CharField(choices=[('weekly', 'Каждую неделю'), ('monthly', 'Каждый месяц, в то же число'), ('monthly_weekday', 'Каждый месяц, в тот же день недели (например, второй четверг)')], default='monthly_weekday', max_length=20, verbose_name='Повторение')),
+                ('interval', models.PositiveSmallIntegerField(default=1, help_text='Каждые N недель или месяцев', validators=[django.core.validators.MinValueValidator(1)], verbose_name='Интервал')),
+                ('starts_on', models.DateField(verbose_name='Первая дата')),
+                ('occurrences', models.PositiveSmallIntegerField(default=12, help_text='Уже созданные даты серии при повторном сохранении пропускаются', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(100)], verbose_name='Число событий')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='series_templates', to='events.event', verbose_name='Событие-шаблон')),
+            ],
+            options={
+                'verbose_name': 'Серия событий',
+                'verbose_name_plural': 'Серии событий',
+                'ordering': ['-starts_on'],
+            },
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='events.eventseries', verbose_name='Серия'),
+        ),
+    ]
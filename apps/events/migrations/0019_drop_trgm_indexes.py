@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0018_event_series'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_event_title_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_event_short_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_event_desc_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_event_city_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_event_venue_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='speaker',
+            name='events_speaker_name_trgm',
+        ),
+    ]
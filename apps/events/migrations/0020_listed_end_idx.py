@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_drop_tag_trgm_indexes'),
+        ('events', '0019_drop_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('status__in', ('published', 'registration_closed', 'completed'))), fields=['ends_at', 'id'], name='events_event_listed_end_idx'),
+        ),
+    ]
@@ -1,9 +1,28 @@
-from django.db import models
+from datetime import timedelta
+
+from django.db import models, transaction
 from django.conf import settings
-from django.utils.text import slugify
+from django.core.validators import MaxValueValidator, MinValueValidator
 from mdeditor.fields import MDTextField
 
-from apps.core.models import TimeStampedModel, Tag
+from apps.core.models import AnalyzedContentModel, AutoSlugModel, TimeStampedModel, Tag
+
+
+# Статусы событий, которые показываются на сайте (фильтры upcoming / past и их индекс).
+LISTED_EVENT_STATUSES = ("published", "registration_closed", "completed")
+
+
+def local_datetime(day, time):
+    """
+    Момент (timestamptz) из даты и времени в часовом поясе проекта:
+    timezone(TIME_ZONE, day + time). Выражение неизменяемое — годится для GENERATED.
+    """
+    return models.Func(
+        models.Value(settings.TIME_ZONE),
+        models.ExpressionWrapper(day + time, output_field=models.DateTimeField()),
+        function="timezone",
+        output_field=models.DateTimeField(),
+    )
 
 
 class Speaker(TimeStampedModel):
@@ -28,8 +47,11 @@ class Speaker(TimeStampedModel):
         return self.full_name
 
 
-class Event(TimeStampedModel):
+class Event(AutoSlugModel, AnalyzedContentModel, TimeStampedModel):
     """Событие (митап, воркшоп, конференция)."""
+    analyzed_field = "description"
+    slug_source = "title"
+
     FORMAT_CHOICES = [
         ("offline", "Офлайн"),
         ("online", "Онлайн"),
@@ -65,6 +87,27 @@ class Event(TimeStampedModel):
     date = models.DateField("Дата проведения")
     time_start = models.TimeField("Время начала")
     time_end = models.TimeField("Время окончания", null=True, blank=True)
+    # Вычисляемые колонки PostgreSQL: фильтры по времени и сортировка по одной колонке.
+    starts_at = models.GeneratedField(
+        expression=local_datetime(models.F("date"), models.F("time_start")),
+        output_field=models.DateTimeField(),
+        db_persist=True,
+        verbose_name="Начало",
+    )
+    ends_at = models.GeneratedField(
+        expression=models.Case(
+            models.When(time_end__isnull=True, then=local_datetime(models.F("date"), models.F("time_start"))),
+            # Окончание раньше начала — событие заканчивается на следующий день.
+            models.When(
+                time_end__lt=models.F("time_start"),
+                then=local_datetime(models.F("date") + models.Value(timedelta(days=1)), models.F("time_end")),
+            ),
+            default=local_datetime(models.F("date"), models.F("time_end")),
+        ),
+        output_field=models.DateTimeField(),
+        db_persist=True,
+        verbose_name="Окончание",
+    )
     format = models.CharField(
         "Формат", max_length=20, choices=FORMAT_CHOICES, default="offline"
     )
@@ -101,6 +144,14 @@ class Event(TimeStampedModel):
     cancellation_reason = models.TextField("Причина отмены", blank=True)
     meta_title = models.CharField("SEO: заголовок", max_length=200, blank=True)
     meta_description = models.CharField("SEO: описание", max_length=300, blank=True)
+    series = models.ForeignKey(
+        "EventSeries",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="events",
+        verbose_name="Серия",
+    )
     is_featured = models.BooleanField(
         "Рекомендованное событие",
         default=False,
@@ -118,14 +169,65 @@ class Event(TimeStampedModel):
         verbose_name = "Событие"
         verbose_name_plural = "События"
         ordering = ["-date", "-time_start"]
+        indexes = [
+            # Ключ курсорной пагинации (apps.core.pagination) и сортировки по умолчанию.
+            models.Index(fields=["-date", "-time_start", "id"], name="events_event_cursor_idx"),
+            # Фильтр upcoming (apps.events.time_filters): диапазон по starts_at
+            # только среди показываемых на сайте событий.
+            models.Index(
+                fields=["starts_at", "id"],
+                condition=models.Q(status__in=LISTED_EVENT_STATUSES),
+                name="events_event_listed_start_idx",
+            ),
+            # past: диапазон по ends_at, последние первыми (обратный просмотр).
+            models.Index(
+                fields=["ends_at", "id"],
+                condition=models.Q(status__in=LISTED_EVENT_STATUSES),
+                name="events_event_listed_end_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title, allow_unicode=True)
-        super().save(*args, **kwargs)
+
+class EventSeries(TimeStampedModel):
+    """
+    Серия повторяющихся событий: копии события-шаблона (с сегментами, спикерами и тегами)
+    на даты по правилу повторения. Копии создаются черновиками, см. apps.events.series.
+    """
+    FREQUENCY_CHOICES = [
+        ("weekly", "Каждую неделю"),
+        ("monthly", "Каждый месяц, в то же число"),
+        ("monthly_weekday", "Каждый месяц, в тот же день недели (например, второй четверг)"),
+    ]
+    MAX_OCCURRENCES = 100
+
+    title = models.CharField("Название серии", max_length=200)
+    template = models.ForeignKey(
+        Event, on_delete=models.PROTECT, related_name="series_templates", verbose_name="Событие-шаблон"
+    )
+    frequency = models.CharField(
+        "Повторение", max_length=20, choices=FREQUENCY_CHOICES, default="monthly_weekday"
+    )
+    interval = models.PositiveSmallIntegerField(
+        "Интервал", default=1, validators=[MinValueValidator(1)], help_text="Каждые N недель или месяцев"
+    )
+    starts_on = models.DateField("Первая дата")
+    occurrences = models.PositiveSmallIntegerField(
+        "Число событий",
+        default=12,
+        validators=[MinValueValidator(1), MaxValueValidator(MAX_OCCURRENCES)],
+        help_text="Уже созданные даты серии при повторном сохранении пропускаются",
+    )
+
+    class Meta:
+        verbose_name = "Серия событий"
+        verbose_name_plural = "Серии событий"
+        ordering = ["-starts_on"]
+
+    def __str__(self):
+        return self.title
 
 
 class EventSegment(TimeStampedModel):
@@ -157,8 +259,14 @@ class EventRegistration(TimeStampedModel):
     STATUS_CHOICES = [
         ("pending", "Ожидает подтверждения"),
         ("confirmed", "Подтверждена"),
+        ("waitlisted", "Лист ожидания"),
         ("cancelled", "Отменена"),
     ]
+    # Статусы, которые занимают место в лимите события (EventSeats.taken).
+    SEAT_STATUSES = ("pending", "confirmed")
+    WAITLIST_STATUS = "waitlisted"
+    # Статус регистрации, переведённой из листа ожидания на освободившееся место.
+    PROMOTED_STATUS = "pending"
     ATTENDANCE_CHOICES = [
         ("unknown", "Неизвестно"),
         ("attended", "Посетил"),
@@ -187,16 +295,98 @@ class EventRegistration(TimeStampedModel):
         default="unknown",
     )
     extra_data = models.JSONField("Доп. поля формы", default=dict, blank=True)
+    waitlist_ticket = models.PositiveIntegerField(
+        "Номер в листе ожидания",
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Позиция в очереди — номер минус EventSeats.waitlist_head",
+    )
 
     class Meta:
         verbose_name = "Регистрация на событие"
         verbose_name_plural = "Регистрации на события"
         ordering = ["-created_at"]
         unique_together = [["user", "event"]]
+        indexes = [
+            models.Index(
+                fields=["event", "waitlist_ticket"],
+                condition=models.Q(status="waitlisted"),
+                name="events_waitlist_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user} — {self.event}"
 
+    def save(self, *args, **kwargs):
+        # Место в лимите занимается в pre_save (apps.events.signals): вместе с записью
+        # регистрации или никак.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    @property
+    def holds_seat(self):
+        return self.status in self.SEAT_STATUSES
+
+    @property
+    def is_waitlisted(self):
+        return self.status == self.WAITLIST_STATUS
+
+
+class EventSeats(models.Model):
+    """
+    Счётчик занятых мест события — отдельная короткая строка, а не COUNT по регистрациям
+    и не блокировка строки Event. Место занимается одним условным UPDATE
+    (taken < capacity), см. apps.events.seats.
+
+    Лист ожидания — номера waitlist_head + 1 .. waitlist_tail у регистраций в статусе
+    waitlisted: позиция в очереди = waitlist_ticket - waitlist_head, без подсчёта очереди.
+    """
+    event = models.OneToOneField(
+        Event, on_delete=models.CASCADE, primary_key=True, related_name="seats", verbose_name="Событие"
+    )
+    capacity = models.PositiveIntegerField(
+        "Лимит участников", default=0, help_text="Копия Event.capacity; 0 — без лимита"
+    )
+    taken = models.PositiveIntegerField("Занято мест", default=0)
+    waitlist_head = models.PositiveIntegerField(
+        "Голова листа ожидания", default=0, help_text="Номер последнего, кто вышел из начала очереди"
+    )
+    waitlist_tail = models.PositiveIntegerField("Последний номер листа ожидания", default=0)
+
+    class Meta:
+        verbose_name = "Места события"
+        verbose_name_plural = "Места событий"
+
+    def __str__(self):
+        return f"{self.event_id}: {self.taken}/{self.capacity or '∞'}"
+
+
+class EventStats(models.Model):
+    """
+    Сводка регистраций события для карточек и отчётов — без COUNT по регистрациям.
+    Ведётся приращениями при изменении регистраций (apps.events.stats); расхождения
+    исправляет команда reconcile_event_stats.
+    """
+    event = models.OneToOneField(
+        Event, on_delete=models.CASCADE, primary_key=True, related_name="stats", verbose_name="Событие"
+    )
+    registered = models.PositiveIntegerField(
+        "Зарегистрировано", default=0, help_text="Регистрации со статусом pending или confirmed"
+    )
+    confirmed = models.PositiveIntegerField("Подтверждено", default=0)
+    waitlisted = models.PositiveIntegerField("В листе ожидания", default=0)
+    attended = models.PositiveIntegerField("Посетили", default=0)
+    no_show = models.PositiveIntegerField("Не явились", default=0)
+
+    class Meta:
+        verbose_name = "Статистика события"
+        verbose_name_plural = "Статистика событий"
+
+    def __str__(self):
+        return f"{self.event_id}: {self.registered} зарегистрировано"
+
 
 class EventGallery(TimeStampedModel):
     """Галерея фотографий прошедшего события."""
@@ -0,0 +1,29 @@
+"""Поисковый документ события (apps.core.search): текст + спикеры + теги; подсказки."""
+from apps.core.models import SearchDocument, SearchSuggestion, Tag
+from apps.core.search import register_document, register_suggestion
+from apps.events.models import Event, Speaker
+
+
+def event_document(event):
+    return event.title, [
+        event.short_description,
+        event.description,
+        event.location_city,
+        event.location_venue,
+        *(speaker.full_name for speaker in event.speakers.all()),
+        *(tag.name for tag in event.tags.all()),
+    ]
+
+
+register_document(
+    SearchDocument.KIND_EVENT,
+    Event,
+    event_document,
+    prefetch_related=("speakers", "tags"),
+    m2m=((Event.speakers.through, "events"), (Event.tags.through, "events")),
+    depends_on=((Speaker, "events"), (Tag, "events")),
+    lookup_field="slug",
+)
+
+register_suggestion(SearchSuggestion.KIND_EVENT, Event, "title", lookup_field="slug")
+register_suggestion(SearchSuggestion.KIND_SPEAKER, Speaker, "full_name")
@@ -0,0 +1,168 @@
+"""
+Места на событии: счётчик EventSeats.taken против лимита Event.capacity (0 — без лимита).
+
+Регистрация занимает место одним условным UPDATE строки счётчика:
+
+    UPDATE events_eventseats SET taken = taken + 1
+    WHERE event_id = %s AND (capacity = 0 OR taken < capacity)
+
+Обновилась строка — место есть, нет — мест нет. Без COUNT по регистрациям и без
+SELECT ... FOR UPDATE по Event: одновременные регистрации на одно событие ждут друг
+друга только на короткой строке счётчика и только до коммита своей транзакции
+(место занимается в pre_save, следом — INSERT регистрации и коммит). Лишней продажи
+нет: условие проверяется под блокировкой строки, которую берёт сам UPDATE.
+
+Счётчик ведут сигналы EventRegistration (apps.events.signals): занимают место при
+переходе в статус из EventRegistration.SEAT_STATUSES, освобождают при отмене и удалении.
+
+Лист ожидания. Регистрация без свободного места получает статус waitlisted и номер
+waitlist_ticket = ++EventSeats.waitlist_tail. Позиция в очереди — waitlist_ticket минус
+EventSeats.waitlist_head: одно вычитание, без COUNT по очереди. Из начала очереди уходят
+сдвигом waitlist_head, из середины — номера стоящих дальше уменьшаются на единицу
+(одним UPDATE по частичному индексу events_waitlist_idx).
+
+Освободившееся место (отмена, удаление, увеличение лимита) в той же транзакции
+переходит первому в очереди: кандидат выбирается SELECT ... FOR UPDATE SKIP LOCKED, так
+что строка, заблокированная другой транзакцией, не задерживает продвижение очереди.
+Изменения существующих регистраций идут под блокировкой строки счётчика события
+(lock_seats) — номера в очереди и занятые места меняются согласованно.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+from apps.core.cache import bump_generation
+from apps.events.models import Event, EventRegistration, EventSeats
+
+
+class NoSeatsAvailable(Exception):
+    """Лимит участников события исчерпан."""
+
+
+def _seats_changed():
+    # Счётчик меняется через update() — без post_save, поэтому кэш ответов сбрасываем сами.
+    transaction.on_commit(lambda: bump_generation(EventSeats))
+
+
+def reserve_seat(event_id):
+    """Занять место на событии; False — мест нет."""
+    free = EventSeats.objects.filter(pk=event_id).filter(Q(capacity=0) | Q(taken__lt=F("capacity")))
+    reserved = free.update(taken=F("taken") + 1)
+    if not reserved and create_missing_seats(Event.objects.filter(pk=event_id)):
+        reserved = free.update(taken=F("taken") + 1)
+    if reserved:
+        _seats_changed()
+    return bool(reserved)
+
+
+def release_seat(event_id):
+    """Освободить место (отмена или удаление регистрации)."""
+    if EventSeats.objects.filter(pk=event_id, taken__gt=0).update(taken=F("taken") - 1):
+        _seats_changed()
+
+
+def lock_seats(event_ids):
+    """Заблокировать строки счётчиков событий до конца транзакции (по порядку pk)."""
+    seats = EventSeats.objects.select_for_update().filter(pk__in=event_ids).order_by("pk")
+    list(seats.values_list("pk", flat=True))
+
+
+def join_waitlist(event_id):
+    """Номер в конце листа ожидания события для новой записи в очереди."""
+    seats = EventSeats.objects.filter(pk=event_id)
+    if not seats.update(waitlist_tail=F("waitlist_tail") + 1):
+        create_missing_seats(Event.objects.filter(pk=event_id))
+        seats.update(waitlist_tail=F("waitlist_tail") + 1)
+    return seats.values_list("waitlist_tail", flat=True).get()
+
+
+def leave_waitlist(event_id, ticket):
+    """Убрать номер ticket из листа ожидания события (под lock_seats)."""
+    seats = EventSeats.objects.filter(pk=event_id)
+    if seats.filter(waitlist_head=ticket - 1).update(waitlist_head=F("waitlist_head") + 1):
+        return
+    EventRegistration.objects.filter(
+        event_id=event_id, status=EventRegistration.WAITLIST_STATUS, waitlist_ticket__gt=ticket
+    ).update(waitlist_ticket=F("waitlist_ticket") - 1)
+    seats.update(waitlist_tail=F("waitlist_tail") - 1)
+
+
+def promote_waitlisted(event_id):
+    """
+    Перевести первых из листа ожидания на свободные места (статус PROMOTED_STATUS).
+    Возвращает число переведённых регистраций.
+    """
+    promoted = 0
+    with transaction.atomic():
+        lock_seats([event_id])
+        waitlist = EventRegistration.objects.filter(event_id=event_id, status=EventRegistration.WAITLIST_STATUS)
+        while has_free_seat(event_id):
+            candidate = waitlist.select_for_update(skip_locked=True).order_by("waitlist_ticket").first()
+            if candidate is None:
+                break
+            candidate.status = EventRegistration.PROMOTED_STATUS
+            try:
+                candidate.save(update_fields=["status", "waitlist_ticket", "updated_at"])
+            except NoSeatsAvailable:
+                break
+            promoted += 1
+    return promoted
+
+
+def has_free_seat(event_id):
+    """Есть ли свободное место — для подсказок в формах; занимать место только через reserve_seat()."""
+    seats = EventSeats.objects.filter(pk=event_id).values_list("capacity", "taken").first()
+    return seats is None or seats[0] == 0 or seats[1] < seats[0]
+
+
+def sync_capacity(event):
+    """Скопировать Event.capacity в счётчик (при сохранении события) — одним upsert."""
+    EventSeats.objects.bulk_create(
+        [EventSeats(event=event, capacity=event.capacity)],
+        update_conflicts=True,
+        unique_fields=["event"],
+        update_fields=["capacity"],
+    )
+    _seats_changed()
+
+
+def create_missing_seats(events=None):
+    """
+    Создать счётчики событиям без них (события до появления EventSeats): taken — число
+    регистраций, которые занимают место. Возвращает число созданных строк.
+    """
+    events = (Event.objects.all() if events is None else events).filter(seats__isnull=True)
+    rows = events.annotate(
+        held=Count("registrations", filter=Q(registrations__status__in=EventRegistration.SEAT_STATUSES))
+    ).values_list("pk", "capacity", "held")
+    seats = [EventSeats(event_id=pk, capacity=capacity, taken=held) for pk, capacity, held in rows]
+    EventSeats.objects.bulk_create(seats, batch_size=1000, ignore_conflicts=True)
+    return len(seats)
+
+
+def with_waitlist_position(queryset):
+    """queryset регистраций с waitlist_position: место в листе ожидания (с 1), None — не в очереди."""
+    return queryset.annotate(
+        waitlist_position=Case(
+            When(
+                status=EventRegistration.WAITLIST_STATUS,
+                then=F("waitlist_ticket") - F("event__seats__waitlist_head"),
+            ),
+            default=None,
+            output_field=IntegerField(),
+        )
+    )
+
+
+def with_remaining_seats(queryset):
+    """queryset событий с remaining_seats: свободные места, None — без лимита."""
+    return queryset.annotate(
+        remaining_seats=Case(
+            When(
+                seats__capacity__gt=0,
+                then=Greatest(F("seats__capacity") - F("seats__taken"), Value(0)),
+            ),
+            default=None,
+            output_field=IntegerField(),
+        )
+    )
@@ -2,12 +2,13 @@ from decimal import Decimal
 
 from rest_framework import serializers
 
-from apps.core.serializers import TagSerializer
+from apps.core.serializers import MarkdownHTMLField, TagSerializer
 from apps.events.models import (
     Event,
     EventGallery,
     EventRegistration,
     EventSegment,
+    EventStats,
     Speaker,
 )
 
@@ -47,17 +48,26 @@ class EventSegmentSerializer(serializers.ModelSerializer):
         )
 
 
+class EventStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EventStats
+        fields = ("registered", "confirmed", "waitlisted", "attended", "no_show")
+
+
 class _EventPriceRepresentationMixin:
     """Пустая цена в БД (null) в API отдаётся как 0 — бесплатно."""
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        if data.get("price") is None:
+        if "price" in data and data["price"] is None:  # price может быть убран через ?fields=/?omit=
             data["price"] = Decimal("0")
         return data
 
 
 class EventListSerializer(_EventPriceRepresentationMixin, serializers.ModelSerializer):
+    remaining_seats = serializers.IntegerField(read_only=True, allow_null=True)
+    stats = EventStatsSerializer(read_only=True)
+
     class Meta:
         model = Event
         fields = (
@@ -65,13 +75,19 @@ class EventListSerializer(_EventPriceRepresentationMixin, serializers.ModelSeria
             "title",
             "slug",
             "short_description",
-            "description",
+            "excerpt",
+            "read_time_minutes",
             "date",
             "time_start",
             "time_end",
+            "starts_at",
+            "ends_at",
             "format",
-            "cover_image",  
+            "cover_image",
             "location_city",
+            "capacity",
+            "remaining_seats",
+            "stats",
             "price",
             "status",
             "is_featured",
@@ -82,6 +98,9 @@ class EventDetailSerializer(_EventPriceRepresentationMixin, serializers.ModelSer
     tags = TagSerializer(many=True, read_only=True)
     speakers = SpeakerListSerializer(many=True, read_only=True)
     segments = EventSegmentSerializer(many=True, read_only=True)
+    description_html = MarkdownHTMLField(source="description")
+    remaining_seats = serializers.IntegerField(read_only=True, allow_null=True)
+    stats = EventStatsSerializer(read_only=True)
 
     class Meta:
         model = Event
@@ -91,9 +110,14 @@ class EventDetailSerializer(_EventPriceRepresentationMixin, serializers.ModelSer
             "slug",
             "short_description",
             "description",
+            "description_html",
+            "toc",
+            "read_time_minutes",
             "date",
             "time_start",
             "time_end",
+            "starts_at",
+            "ends_at",
             "format",
             "event_type",
             "cover_image",
@@ -103,6 +127,8 @@ class EventDetailSerializer(_EventPriceRepresentationMixin, serializers.ModelSer
             "online_url",
             "online_platform",
             "capacity",
+            "remaining_seats",
+            "stats",
             "price",
             "registration_type",
             "status",
@@ -113,6 +139,7 @@ class EventDetailSerializer(_EventPriceRepresentationMixin, serializers.ModelSer
             "speakers",
             "segments",
         )
+        optional_fields = ("description_html",)
 
 
 class EventGalleryEventSerializer(serializers.ModelSerializer):
@@ -123,6 +150,32 @@ class EventGalleryEventSerializer(serializers.ModelSerializer):
         fields = ("id", "slug", "title", "date", "location_city")
 
 
+class CalendarEventSerializer(serializers.ModelSerializer):
+    """Карточка события в календаре (apps.events.calendar.CALENDAR_EVENT_FIELDS)."""
+
+    class Meta:
+        model = Event
+        fields = ("id", "slug", "title", "event_type", "format", "status", "time_start", "time_end")
+
+
+class CalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    count = serializers.IntegerField()
+    events = CalendarEventSerializer(many=True, help_text="События дня по времени начала.")
+
+
+class CalendarMonthSerializer(serializers.Serializer):
+    """Календарь месяца: только дни, в которые есть события."""
+
+    month = serializers.CharField(help_text="Месяц YYYY-MM.")
+    count = serializers.IntegerField(help_text="Событий в месяце.")
+    days = CalendarDaySerializer(many=True)
+
+
+class FeedLinkSerializer(serializers.Serializer):
+    url = serializers.URLField(help_text="Ссылка на ленту .ics для подписки в календаре; не передавайте её другим.")
+
+
 class EventGallerySerializer(serializers.ModelSerializer):
     event = EventGalleryEventSerializer(read_only=True)
 
@@ -139,6 +192,8 @@ class EventGallerySerializer(serializers.ModelSerializer):
 
 
 class EventRegistrationSerializer(serializers.ModelSerializer):
+    waitlist_position = serializers.IntegerField(read_only=True, allow_null=True)
+
     class Meta:
         model = EventRegistration
         fields = (
@@ -146,6 +201,7 @@ class EventRegistrationSerializer(serializers.ModelSerializer):
             "event",
             "user",
             "status",
+            "waitlist_position",
             "attendance_status",
             "extra_data",
             "created_at",
@@ -0,0 +1,123 @@
+"""
+Копии событий пачкой: серии повторяющихся событий (EventSeries) и «Дублировать» в админке.
+
+Событие-шаблон копируется на N дат за постоянное число запросов, независимо от N:
+
+- свободные slug для всех копий — одним запросом по префиксам (apps.core.slugs);
+- события, сегменты программы и строки M2M (теги и спикеры события, спикеры
+  сегментов) — bulk_create по таблице, а не save() и .set() на каждую копию;
+- то, что для одного события делают сигналы post_save (места, сводка регистраций,
+  поисковый документ, поколения кэша, календарь месяца), — одним вызовом на пачку.
+  Поля анализа текста копируются из шаблона: текст у копий тот же.
+
+Копии создаются черновиками: дату, статус и детали проверяют перед публикацией.
+"""
+from dateutil.rrule import MONTHLY, WEEKLY, rrule, weekday
+from django.db import transaction
+
+from apps.core.cache import bump_generation
+from apps.core.models import SearchDocument, SearchSuggestion
+from apps.core.search import refresh_documents, refresh_suggestions
+from apps.core.slugs import bulk_create_with_slugs
+from apps.events.calendar import invalidate_calendar
+from apps.events.models import Event, EventSegment
+from apps.events.seats import create_missing_seats
+from apps.events.stats import create_missing_stats
+
+# Поля события, которые не копируются: у копии свои дата, slug, серия, статус и обложка.
+NOT_COPIED_FIELDS = {"id", "slug", "date", "series", "cover_image", "status", "created_at", "updated_at"}
+SEGMENT_FIELDS = ("title", "description", "time_start", "time_end", "order", "location")
+COPY_STATUS = "draft"
+
+
+def series_dates(series):
+    """Даты серии по правилу повторения, начиная со starts_on."""
+    start = series.starts_on
+    options = {"interval": series.interval, "count": series.occurrences}
+    if series.frequency == "weekly":
+        rule = rrule(WEEKLY, dtstart=start, **options)
+    elif series.frequency == "monthly_weekday":
+        # Номер дня недели в месяце (второй четверг); пятый — «последний» (его бывает не в каждом месяце).
+        week = (start.day - 1) // 7 + 1
+        day = weekday(start.weekday(), -1 if week == 5 else week)
+        rule = rrule(MONTHLY, dtstart=start, byweekday=day, **options)
+    else:
+        # Числа, которого нет в месяце (31-е), rrule пропускает — серия выйдет длиннее.
+        rule = rrule(MONTHLY, dtstart=start, bymonthday=start.day, **options)
+    return [moment.date() for moment in rule]
+
+
+def copy_event(template, dates, slug_bases, series=None):
+    """
+    Копии события template на даты dates (slug — свободные от slug_bases) с сегментами,
+    спикерами и тегами — пачкой, в одной транзакции. Возвращает созданные события.
+    """
+    if not dates:
+        return []
+    values = {
+        field.attname: getattr(template, field.attname)
+        for field in Event._meta.concrete_fields
+        if field.name not in NOT_COPIED_FIELDS and not field.generated
+    }
+    tag_ids = list(template.tags.values_list("pk", flat=True))
+    speaker_ids = list(template.speakers.values_list("pk", flat=True))
+    segments = list(template.segments.order_by("order", "time_start", "pk").values("pk", *SEGMENT_FIELDS))
+    segment_speakers = EventSegment.speakers.through.objects.filter(eventsegment__event=template)
+    speakers_by_segment = {}
+    for segment_id, speaker_id in segment_speakers.values_list("eventsegment_id", "speaker_id"):
+        speakers_by_segment.setdefault(segment_id, []).append(speaker_id)
+
+    with transaction.atomic():
+        events = bulk_create_with_slugs(
+            [Event(**values, date=day, series=series, status=COPY_STATUS) for day in dates], bases=slug_bases
+        )
+        copies = [(event, segment) for event in events for segment in segments]
+        new_segments = EventSegment.objects.bulk_create(
+            [
+                EventSegment(event=event, **{name: segment[name] for name in SEGMENT_FIELDS})
+                for event, segment in copies
+            ]
+        )
+        EventSegment.speakers.through.objects.bulk_create(
+            [
+                EventSegment.speakers.through(eventsegment_id=new_segment.pk, speaker_id=speaker_id)
+                for new_segment, (_, segment) in zip(new_segments, copies)
+                for speaker_id in speakers_by_segment.get(segment["pk"], ())
+            ]
+        )
+        Event.tags.through.objects.bulk_create(
+            [Event.tags.through(event_id=event.pk, tag_id=tag_id) for event in events for tag_id in tag_ids]
+        )
+        Event.speakers.through.objects.bulk_create(
+            [
+                Event.speakers.through(event_id=event.pk, speaker_id=speaker_id)
+                for event in events
+                for speaker_id in speaker_ids
+            ]
+        )
+        _after_bulk_create([event.pk for event in events], dates)
+    return events
+
+
+def _after_bulk_create(event_ids, dates):
+    """То, что для одного события делают сигналы post_save, — одним вызовом на пачку."""
+    created = Event.objects.filter(pk__in=event_ids)
+    create_missing_seats(created)
+    create_missing_stats(created)
+    refresh_documents(SearchDocument.KIND_EVENT, event_ids)
+    refresh_suggestions(SearchSuggestion.KIND_EVENT, event_ids)
+    invalidate_calendar(dates)
+
+    def bump():
+        for model in (Event, EventSegment):
+            bump_generation(model)
+
+    transaction.on_commit(bump)
+
+
+def materialize_series(series):
+    """Создать события серии на даты правила, которых у серии ещё нет. Возвращает созданные события."""
+    existing = set(series.events.values_list("date", flat=True))
+    dates = [day for day in series_dates(series) if day not in existing]
+    stem = series.template.slug_base()
+    return copy_event(series.template, dates, [f"{stem}-{day:%Y-%m-%d}" for day in dates], series=series)
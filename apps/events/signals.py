@@ -0,0 +1,138 @@
+from django.db import connection
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.events.calendar import invalidate_calendar
+from apps.events.feeds import invalidate_registrations_feed
+from apps.events.models import Event, EventRegistration, EventSeats, EventStats
+from apps.events.seats import (
+    NoSeatsAvailable,
+    create_missing_seats,
+    join_waitlist,
+    leave_waitlist,
+    lock_seats,
+    promote_waitlisted,
+    release_seat,
+    reserve_seat,
+    sync_capacity,
+)
+from apps.events.stats import count_registration_change, create_missing_stats
+
+REGISTRATION_STATE_FIELDS = ("event_id", "status", "attendance_status", "waitlist_ticket")
+
+
+@receiver(post_save, sender=Event)
+def sync_counters_on_event_save(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        EventStats.objects.bulk_create([EventStats(event=instance)], ignore_conflicts=True)
+    sync_capacity(instance)
+    promote_waitlisted(instance.pk)  # лимит мог вырасти
+
+
+@receiver(pre_save, sender=Event)
+def remember_calendar_date(sender, instance, raw=False, **kwargs):
+    """Прежняя дата события: при переносе на другой месяц сбрасываются оба календаря."""
+    instance._calendar_date_before = None
+    if instance.pk and not raw:
+        instance._calendar_date_before = Event.objects.filter(pk=instance.pk).values_list("date", flat=True).first()
+
+
+@receiver(post_save, sender=Event)
+def invalidate_calendar_on_save(sender, instance, **kwargs):
+    invalidate_calendar([instance.date, getattr(instance, "_calendar_date_before", None)])
+
+
+@receiver(post_delete, sender=Event)
+def invalidate_calendar_on_delete(sender, instance, **kwargs):
+    invalidate_calendar([instance.date])
+
+
+def _locked_previous_state(instance):
+    """Состояние регистрации до правки (REGISTRATION_STATE_FIELDS) — под блокировкой счётчиков мест."""
+    lock_seats([instance.event_id])
+    previous = EventRegistration.objects.filter(pk=instance.pk).values(*REGISTRATION_STATE_FIELDS).first()
+    if previous and previous["event_id"] != instance.event_id:
+        lock_seats([previous["event_id"]])
+    return previous
+
+
+@receiver(pre_save, sender=EventRegistration)
+def reserve_seat_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Занять место до INSERT/UPDATE регистрации, если она начинает занимать место (новая,
+    возобновлённая или перенесённая на другое событие). Мест нет — NoSeatsAvailable,
+    регистрация не сохраняется (save() выполняется в транзакции). Здесь же регистрация
+    встаёт в лист ожидания или выходит из него.
+    """
+    instance._seat_event_id = None
+    instance._stats_before = None
+    if raw:
+        return
+    previous = _locked_previous_state(instance) if instance.pk else None
+    instance._stats_before = previous
+    if previous and previous["status"] in EventRegistration.SEAT_STATUSES:
+        instance._seat_event_id = previous["event_id"]
+    was_waitlisted = bool(previous) and previous["status"] == EventRegistration.WAITLIST_STATUS
+    stays_waitlisted = was_waitlisted and instance.is_waitlisted and previous["event_id"] == instance.event_id
+    if was_waitlisted and not stays_waitlisted and previous["waitlist_ticket"] is not None:
+        leave_waitlist(previous["event_id"], previous["waitlist_ticket"])
+    if instance.holds_seat and instance._seat_event_id != instance.event_id:
+        if not reserve_seat(instance.event_id):
+            raise NoSeatsAvailable(instance.event_id)
+    if stays_waitlisted:
+        # Номер в памяти мог устареть: очередь сдвигается UPDATE'ом в обход объектов.
+        instance.waitlist_ticket = previous["waitlist_ticket"]
+    elif instance.is_waitlisted:
+        instance.waitlist_ticket = join_waitlist(instance.event_id)
+    else:
+        instance.waitlist_ticket = None
+
+
+@receiver(post_save, sender=EventRegistration)
+@receiver(post_delete, sender=EventRegistration)
+def invalidate_registrations_feed_on_change(sender, instance, **kwargs):
+    invalidate_registrations_feed(instance.user_id)
+
+
+@receiver(post_save, sender=EventRegistration)
+def release_seat_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        count_registration_change(
+            getattr(instance, "_stats_before", None),
+            {"event_id": instance.event_id, "status": instance.status, "attendance_status": instance.attendance_status},
+        )
+    previous_event_id = getattr(instance, "_seat_event_id", None)
+    if previous_event_id is not None and (not instance.holds_seat or previous_event_id != instance.event_id):
+        release_seat(previous_event_id)
+        promote_waitlisted(previous_event_id)
+
+
+@receiver(pre_delete, sender=EventRegistration)
+def leave_waitlist_on_delete(sender, instance, **kwargs):
+    instance._seat_event_id = None
+    instance._stats_before = previous = _locked_previous_state(instance)
+    if previous is None:
+        return
+    if previous["status"] in EventRegistration.SEAT_STATUSES:
+        instance._seat_event_id = previous["event_id"]
+    elif previous["status"] == EventRegistration.WAITLIST_STATUS and previous["waitlist_ticket"] is not None:
+        leave_waitlist(previous["event_id"], previous["waitlist_ticket"])
+
+
+@receiver(post_delete, sender=EventRegistration)
+def release_seat_on_delete(sender, instance, **kwargs):
+    count_registration_change(getattr(instance, "_stats_before", None), None)
+    if getattr(instance, "_seat_event_id", None) is not None:
+        release_seat(instance._seat_event_id)
+        promote_waitlisted(instance._seat_event_id)
+
+
+def fill_event_seats(sender, **kwargs):
+    """post_migrate: счётчики мест и сводки событиям, созданным до появления EventSeats и EventStats."""
+    tables = connection.introspection.table_names()
+    if EventSeats._meta.db_table in tables:
+        create_missing_seats()
+    if EventStats._meta.db_table in tables:
+        create_missing_stats()
@@ -0,0 +1,109 @@
+"""
+Сводка регистраций события (EventStats): зарегистрировано, подтверждено, в листе
+ожидания, посетили, не явились.
+
+Счётчики меняются приращениями: сигналы EventRegistration (apps.events.signals) знают
+состояние регистрации до и после правки, и разница применяется одним UPDATE строки
+сводки на событие — без COUNT по регистрациям ни при записи, ни при чтении. Списки и
+детали событий получают сводку тем же запросом, что и событие (select_related по
+обратному OneToOne).
+
+Изменения регистраций в обход save()/delete() (queryset.update, SQL) сводку не
+обновляют — её пересчитывает команда reconcile_event_stats.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest
+
+from apps.core.cache import bump_generation
+from apps.events.models import Event, EventRegistration, EventStats
+
+STATS_FIELDS = ("registered", "confirmed", "waitlisted", "attended", "no_show")
+
+
+def registration_counts(status, attendance_status):
+    """Вклад регистрации в счётчики сводки: {поле: 0 или 1}."""
+    return {
+        "registered": int(status in EventRegistration.SEAT_STATUSES),
+        "confirmed": int(status == "confirmed"),
+        "waitlisted": int(status == EventRegistration.WAITLIST_STATUS),
+        "attended": int(attendance_status == "attended"),
+        "no_show": int(attendance_status == "no_show"),
+    }
+
+
+def _stats_changed():
+    transaction.on_commit(lambda: bump_generation(EventStats))
+
+
+def count_registration_change(before, after):
+    """
+    Применить к сводкам разницу состояний регистрации. before / after — словари
+    с event_id, status, attendance_status (None — регистрации не было / удалена).
+    Вызывается после записи регистрации: недостающая сводка считается по регистрациям.
+    """
+    deltas = defaultdict(Counter)
+    for state, sign in ((before, -1), (after, 1)):
+        if state is not None:
+            counts = registration_counts(state["status"], state["attendance_status"])
+            deltas[state["event_id"]].update({field: sign * value for field, value in counts.items()})
+    for event_id, delta in deltas.items():
+        changes = {field: Greatest(F(field) + value, Value(0)) for field, value in delta.items() if value}
+        if not changes:
+            continue
+        if not EventStats.objects.filter(pk=event_id).update(**changes):
+            create_missing_stats(Event.objects.filter(pk=event_id))
+        _stats_changed()
+
+
+def counted_stats(events):
+    """Сводки, посчитанные по регистрациям: [(event_id, registered, ...)] в порядке STATS_FIELDS."""
+    counts = {
+        f"counted_{field}": Count("registrations", filter=Q(**{f"registrations__{lookup}": value}))
+        for field, (lookup, value) in {
+            "registered": ("status__in", EventRegistration.SEAT_STATUSES),
+            "confirmed": ("status", "confirmed"),
+            "waitlisted": ("status", EventRegistration.WAITLIST_STATUS),
+            "attended": ("attendance_status", "attended"),
+            "no_show": ("attendance_status", "no_show"),
+        }.items()
+    }
+    return events.order_by().annotate(**counts).values_list("pk", *counts)
+
+
+def create_missing_stats(events=None):
+    """Создать сводки событиям без них. Возвращает число созданных строк."""
+    events = (Event.objects.all() if events is None else events).filter(stats__isnull=True)
+    stats = [EventStats(event_id=pk, **dict(zip(STATS_FIELDS, values))) for pk, *values in counted_stats(events)]
+    EventStats.objects.bulk_create(stats, batch_size=1000, ignore_conflicts=True)
+    return len(stats)
+
+
+def reconcile_stats(events=None, batch_size=1000):
+    """
+    Пересчитать сводки по регистрациям и записать расходящиеся (и недостающие) одним
+    upsert на пачку событий. Возвращает число исправленных сводок.
+    """
+    events = Event.objects.all() if events is None else events
+    event_ids = list(events.order_by("pk").values_list("pk", flat=True))
+    fixed = 0
+    for start in range(0, len(event_ids), batch_size):
+        batch = event_ids[start:start + batch_size]
+        stored = {
+            row[0]: tuple(row[1:])
+            for row in EventStats.objects.filter(pk__in=batch).values_list("pk", *STATS_FIELDS)
+        }
+        stale = [
+            EventStats(event_id=pk, **dict(zip(STATS_FIELDS, values)))
+            for pk, *values in counted_stats(Event.objects.filter(pk__in=batch))
+            if stored.get(pk) != tuple(values)
+        ]
+        EventStats.objects.bulk_create(
+            stale, update_conflicts=True, unique_fields=["event"], update_fields=list(STATS_FIELDS)
+        )
+        fixed += len(stale)
+    if fixed:
+        _stats_changed()
+    return fixed
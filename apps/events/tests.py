@@ -1,11 +1,22 @@
-from datetime import date, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.request import Request
 from rest_framework.test import APIClient, APIRequestFactory
 
-from apps.core.models import ApiKey, Tag
-from apps.events.models import Event
+from apps.core.models import ApiKey, SearchDocument, Tag
+from apps.events.models import Event, EventRegistration, EventSeats, EventSegment, EventSeries, EventStats, Speaker
+from apps.events.seats import NoSeatsAvailable, with_waitlist_position
+from apps.events.series import materialize_series
+from apps.events.stats import reconcile_stats
 from apps.events.views import EventViewSet
 
 
@@ -43,6 +54,8 @@ class EventSearchApiTests(TestCase):
 
 
     def setUp(self):
+        # Кэш ответов (CachedResponseMixin) переживает откат транзакции теста.
+        cache.clear()
         self.client = APIClient()
         self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
 
@@ -96,3 +109,595 @@ class EventSearchApiTests(TestCase):
             expected_slugs,
             msg="Порядок API должен совпадать с сортировкой по search_rank в ViewSet.",
         )
+
+    def test_sparse_fieldsets(self):
+        speaker = Speaker.objects.create(full_name="Anna Petrova", bio="Long biography.")
+        speaker.topics.set([self.tag_pm])
+        self.event.speakers.add(speaker)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/events/events/", {"fields": "id,title,price"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data["results"][0]), {"id", "title", "price"})
+        events_sql = next(
+            query["sql"] for query in queries if 'FROM "events_event"' in query["sql"] and "LIMIT" in query["sql"]
+        )
+        self.assertNotIn('"events_event"."description"', events_sql)
+
+        # Полное описание в списке не отдаётся и не читается: карточкам хватает excerpt.
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/events/events/", {"omit": "price"})
+        self.assertEqual(set(response.data["results"][0]) & {"description", "price"}, set())
+        self.assertIn("excerpt", response.data["results"][0])
+        events_sql = next(
+            query["sql"] for query in queries if 'FROM "events_event"' in query["sql"] and "LIMIT" in query["sql"]
+        )
+        self.assertNotIn('"events_event"."description"', events_sql)
+
+        response = self.client.get(
+            f"/api/v1/events/events/{self.event.slug}/",
+            {"fields": "title,speakers", "omit": "speakers.bio,speakers.topics"},
+        )
+        self.assertEqual(set(response.data), {"title", "speakers"})
+        self.assertEqual(set(response.data["speakers"][0]) & {"bio", "topics"}, set())
+        self.assertEqual(response.data["speakers"][0]["full_name"], "Anna Petrova")
+
+        self.assertEqual(self.client.get("/api/v1/events/events/", {"fields": "id,unknown"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/events/events/", {"fields": "title.name"}).status_code, 400)
+
+    def test_query_count_does_not_grow_with_relations(self):
+        """План выборки (apps.core.planner): спикеры, их темы и сегменты — по запросу на связь, не на строку."""
+        url = f"/api/v1/events/events/{self.event.slug}/"
+
+        def count_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            return len(queries)
+
+        def add_speaker(number):
+            speaker = Speaker.objects.create(full_name=f"Speaker {number}")
+            speaker.topics.set([self.tag_pm, self.tag_soft])
+            self.event.speakers.add(speaker)
+            segment = EventSegment.objects.create(
+                event=self.event, title=f"Talk {number}", time_start=time(19, number), time_end=time(20, number)
+            )
+            segment.speakers.add(speaker)
+
+        add_speaker(1)
+        baseline = count_queries()
+        for number in range(2, 6):
+            add_speaker(number)
+        self.assertEqual(count_queries(), baseline)
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/v1/events/events/")
+        self.assertFalse([query for query in queries if "events_speaker" in query["sql"]])
+
+    def test_facets(self):
+        self.event_other.tags.add(self.tag_pm)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/api/v1/events/events/", {"facets": "tags,city,format", "tags_exclude": "soft-skills"}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["facets"],
+            {
+                "tags": [{"value": "pm", "count": 1}],
+                "city": [{"value": "Minsk", "count": 1}],
+                "format": [{"value": "offline", "count": 1}],
+            },
+        )
+        self.assertEqual(sum("UNION ALL" in query["sql"] for query in queries.captured_queries), 1)
+
+        all_events = self.client.get("/api/v1/events/events/", {"facets": "tags", "pagination": "cursor"}).data
+        self.assertEqual(
+            all_events["facets"]["tags"],
+            [{"value": "pm", "count": 2}, {"value": "soft-skills", "count": 1}],
+        )
+        self.assertNotIn("facets", self.client.get("/api/v1/events/events/").data)
+        self.assertEqual(self.client.get("/api/v1/events/events/", {"facets": "speakers"}).status_code, 400)
+
+
+class EventTimeFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-time-key", is_active=True)
+        today = timezone.localdate()
+        for slug, days, status in [
+            ("next-week", 7, "published"),
+            ("tomorrow", 1, "registration_closed"),
+            ("draft-tomorrow", 1, "draft"),
+            ("last-month", -30, "completed"),
+            ("last-week", -7, "completed"),
+            ("cancelled-yesterday", -1, "cancelled"),
+        ]:
+            Event.objects.create(
+                title=slug, slug=slug, date=today + timedelta(days=days), time_start=time(19, 0), status=status
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+
+    def slugs(self, **params):
+        response = self.client.get("/api/v1/events/events/", {"fields": "slug", **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row["slug"] for row in response.data["results"]]
+
+    def test_starts_at_and_ends_at_use_project_time_zone(self):
+        event = Event.objects.create(
+            title="Night", slug="night", date=date(2026, 7, 1), time_start=time(22, 0), time_end=time(1, 30)
+        )
+        event.refresh_from_db()
+        minsk = ZoneInfo("Europe/Minsk")
+        self.assertEqual(event.starts_at, datetime(2026, 7, 1, 22, 0, tzinfo=minsk))
+        self.assertEqual(event.ends_at, datetime(2026, 7, 2, 1, 30, tzinfo=minsk))
+
+    def test_upcoming_past_and_range_filters(self):
+        self.assertEqual(self.slugs(upcoming="true"), ["tomorrow", "next-week"])
+        self.assertEqual(self.slugs(upcoming="true", pagination="cursor"), ["tomorrow", "next-week"])
+        self.assertEqual(self.slugs(past="1"), ["last-week", "last-month"])
+        self.assertEqual(self.slugs(past="1", pagination="cursor"), ["last-week", "last-month"])
+        today = timezone.localdate()
+        self.assertEqual(
+            self.slugs(**{"from": today.isoformat(), "to": (today + timedelta(days=1)).isoformat()}),
+            ["tomorrow", "draft-tomorrow"],
+        )
+        response = self.client.get("/api/v1/events/events/", {"to": "31.12.2026"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("to", response.data)
+
+
+class EventCalendarTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-calendar-key", is_active=True)
+        for slug, day, start, status, event_type in [
+            ("evening-meetup", date(2026, 10, 3), time(19, 0), "published", "meetup"),
+            ("morning-workshop", date(2026, 10, 3), time(10, 0), "completed", "workshop"),
+            ("late-october", date(2026, 10, 31), time(18, 0), "registration_closed", "meetup"),
+            ("october-draft", date(2026, 10, 10), time(18, 0), "draft", "meetup"),
+            ("november", date(2026, 11, 1), time(18, 0), "published", "meetup"),
+        ]:
+            Event.objects.create(
+                title=slug, slug=slug, date=day, time_start=start, status=status, event_type=event_type
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+
+    def get_month(self, month="2026-10", **headers):
+        return self.client.get("/api/v1/events/calendar/", {"month": month}, **headers)
+
+    def test_month_groups_listed_events_by_day_in_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_month()
+        self.assertEqual(response.status_code, 200, response.data)
+        # API-ключ и календарь: дни месяца — одним GROUP BY.
+        self.assertEqual(len([q for q in queries if "events_event" in q["sql"]]), 1)
+        self.assertEqual(response.data["count"], 3)
+        first, last = response.data["days"]
+        self.assertEqual((first["date"], first["count"]), ("2026-10-03", 2))
+        self.assertEqual([stub["slug"] for stub in first["events"]], ["morning-workshop", "evening-meetup"])
+        self.assertEqual(first["events"][0]["event_type"], "workshop")
+        self.assertEqual(first["events"][0]["time_start"], "10:00:00")
+        self.assertEqual([stub["slug"] for stub in last["events"]], ["late-october"])
+        self.assertEqual(self.get_month("2026-13").status_code, 400)
+
+    def test_month_is_cached_and_invalidated_only_by_its_events(self):
+        etag = self.get_month()["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_month(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            self.assertEqual(self.get_month().status_code, 200)
+        self.assertFalse([q for q in queries if "events_event" in q["sql"]])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            november = Event.objects.get(slug="november")
+            november.title = "November meetup"
+            november.save()
+        self.assertEqual(self.get_month()["ETag"], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            november.date = date(2026, 10, 20)
+            november.save()
+        response = self.get_month()
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["count"], 4)
+
+
+class EventFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-feed-key", is_active=True)
+        cls.tag = Tag.objects.create(name="Agile", slug="agile")
+        day = timezone.localdate() + timedelta(days=10)
+        cls.event = Event.objects.create(
+            title="Agile, Scrum; и Kanban",
+            slug="agile-meetup",
+            date=day,
+            time_start=time(19, 0),
+            time_end=time(21, 0),
+            status="published",
+            location_city="Минск",
+        )
+        cls.event.tags.add(cls.tag)
+        EventSegment.objects.create(event=cls.event, title="Доклад", time_start=time(19, 30), time_end=time(20, 0))
+        cls.other = Event.objects.create(
+            title="Networking", slug="networking", date=day, time_start=time(18, 0), status="published"
+        )
+        Event.objects.create(title="Draft", slug="draft", date=day, time_start=time(18, 0))
+        cls.user = get_user_model().objects.create_user(email="feed@example.com")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+
+    def feed(self, url, **headers):
+        response = self.client.get(url, **headers)
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, body.decode()
+
+    def test_listed_events_feed_is_streamed_then_cached(self):
+        response, body = self.feed("/api/v1/events/feeds/events.ics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n") and body.endswith("END:VCALENDAR\r\n"))
+        self.assertEqual(body.count("BEGIN:VEVENT"), 3)  # два события и сегмент, без черновика
+        self.assertIn("SUMMARY:Agile\\, Scrum\\; и Kanban\r\n", body)
+        self.assertIn(f"RELATED-TO:event-{self.event.pk}@pm-meetup", body)
+        other = body[body.index(f"UID:event-{self.other.pk}@"):]
+        self.assertNotIn("DTEND", other[:other.index("END:VEVENT")])  # без time_end — без окончания
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.split("\r\n")))
+
+        etag = response["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            cached, cached_body = self.feed("/api/v1/events/feeds/events.ics")
+            not_modified = self.client.get("/api/v1/events/feeds/events.ics", HTTP_IF_NONE_MATCH=etag)
+        self.assertFalse(cached.streaming)
+        self.assertEqual(cached_body, body)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(len(queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.title = "Networking night"
+            self.other.save()
+        response, body = self.feed("/api/v1/events/feeds/events.ics")
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn("SUMMARY:Networking night", body)
+
+    def test_tag_feed(self):
+        response, body = self.feed("/api/v1/events/feeds/tags/agile.ics")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body.count("BEGIN:VEVENT"), 2)
+        self.assertNotIn("Networking", body)
+        self.assertEqual(self.client.get("/api/v1/events/feeds/tags/missing.ics").status_code, 404)
+
+    def test_registrations_feed_by_signed_link(self):
+        self.assertEqual(self.client.get("/api/v1/events/feeds/registrations/").status_code, 403)
+        self.client.force_authenticate(self.user)
+        url = self.client.get("/api/v1/events/feeds/registrations/").data["url"]
+        # Календарь приходит без ключа и сессии — доступ по подписи в ссылке.
+        self.client = APIClient()
+        response, body = self.feed(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("BEGIN:VEVENT", body)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EventRegistration.objects.create(user=self.user, event=self.event)
+        response, body = self.feed(url)
+        self.assertEqual(body.count("BEGIN:VEVENT"), 2)
+        self.assertEqual(body.count("STATUS:TENTATIVE"), 2)
+        self.assertEqual(self.client.get(url.replace(".ics", "x.ics")).status_code, 404)
+
+
+class EventSeriesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = Event.objects.create(
+            title="PM Meetup", slug="pm-meetup", date=date(2026, 1, 8), time_start=time(19, 0), capacity=50,
+            description="Ежемесячная встреча менеджеров проектов", status="published",
+        )
+        speakers = [Speaker.objects.create(full_name=name) for name in ("Анна", "Борис")]
+        cls.template.speakers.set(speakers)
+        cls.template.tags.set([Tag.objects.create(name="Agile", slug="agile")])
+        for order, speaker in enumerate(speakers):
+            segment = EventSegment.objects.create(
+                event=cls.template,
+                title=f"Доклад {order}",
+                time_start=time(19, order),
+                time_end=time(20, 0),
+                order=order,
+            )
+            segment.speakers.set([speaker])
+        # Занятый slug: копия на эту дату получит суффикс.
+        Event.objects.create(title="Old", slug="pm-meetup-2026-02-12", date=date(2025, 2, 12), time_start=time(19, 0))
+
+    def series(self, occurrences, starts_on=date(2026, 1, 8)):
+        return EventSeries.objects.create(
+            title="PM Meetup", template=self.template, starts_on=starts_on, occurrences=occurrences
+        )
+
+    def materialize(self, series):
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            events = materialize_series(series)
+        return events, len(queries)
+
+    def test_series_is_created_in_constant_number_of_queries(self):
+        _, small_queries = self.materialize(self.series(2, starts_on=date(2027, 1, 14)))
+        events, queries = self.materialize(self.series(12))
+        self.assertEqual(queries, small_queries)
+        # Второй четверг месяца, как у первой даты.
+        self.assertEqual([event.date for event in events[:3]], [date(2026, 1, 8), date(2026, 2, 12), date(2026, 3, 12)])
+        self.assertEqual(events[1].slug, "pm-meetup-2026-02-12-2")
+
+        copy = Event.objects.get(pk=events[0].pk)
+        self.assertEqual((copy.status, copy.capacity, copy.word_count), ("draft", 50, self.template.word_count))
+        self.assertEqual(list(copy.tags.values_list("slug", flat=True)), ["agile"])
+        self.assertEqual(copy.speakers.count(), 2)
+        self.assertEqual(
+            [(segment.title, [s.full_name for s in segment.speakers.all()]) for segment in copy.segments.all()],
+            [("Доклад 0", ["Анна"]), ("Доклад 1", ["Борис"])],
+        )
+        self.assertTrue(EventSeats.objects.filter(pk=copy.pk, capacity=50).exists())
+        self.assertTrue(EventStats.objects.filter(pk=copy.pk).exists())
+        self.assertTrue(SearchDocument.objects.filter(kind=SearchDocument.KIND_EVENT, object_id=copy.pk).exists())
+
+    def test_materialize_skips_existing_dates(self):
+        series = self.series(3)
+        self.materialize(series)
+        series.occurrences = 4
+        events, _ = self.materialize(series)
+        self.assertEqual([event.date for event in events], [date(2026, 4, 9)])
+        self.assertEqual(series.events.count(), 4)
+
+
+class EventSeatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-seats-key", is_active=True)
+        cls.event = Event.objects.create(
+            title="Small Meetup", slug="small-meetup", date=date(2026, 5, 1), time_start=time(19, 0), capacity=2
+        )
+        cls.users = [
+            get_user_model().objects.create_user(email=f"user{i}@example.com")
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+
+    def registration(self, user):
+        return EventRegistration.objects.get(user=user, event=self.event)
+
+    def set_status(self, user, status):
+        registration = self.registration(user)
+        registration.status = status
+        with self.captureOnCommitCallbacks(execute=True):
+            registration.save()
+
+    def position(self, user):
+        self.client.force_authenticate(user)
+        return self.client.get(f"/api/v1/events/registrations/{self.registration(user).pk}/").data["waitlist_position"]
+
+    def register(self, user):
+        self.client.force_authenticate(user)
+        # Счётчик мест сбрасывает кэш ответов после коммита.
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post("/api/v1/events/registrations/", {"event": self.event.pk}, format="json")
+
+    def remaining(self):
+        return self.client.get(f"/api/v1/events/events/{self.event.slug}/").data["remaining_seats"]
+
+    def test_capacity_is_enforced(self):
+        self.assertEqual(self.remaining(), 2)
+        self.assertEqual(self.register(self.users[0]).status_code, 201)
+        self.assertEqual(self.register(self.users[0]).status_code, 400)  # повторная регистрация
+        self.assertEqual(self.register(self.users[1]).status_code, 201)
+        full = self.register(self.users[2])
+        self.assertEqual(full.status_code, 201)
+        self.assertEqual((full.data["status"], full.data["waitlist_position"]), ("waitlisted", 1))
+        self.assertEqual(EventSeats.objects.get(pk=self.event.pk).taken, 2)
+        self.assertEqual(self.remaining(), 0)
+        list_row = self.client.get("/api/v1/events/events/", {"fields": "slug,remaining_seats"}).data["results"]
+        self.assertEqual(list_row, [{"slug": "small-meetup", "remaining_seats": 0}])
+
+        # Отмена отдаёт место первому из листа ожидания в той же транзакции.
+        self.set_status(self.users[0], "cancelled")
+        self.assertEqual(self.remaining(), 0)
+        self.assertEqual(self.registration(self.users[2]).status, "pending")
+        self.assertIsNone(self.position(self.users[2]))
+        registration = self.registration(self.users[0])
+        registration.status = "confirmed"
+        with self.assertRaises(NoSeatsAvailable):
+            registration.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EventRegistration.objects.filter(user=self.users[1]).delete()
+        self.assertEqual(self.remaining(), 1)
+        self.event.capacity = 0
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        self.assertIsNone(self.remaining())
+
+    def test_waitlist_positions_and_promotion(self):
+        for user in self.users:
+            self.assertEqual(self.register(user).status_code, 201)
+        waiting = self.users[2:]
+        self.assertEqual([self.position(user) for user in waiting], [1, 2, 3])
+        url = f"/api/v1/events/registrations/{self.registration(waiting[1]).pk}/"
+        self.client.force_authenticate(waiting[1])
+        with self.assertNumQueries(1):  # позиция — из той же строки, без подсчёта очереди
+            self.assertEqual(self.client.get(url).data["waitlist_position"], 2)
+
+        # Уход из середины очереди сдвигает стоящих дальше, из начала — только голову очереди.
+        self.set_status(waiting[1], "cancelled")
+        self.assertEqual([self.position(waiting[0]), self.position(waiting[2])], [1, 2])
+        self.set_status(waiting[0], "cancelled")
+        self.assertEqual(self.position(waiting[2]), 1)
+        self.set_status(waiting[0], "waitlisted")
+        self.assertEqual([self.position(waiting[2]), self.position(waiting[0])], [1, 2])
+
+        # Удаление занявшей место регистрации и рост лимита продвигают очередь по порядку.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.registration(self.users[0]).delete()
+        self.assertEqual(self.registration(waiting[2]).status, "pending")
+        self.assertEqual(self.position(waiting[0]), 1)
+        self.event.capacity = 3
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        self.assertEqual(self.registration(waiting[0]).status, "pending")
+        seats = EventSeats.objects.get(pk=self.event.pk)
+        self.assertEqual((seats.taken, seats.waitlist_tail - seats.waitlist_head), (3, 0))
+        self.assertEqual(self.remaining(), 0)
+
+
+    def stats(self):
+        results = self.client.get("/api/v1/events/events/", {"fields": "slug,stats"}).data["results"]
+        return results[0]["stats"]
+
+    def test_stats_follow_registration_changes(self):
+        for user in self.users[:3]:
+            self.register(user)
+        self.set_status(self.users[1], "confirmed")
+        self.assertEqual(
+            self.stats(), {"registered": 2, "confirmed": 1, "waitlisted": 1, "attended": 0, "no_show": 0}
+        )
+        registration = self.registration(self.users[1])
+        registration.attendance_status = "attended"
+        with self.captureOnCommitCallbacks(execute=True):
+            registration.save()
+        self.set_status(self.users[0], "cancelled")  # место переходит из листа ожидания
+        with self.captureOnCommitCallbacks(execute=True):
+            self.registration(self.users[1]).delete()
+        self.assertEqual(
+            self.stats(), {"registered": 1, "confirmed": 0, "waitlisted": 0, "attended": 0, "no_show": 0}
+        )
+
+        # Правка в обход save() сводку не меняет — её исправляет сверка.
+        EventRegistration.objects.filter(user=self.users[2]).update(attendance_status="no_show")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(reconcile_stats(), 1)
+        self.assertEqual(self.stats()["no_show"], 1)
+        self.assertEqual(reconcile_stats(), 0)
+
+
+@override_settings(REGISTRATION_ADMISSION_RATE=2, REGISTRATION_ADMISSION_BURST=1)
+class RegistrationAdmissionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-admission-key", is_active=True)
+        cls.event = Event.objects.create(
+            title="Hot Meetup", slug="hot-meetup", date=date(2026, 5, 1), time_start=time(19, 0)
+        )
+        cls.users = [get_user_model().objects.create_user(email=f"crowd{i}@example.com") for i in range(3)]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+
+    def register(self, user, ticket=None):
+        self.client.force_authenticate(user)
+        headers = {"X-Admission-Ticket": ticket} if ticket else {}
+        return self.client.post(
+            "/api/v1/events/registrations/", {"event": self.event.pk}, format="json", headers=headers
+        )
+
+    def test_queue_admits_at_configured_rate(self):
+        now = 1_000_000.0
+        with mock.patch("apps.core.admission.time.time", return_value=now):
+            self.assertEqual(self.register(self.users[0]).status_code, 201)  # всплеск
+            first = self.register(self.users[1])
+            second = self.register(self.users[2])
+        self.assertEqual(first.status_code, 429)
+        self.assertEqual((first.data["position"], first["Retry-After"]), (1, "1"))
+        self.assertEqual((second.data["position"], second.data["retry_after"]), (2, 1))
+        self.assertFalse(EventRegistration.objects.filter(user__in=self.users[1:]).exists())
+
+        with mock.patch("apps.core.admission.time.time", return_value=now + 0.5):
+            with self.assertNumQueries(0):
+                status = self.client.get("/api/v1/events/registrations/admission/", {"ticket": second.data["ticket"]})
+            self.assertEqual((status.data["admitted"], status.data["position"]), (False, 1))
+            # Повтор с билетом не теряет места, чужой билет не действует; без билета
+            # (или с чужим) субъект получает свой прежний билет, а не новый номер.
+            self.assertEqual(self.register(self.users[2], second.data["ticket"]).data["position"], 1)
+            self.assertEqual(self.register(self.users[2], first.data["ticket"]).data["ticket"], second.data["ticket"])
+            for _ in range(3):
+                self.assertEqual(self.register(self.users[2]).data["ticket"], second.data["ticket"])
+            self.assertEqual(self.register(self.users[1], first.data["ticket"]).status_code, 201)
+        with mock.patch("apps.core.admission.time.time", return_value=now + 1):
+            self.assertTrue(
+                self.client.get("/api/v1/events/registrations/admission/", {"ticket": second.data["ticket"]})
+                .data["admitted"]
+            )
+            self.assertEqual(self.register(self.users[2], second.data["ticket"]).status_code, 201)
+        bad = self.client.get("/api/v1/events/registrations/admission/", {"ticket": "forged"})
+        self.assertEqual(bad.status_code, 400)
+
+    def test_idle_queue_does_not_accumulate_burst(self):
+        with mock.patch("apps.core.admission.time.time", return_value=2_000_000.0):
+            self.assertEqual(self.register(self.users[0]).status_code, 201)
+        with mock.patch("apps.core.admission.time.time", return_value=2_000_600.0):
+            self.assertEqual(self.register(self.users[1]).status_code, 201)
+            self.assertEqual(self.register(self.users[2]).status_code, 429)
+
+
+class EventSeatsConcurrencyTests(TransactionTestCase):
+    def test_no_overselling_under_concurrent_registrations(self):
+        event = Event.objects.create(
+            title="Popular Meetup", slug="popular-meetup", date=date(2026, 5, 1), time_start=time(19, 0), capacity=5
+        )
+        users = [
+            get_user_model().objects.create_user(email=f"rush{i}@example.com") for i in range(20)
+        ]
+
+        def register(user):
+            try:
+                EventRegistration.objects.create(user=user, event=event)
+                return True
+            except NoSeatsAvailable:
+                return False
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            results = list(pool.map(register, users))
+        self.assertEqual(sum(results), 5)
+        self.assertEqual(EventRegistration.objects.filter(event=event).count(), 5)
+        self.assertEqual(EventSeats.objects.get(pk=event.pk).taken, 5)
+
+    def test_concurrent_cancellations_promote_distinct_waitlisted(self):
+        event = Event.objects.create(
+            title="Waitlist Meetup", slug="waitlist-meetup", date=date(2026, 5, 1), time_start=time(19, 0), capacity=4
+        )
+        users = [get_user_model().objects.create_user(email=f"queue{i}@example.com") for i in range(10)]
+        for user in users[:4]:
+            EventRegistration.objects.create(user=user, event=event, status="confirmed")
+        for user in users[4:]:
+            EventRegistration.objects.create(user=user, event=event, status="waitlisted")
+
+        def cancel(user):
+            try:
+                registration = EventRegistration.objects.get(user=user, event=event)
+                registration.status = "cancelled"
+                registration.save()
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(cancel, users[:4]))
+        statuses = dict(EventRegistration.objects.filter(event=event).values_list("user__email", "status"))
+        self.assertEqual([statuses[user.email] for user in users[4:]], ["pending"] * 4 + ["waitlisted"] * 2)
+        self.assertEqual(EventSeats.objects.get(pk=event.pk).taken, 4)
+        positions = with_waitlist_position(EventRegistration.objects.filter(event=event, status="waitlisted"))
+        self.assertEqual(sorted(positions.values_list("waitlist_position", flat=True)), [1, 2])
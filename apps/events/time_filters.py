@@ -0,0 +1,110 @@
+"""
+Фильтры событий по времени: upcoming, past, from, to.
+
+Работают по вычисляемым колонкам Event.starts_at / ends_at — моменту начала и
+окончания в часовом поясе проекта (TIME_ZONE), — а не по паре date + time_start,
+которую нельзя сравнить с «сейчас» одним условием по индексу.
+
+    upcoming=true — ещё не начались (starts_at >= сейчас), ближайшие первыми;
+    past=true     — уже закончились (ends_at < сейчас), последние первыми;
+    from / to     — начало в диапазоне: дата YYYY-MM-DD (to — включительно, до конца дня)
+                    или момент ISO 8601.
+
+upcoming и past показывают только события со статусами LISTED_EVENT_STATUSES — это
+условие частичных индексов events_event_listed_start_idx (upcoming, по starts_at) и
+events_event_listed_end_idx (past, по ends_at), поэтому «ближайшие события» на главной
+и архив прошедших — просмотр диапазона индекса без сортировки.
+"""
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+
+from apps.events.models import LISTED_EVENT_STATUSES
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+def is_flag_set(query_params, name):
+    return query_params.get(name, "").strip().lower() in TRUE_VALUES
+
+
+def parse_moment(query_params, name, end_of_day=False):
+    """Момент из параметра name: дата (начало дня, с end_of_day — начало следующего) или ISO-момент."""
+    raw = query_params.get(name, "").strip()
+    if not raw:
+        return None
+    try:
+        # Сначала дата: parse_datetime принимает и «YYYY-MM-DD» — как полночь, без end_of_day.
+        day = parse_date(raw)
+        moment = None if day else parse_datetime(raw)
+    except ValueError:
+        moment = day = None
+    if day is not None:
+        moment = datetime.combine(day + timedelta(days=1) if end_of_day else day, time.min)
+    if moment is None:
+        raise ValidationError({name: "Ожидается дата YYYY-MM-DD или момент ISO 8601."})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def upcoming_requested(query_params):
+    return is_flag_set(query_params, "upcoming")
+
+
+def past_requested(query_params):
+    return is_flag_set(query_params, "past")
+
+
+def filter_by_time(queryset, query_params, now=None):
+    """Отфильтровать события по параметрам upcoming / past / from / to."""
+    now = timezone.now() if now is None else now
+    upcoming, past = upcoming_requested(query_params), past_requested(query_params)
+    if upcoming and past:
+        raise ValidationError({"past": "Не сочетается с upcoming."})
+    if upcoming or past:
+        queryset = queryset.filter(status__in=LISTED_EVENT_STATUSES)
+    if upcoming:
+        queryset = queryset.filter(starts_at__gte=now)
+    if past:
+        queryset = queryset.filter(ends_at__lt=now)
+    start_from = parse_moment(query_params, "from")
+    if start_from is not None:
+        queryset = queryset.filter(starts_at__gte=start_from)
+    start_to = parse_moment(query_params, "to", end_of_day=True)
+    if start_to is not None:
+        queryset = queryset.filter(starts_at__lt=start_to)
+    return queryset
+
+
+def time_filter_parameters():
+    """Параметры фильтров по времени для OpenAPI."""
+    return [
+        OpenApiParameter(
+            name="upcoming",
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description="Только предстоящие опубликованные события, ближайшие первыми.",
+        ),
+        OpenApiParameter(
+            name="past",
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description="Только прошедшие (уже закончились) опубликованные события.",
+        ),
+        OpenApiParameter(
+            name="from",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Начало события не раньше: дата YYYY-MM-DD или момент ISO 8601 (время — Europe/Minsk).",
+        ),
+        OpenApiParameter(
+            name="to",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Начало события не позже даты YYYY-MM-DD (включительно) или раньше момента ISO 8601.",
+        ),
+    ]
@@ -2,11 +2,17 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from apps.events.views import (
+    EventCalendarAPIView,
+    EventFeedAPIView,
     EventGalleryViewSet,
     EventRegistrationViewSet,
     EventSegmentViewSet,
     EventViewSet,
+    RegistrationAdmissionAPIView,
+    RegistrationFeedAPIView,
+    RegistrationFeedLinkAPIView,
     SpeakerViewSet,
+    TagEventFeedAPIView,
 )
 
 router = DefaultRouter()
@@ -17,5 +23,11 @@ router.register(r"galleries", EventGalleryViewSet, basename="eventgallery")
 router.register(r"registrations", EventRegistrationViewSet, basename="eventregistration")
 
 urlpatterns = [
+    path("calendar/", EventCalendarAPIView.as_view(), name="event-calendar"),
+    path("feeds/events.ics", EventFeedAPIView.as_view(), name="event-feed"),
+    path("feeds/tags/<slug:slug>.ics", TagEventFeedAPIView.as_view(), name="tag-event-feed"),
+    path("feeds/registrations/", RegistrationFeedLinkAPIView.as_view(), name="registration-feed-link"),
+    path("feeds/registrations/<str:token>.ics", RegistrationFeedAPIView.as_view(), name="registration-feed"),
+    path("registrations/admission/", RegistrationAdmissionAPIView.as_view(), name="registration-admission"),
     path("", include(router.urls)),
 ]
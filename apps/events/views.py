@@ -1,41 +1,103 @@
-from django.db.models import Q, Value
-from django.db.models.functions import Coalesce, Greatest
-from django.contrib.postgres.search import TrigramSimilarity
-from drf_spectacular.utils import OpenApiParameter, extend_schema
+from django.db import IntegrityError
+from django.http import Http404
+from django.urls import reverse
+from django.utils.http import quote_etag
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
 from rest_framework import filters, viewsets
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotAuthenticated, ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from apps.core.admission import ADMISSION_PARAM, AdmissionControlMixin, AdmissionQueue, AdmissionStatusAPIView
+from apps.core.facets import FacetsMixin, facets_parameter
+from apps.core.mixins import CachedResponseMixin, ConditionalGetMixin, SparseFieldsetsMixin, conditional_response
+from apps.core.models import SearchDocument, Tag
+from apps.core.pagination import CursorOrPageNumberPagination
+from apps.core.search import (
+    SEARCH_MODES,
+    SearchTransactionMixin,
+    filter_by_search,
+    parse_min_rank,
+    parse_search_mode,
+)
+from apps.core.tag_filters import filter_by_tags, tag_filter_parameters, tag_ids_by_slug
+from apps.events.calendar import MONTH_PARAM, calendar_generation, calendar_month, parse_month
+from apps.events.feeds import (
+    feed_response,
+    feed_token,
+    feed_token_user,
+    listed_events,
+    registered_events,
+    registrations_scope,
+    tag_events,
+)
 from apps.events.models import (
     Event,
     EventGallery,
     EventRegistration,
+    EventSeats,
     EventSegment,
+    EventStats,
     Speaker,
 )
+from apps.events.seats import NoSeatsAvailable, with_remaining_seats, with_waitlist_position
 from apps.events.serializers import (
+    CalendarMonthSerializer,
     EventDetailSerializer,
     EventGallerySerializer,
     EventListSerializer,
     EventRegistrationSerializer,
     EventSegmentSerializer,
+    FeedLinkSerializer,
     SpeakerListSerializer,
 )
+from apps.events.time_filters import filter_by_time, past_requested, time_filter_parameters, upcoming_requested
 
 
 @extend_schema(tags=["events"])
-class SpeakerViewSet(viewsets.ReadOnlyModelViewSet):
+class SpeakerViewSet(
+    ConditionalGetMixin, CachedResponseMixin, SparseFieldsetsMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = Speaker.objects.all()
     serializer_class = SpeakerListSerializer
+    cache_models = (Speaker, Tag)
 
 
 @extend_schema(tags=["events"])
-class EventViewSet(viewsets.ReadOnlyModelViewSet):
+class EventViewSet(
+    SearchTransactionMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SparseFieldsetsMixin,
+    FacetsMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     queryset = Event.objects.all()
+    cache_models = (Event, EventSeats, EventSegment, EventStats, Speaker, Tag)
     lookup_field = "slug"
     lookup_url_kwarg = "slug"
     filter_backends = [filters.OrderingFilter]
-    ordering_fields = ["date", "time_start", "created_at", "title"]
+    ordering_fields = ["date", "time_start", "starts_at", "created_at", "title"]
     ordering = ["-date", "-time_start"]
+    pagination_class = CursorOrPageNumberPagination
+    facet_fields = {
+        "status": "status",
+        "format": "format",
+        "city": "location_city",
+        "tags": "tags__slug",
+    }
+
+    @property
+    def cursor_ordering(self):
+        # upcoming — ближайшие первыми, по индексу events_event_listed_start_idx;
+        # past — последние закончившиеся первыми, по events_event_listed_end_idx.
+        if upcoming_requested(self.request.query_params):
+            return ("starts_at", "id")
+        if past_requested(self.request.query_params):
+            return ("-ends_at", "-id")
+        return ("-date", "-time_start", "id")
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -48,26 +110,27 @@ class EventViewSet(viewsets.ReadOnlyModelViewSet):
                 name="search",
                 type=str,
                 location=OpenApiParameter.QUERY,
-                description="Триграммный fuzzy-поиск по названию, описанию, локации, спикерам и тегам.",
+                description="Поиск по названию, описанию, локации, спикерам и тегам (режим — search_mode).",
             ),
             OpenApiParameter(
                 name="min_rank",
                 type=float,
                 location=OpenApiParameter.QUERY,
-                description="Порог релевантности для триграммного поиска (по умолчанию 0.12).",
-            ),
-            OpenApiParameter(
-                name="tag",
-                type=str,
-                location=OpenApiParameter.QUERY,
-                description="Слаг тега для фильтрации событий (например: sobytiya).",
+                description="Порог релевантности для триграммного поиска (по умолчанию 0.12; в режиме fulltext не применяется).",
             ),
             OpenApiParameter(
-                name="tags",
+                name="search_mode",
                 type=str,
                 location=OpenApiParameter.QUERY,
-                description="Список слагов тегов через запятую (например: sobytiya,techconference).",
+                enum=SEARCH_MODES,
+                description=(
+                    "Режим поиска: fuzzy — триграммы, устойчив к опечаткам (по умолчанию); "
+                    "fulltext — полнотекстовый с русской морфологией; hybrid — оба, ранги усредняются."
+                ),
             ),
+            *tag_filter_parameters("события"),
+            *time_filter_parameters(),
+            facets_parameter(facet_fields),
             OpenApiParameter(
                 name="status",
                 type=str,
@@ -78,7 +141,10 @@ class EventViewSet(viewsets.ReadOnlyModelViewSet):
                 name="ordering",
                 type=str,
                 location=OpenApiParameter.QUERY,
-                description="Сортировка: date, -date, time_start, -time_start, created_at, -created_at, title, -title.",
+                description=(
+                    "Сортировка: date, -date, time_start, -time_start, starts_at, -starts_at, "
+                    "created_at, -created_at, title, -title."
+                ),
             ),
         ]
     )
@@ -90,63 +156,77 @@ class EventViewSet(viewsets.ReadOnlyModelViewSet):
         # Иначе OrderingFilter перезапишет её на ordering по умолчанию (-date).
         if self.request.query_params.get("search", "").strip():
             return queryset
-        return super().filter_queryset(queryset)
+        queryset = super().filter_queryset(queryset)
+        params = self.request.query_params
+        if (upcoming_requested(params) or past_requested(params)) and not params.get("ordering"):
+            queryset = queryset.order_by(*self.cursor_ordering)
+        return queryset
 
     def get_queryset(self):
-        qs = Event.objects.prefetch_related(
-            "tags",
-            "speakers",
-            "segments__speakers",
-        )
-        search_query = self.request.query_params.get("search", "").strip()
-        min_rank_raw = self.request.query_params.get("min_rank")
-        try:
-            min_rank = float(min_rank_raw) if min_rank_raw is not None else 0.12
-        except (TypeError, ValueError):
-            min_rank = 0.12
-        min_rank = max(0.0, min(1.0, min_rank))
+        # Связи и колонки под сериализатор действия добавляет SparseFieldsetsMixin (apps.core.planner).
+        qs = with_remaining_seats(Event.objects.all())
+        # Поиск — только у списка: деталь по slug/id не ранжируется (и порог %>> ставится
+        # лишь в транзакции list, см. SearchTransactionMixin).
+        search_query = self.request.query_params.get("search", "").strip() if self.action == "list" else ""
+        min_rank = parse_min_rank(self.request.query_params)
+        search_mode = parse_search_mode(self.request.query_params)
         if search_query:
-            qs = qs.annotate(
-                search_rank=Greatest(
-                    Coalesce(TrigramSimilarity("title", search_query), Value(0.0)),
-                    Coalesce(TrigramSimilarity("short_description", search_query), Value(0.0)),
-                    Coalesce(TrigramSimilarity("description", search_query), Value(0.0)),
-                    Coalesce(TrigramSimilarity("location_city", search_query), Value(0.0)),
-                    Coalesce(TrigramSimilarity("location_venue", search_query), Value(0.0)),
-                    Coalesce(TrigramSimilarity("speakers__full_name", search_query), Value(0.0)),
-                )
-            ).filter(
-                Q(search_rank__gte=min_rank)
-                | Q(tags__name__icontains=search_query)
-                | Q(tags__slug__icontains=search_query)
+            qs = filter_by_search(
+                qs, SearchDocument.KIND_EVENT, search_query, min_rank, search_mode
             )
         status = self.request.query_params.get("status")
         if status:
             qs = qs.filter(status=status)
-        tag = self.request.query_params.get("tag")
-        if tag:
-            qs = qs.filter(tags__slug=tag)
-        tags = self.request.query_params.get("tags")
-        if tags:
-            tag_slugs = [slug.strip() for slug in tags.split(",") if slug.strip()]
-            if tag_slugs:
-                qs = qs.filter(tags__slug__in=tag_slugs)
+        qs = filter_by_tags(qs, self.request.query_params)
+        qs = filter_by_time(qs, self.request.query_params)
         if search_query:
             qs = qs.order_by("-search_rank", "-date", "-time_start")
-        qs = qs.distinct()
         return qs
 
 
+@extend_schema(
+    tags=["events"],
+    parameters=[
+        OpenApiParameter(
+            name=MONTH_PARAM,
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Месяц YYYY-MM (по умолчанию текущий).",
+        ),
+    ],
+    responses=CalendarMonthSerializer,
+)
+class EventCalendarAPIView(APIView):
+    """
+    GET /api/v1/events/calendar/?month=YYYY-MM — дни месяца с числом событий и карточками.
+    Один GROUP BY по дате, ответ кэшируется на месяц (apps.events.calendar); ETag —
+    поколение календаря месяца, на If-None-Match — 304 без запросов к БД.
+    """
+
+    serializer_class = CalendarMonthSerializer
+
+    def get(self, request, *args, **kwargs):
+        first_day = parse_month(request.query_params)
+        generation = calendar_generation(first_day)
+        etag = quote_etag(f"calendar-{first_day:%Y-%m}-{generation}")
+        return conditional_response(request, (etag, None), self._calendar_response, first_day, generation)
+
+    def _calendar_response(self, request, first_day, generation):
+        return Response(calendar_month(first_day, generation))
+
+
 @extend_schema(tags=["events"])
-class EventSegmentViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = EventSegment.objects.prefetch_related("speakers")
+class EventSegmentViewSet(ConditionalGetMixin, SparseFieldsetsMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = EventSegment.objects.all()
     serializer_class = EventSegmentSerializer
+    cache_models = (EventSegment, Speaker, Tag)
 
 
 @extend_schema(tags=["events"])
-class EventGalleryViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = EventGallery.objects.select_related("event")
+class EventGalleryViewSet(ConditionalGetMixin, SparseFieldsetsMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = EventGallery.objects.all()
     serializer_class = EventGallerySerializer
+    cache_models = (EventGallery, Event)
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -156,13 +236,24 @@ class EventGalleryViewSet(viewsets.ReadOnlyModelViewSet):
         return qs
 
 
+# Очередь допуска к POST /registrations/ (apps.core.admission), настройки REGISTRATION_ADMISSION_*.
+registration_admission = AdmissionQueue("event-registrations", "REGISTRATION_ADMISSION")
+
+
 @extend_schema(tags=["events"])
-class EventRegistrationViewSet(viewsets.ModelViewSet):
+class EventRegistrationViewSet(AdmissionControlMixin, SparseFieldsetsMixin, viewsets.ModelViewSet):
     serializer_class = EventRegistrationSerializer
     http_method_names = ["get", "post", "head", "options"]
+    admission_queue = registration_admission
+
+    def admission_subject(self, request):
+        # Билет — на пару (пользователь, событие); анонимный запрос сразу получит 400.
+        if not request.user.is_authenticated:
+            return None
+        return [request.user.pk, str(request.data.get("event", ""))]
 
     def get_queryset(self):
-        qs = EventRegistration.objects.select_related("event", "user")
+        qs = with_waitlist_position(EventRegistration.objects.all())
         if self.request.user.is_authenticated:
             qs = qs.filter(user=self.request.user)
         else:
@@ -170,7 +261,106 @@ class EventRegistrationViewSet(viewsets.ModelViewSet):
         return qs
 
     def perform_create(self, serializer):
-        if self.request.user.is_authenticated:
-            serializer.save(user=self.request.user)
-        else:
+        if not self.request.user.is_authenticated:
             raise ValidationError("Требуется авторизация для регистрации на событие.")
+        try:
+            try:
+                serializer.save(user=self.request.user)
+            except NoSeatsAvailable:
+                # Мест нет — в конец листа ожидания; место освободится — регистрация станет pending.
+                serializer.save(user=self.request.user, status=EventRegistration.WAITLIST_STATUS)
+        except IntegrityError:  # unique_together (user, event); место откатилось вместе с INSERT
+            raise ValidationError({"event": "Вы уже зарегистрированы на это событие."}) from None
+        # Ответ — с waitlist_position, как в списке регистраций.
+        serializer.instance = self.get_queryset().get(pk=serializer.instance.pk)
+
+
+@extend_schema(
+    tags=["events"],
+    parameters=[
+        OpenApiParameter(
+            name=ADMISSION_PARAM,
+            type=str,
+            location=OpenApiParameter.QUERY,
+            required=True,
+            description="Билет из ответа 429 на POST /registrations/.",
+        ),
+    ],
+)
+class RegistrationAdmissionAPIView(AdmissionStatusAPIView):
+    """
+    GET /api/v1/events/registrations/admission/?ticket=... — место в очереди регистраций.
+    Когда admitted = true, POST /registrations/ повторяется с билетом в X-Admission-Ticket.
+    """
+
+    admission_queue = registration_admission
+
+
+FEED_SCHEMA_RESPONSES = {(200, "text/calendar"): OpenApiResponse(OpenApiTypes.STR, description="Лента iCalendar.")}
+
+
+class ICalendarFeedAPIView(APIView):
+    """
+    Лента iCalendar (apps.events.feeds). Календари присылают Accept: text/calendar или
+    ничего — ответ не зависит от согласования формата, ошибки отдаются в JSON.
+    """
+
+    def perform_content_negotiation(self, request, force=False):
+        return super().perform_content_negotiation(request, force=True)
+
+
+@extend_schema(tags=["events"], responses=FEED_SCHEMA_RESPONSES)
+class EventFeedAPIView(ICalendarFeedAPIView):
+    """GET /api/v1/events/feeds/events.ics — события на сайте с сегментами программы."""
+
+    def get(self, request, *args, **kwargs):
+        return feed_response(request, "events", "pm-meetup", "PM Meetup", listed_events)
+
+
+@extend_schema(tags=["events"], responses=FEED_SCHEMA_RESPONSES)
+class TagEventFeedAPIView(ICalendarFeedAPIView):
+    """GET /api/v1/events/feeds/tags/<slug>.ics — события с тегом."""
+
+    def get(self, request, slug, *args, **kwargs):
+        if slug not in tag_ids_by_slug():
+            raise Http404
+        return feed_response(
+            request, f"tag:{slug}", f"pm-meetup-{slug}", f"PM Meetup: {slug}", lambda: tag_events(slug)
+        )
+
+
+@extend_schema(tags=["events"], responses=FEED_SCHEMA_RESPONSES)
+class RegistrationFeedAPIView(ICalendarFeedAPIView):
+    """
+    GET /api/v1/events/feeds/registrations/<token>.ics — события, на которые
+    зарегистрирован пользователь. Доступ — по подписи в ссылке, без ключа и сессии.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, token, *args, **kwargs):
+        user_id = feed_token_user(token)
+        if user_id is None:
+            raise Http404
+        return feed_response(
+            request,
+            f"registrations:{user_id}",
+            "pm-meetup-registrations",
+            "PM Meetup: мои регистрации",
+            lambda: registered_events(user_id),
+            scopes=[registrations_scope(user_id)],
+        )
+
+
+@extend_schema(tags=["events"], responses=FeedLinkSerializer)
+class RegistrationFeedLinkAPIView(APIView):
+    """GET /api/v1/events/feeds/registrations/ — ссылка на личную ленту для подписки в календаре."""
+
+    serializer_class = FeedLinkSerializer
+
+    def get(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            raise NotAuthenticated("Требуется авторизация.")
+        path = reverse("registration-feed", kwargs={"token": feed_token(request.user.pk)})
+        return Response(FeedLinkSerializer({"url": request.build_absolute_uri(path)}).data)
@@ -6,3 +6,5 @@ class MaterialsConfig(AppConfig):
     name = "apps.materials"
     verbose_name = "Материалы"
 
+    def ready(self):
+        from apps.materials import search  # noqa: F401
@@ -0,0 +1,59 @@
+"""
+Возвращает триграммные индексы, удалённые в 0004 (они не были объявлены в Meta.indexes).
+"""
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ("core", "0002_enable_pg_trgm"),
+        ("materials", "0004_remove_material_materials_title_trgm_and_more"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="material",
+            index=GinIndex(
+                fields=["title"],
+                name="materials_title_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="material",
+            index=GinIndex(
+                fields=["label"],
+                name="materials_label_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="material",
+            index=GinIndex(
+                fields=["description"],
+                name="materials_desc_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="material",
+            index=GinIndex(
+                fields=["place"],
+                name="materials_place_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="materialcategory",
+            index=GinIndex(
+                fields=["title"],
+                name="materials_cat_title_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+"""
+Индекс под ключ курсорной пагинации MaterialViewSet (-created_at, id).
+"""
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ("materials", "0005_restore_trgm_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="material",
+            index=models.Index(
+                fields=["-created_at", "id"],
+                name="materials_cursor_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0007_content_analysis'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='material',
+            name='materials_title_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='material',
+            name='materials_label_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='material',
+            name='materials_desc_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='material',
+            name='materials_place_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='materialcategory',
+            name='materials_cat_title_trgm',
+        ),
+    ]
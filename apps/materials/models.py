@@ -1,6 +1,6 @@
 from django.db import models
 
-from apps.core.models import TimeStampedModel
+from apps.core.models import AnalyzedContentModel, TimeStampedModel
 
 
 class MaterialCategory(TimeStampedModel):
@@ -20,8 +20,9 @@ class MaterialCategory(TimeStampedModel):
         return self.title
 
 
-class Material(TimeStampedModel):
+class Material(AnalyzedContentModel, TimeStampedModel):
     """Материал: отчёт, курс, чек-лист, запись, кейс."""
+    analyzed_field = "description"
 
     label = models.CharField(
         "Тип/лейбл",
@@ -58,6 +59,10 @@ class Material(TimeStampedModel):
         verbose_name = "Материал"
         verbose_name_plural = "Материалы"
         ordering = ["-created_at"]
+        indexes = [
+            # Ключ курсорной пагинации (apps.core.pagination) и сортировки по умолчанию.
+            models.Index(fields=["-created_at", "id"], name="materials_cursor_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -0,0 +1,24 @@
+"""Поисковый документ материала (apps.core.search): поля карточки и название категории; подсказки."""
+from apps.core.models import SearchDocument, SearchSuggestion
+from apps.core.search import register_document, register_suggestion
+from apps.materials.models import Material, MaterialCategory
+
+
+def material_document(material):
+    return material.title, [
+        material.label,
+        material.description,
+        material.place,
+        material.category.title,
+    ]
+
+
+register_document(
+    SearchDocument.KIND_MATERIAL,
+    Material,
+    material_document,
+    select_related=("category",),
+    depends_on=((MaterialCategory, "materials"),),
+)
+
+register_suggestion(SearchSuggestion.KIND_MATERIAL, Material, "title")
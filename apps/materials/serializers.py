@@ -22,6 +22,8 @@ class MaterialListSerializer(serializers.ModelSerializer):
             "date",
             "place",
             "duration_minutes",
+            "excerpt",
+            "read_time_minutes",
             "cover_image",
             "view_count",
         )
@@ -41,6 +43,8 @@ class MaterialDetailSerializer(serializers.ModelSerializer):
             "place",
             "duration_minutes",
             "description",
+            "toc",
+            "read_time_minutes",
             "file_url",
             "cover_image",
             "view_count",
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from rest_framework.request import Request
 from rest_framework.test import APIClient, APIRequestFactory
@@ -37,6 +38,8 @@ class MaterialSearchApiTests(TestCase):
         )
 
     def setUp(self):
+        # Кэш ответов (CachedResponseMixin) переживает откат транзакции теста.
+        cache.clear()
         self.client = APIClient()
         self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
 
@@ -1,9 +1,17 @@
-from django.contrib.postgres.search import TrigramSimilarity
-from django.db.models import Value
-from django.db.models.functions import Coalesce, Greatest
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import filters, viewsets
 
+from apps.core.facets import FacetsMixin, facets_parameter
+from apps.core.mixins import CachedResponseMixin, ConditionalGetMixin, SparseFieldsetsMixin
+from apps.core.models import SearchDocument
+from apps.core.pagination import CursorOrPageNumberPagination
+from apps.core.search import (
+    SEARCH_MODES,
+    SearchTransactionMixin,
+    filter_by_search,
+    parse_min_rank,
+    parse_search_mode,
+)
 from apps.materials.models import Material, MaterialCategory
 from apps.materials.serializers import (
     MaterialCategorySerializer,
@@ -13,19 +21,33 @@ from apps.materials.serializers import (
 
 
 @extend_schema(tags=["materials"])
-class MaterialCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class MaterialCategoryViewSet(
+    ConditionalGetMixin, SparseFieldsetsMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = MaterialCategory.objects.filter(is_active=True)
     serializer_class = MaterialCategorySerializer
+    cache_models = (MaterialCategory,)
     lookup_field = "slug"
     lookup_url_kwarg = "slug"
 
 
 @extend_schema(tags=["materials"])
-class MaterialViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Material.objects.select_related("category")
+class MaterialViewSet(
+    SearchTransactionMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SparseFieldsetsMixin,
+    FacetsMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
+    queryset = Material.objects.all()
+    cache_models = (Material, MaterialCategory)
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ["date", "created_at", "view_count", "title"]
     ordering = ["-created_at"]
+    pagination_class = CursorOrPageNumberPagination
+    cursor_ordering = ("-created_at", "id")
+    facet_fields = {"category": "category__slug"}
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -38,13 +60,23 @@ class MaterialViewSet(viewsets.ReadOnlyModelViewSet):
                 name="search",
                 type=str,
                 location=OpenApiParameter.QUERY,
-                description="Триграммный fuzzy-поиск по названию, типу, описанию, месту и категории.",
+                description="Поиск по названию, типу, описанию, месту и категории (режим — search_mode).",
             ),
             OpenApiParameter(
                 name="min_rank",
                 type=float,
                 location=OpenApiParameter.QUERY,
-                description="Порог релевантности для триграммного поиска (по умолчанию 0.12).",
+                description="Порог релевантности для триграммного поиска (по умолчанию 0.12; в режиме fulltext не применяется).",
+            ),
+            OpenApiParameter(
+                name="search_mode",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                enum=SEARCH_MODES,
+                description=(
+                    "Режим поиска: fuzzy — триграммы, устойчив к опечаткам (по умолчанию); "
+                    "fulltext — полнотекстовый с русской морфологией; hybrid — оба, ранги усредняются."
+                ),
             ),
             OpenApiParameter(
                 name="category",
@@ -52,6 +84,7 @@ class MaterialViewSet(viewsets.ReadOnlyModelViewSet):
                 location=OpenApiParameter.QUERY,
                 description="Слаг категории материала.",
             ),
+            facets_parameter(facet_fields),
             OpenApiParameter(
                 name="ordering",
                 type=str,
@@ -70,23 +103,15 @@ class MaterialViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         qs = super().get_queryset()
-        search_query = self.request.query_params.get("search", "").strip()
-        min_rank_raw = self.request.query_params.get("min_rank")
-        try:
-            min_rank = float(min_rank_raw) if min_rank_raw is not None else 0.12
-        except (TypeError, ValueError):
-            min_rank = 0.12
-        min_rank = max(0.0, min(1.0, min_rank))
+        # Поиск — только у списка: деталь по slug/id не ранжируется (и порог %>> ставится
+        # лишь в транзакции list, см. SearchTransactionMixin).
+        search_query = self.request.query_params.get("search", "").strip() if self.action == "list" else ""
+        min_rank = parse_min_rank(self.request.query_params)
+        search_mode = parse_search_mode(self.request.query_params)
         if search_query:
-            qs = qs.annotate(
-                search_rank=Greatest(
-                    Coalesce(TrigramSimilarity("title", search_query), Value(0.0)),
-                    Coalesce(TrigramSimilarity("label", search_query), Value(0.0)),
-                    Coalesce(TrigramSimilarity("description", search_query), Value(0.0)),
-                    Coalesce(TrigramSimilarity("place", search_query), Value(0.0)),
-                    Coalesce(TrigramSimilarity("category__title", search_query), Value(0.0)),
-                )
-            ).filter(search_rank__gte=min_rank).order_by("-search_rank", "-created_at")
+            qs = filter_by_search(
+                qs, SearchDocument.KIND_MATERIAL, search_query, min_rank, search_mode
+            ).order_by("-search_rank", "-created_at")
         category = self.request.query_params.get("category")
         if category:
             qs = qs.filter(category__slug=category)
@@ -11,7 +11,7 @@ class NewsArticleAdmin(admin.ModelAdmin):
     list_filter = ("is_published",)
     search_fields = ("title", "short_description")
     prepopulated_fields = {"slug": ("title",)}
-    readonly_fields = ("views_count", "created_at", "updated_at")
+    readonly_fields = ("views_count", "word_count", "read_time_minutes", "created_at", "updated_at")
     filter_horizontal = ("tags",)
     date_hierarchy = "publication_date"
     list_editable = ("is_published",)
@@ -5,3 +5,6 @@ class NewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.news'
     verbose_name = 'Новости'
+
+    def ready(self):
+        from apps.news import search, signals  # noqa: F401
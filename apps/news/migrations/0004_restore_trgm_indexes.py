@@ -0,0 +1,43 @@
+"""
+Возвращает триграммные индексы, удалённые в 0003 (они не были объявлены в Meta.indexes).
+"""
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ("core", "0002_enable_pg_trgm"),
+        ("news", "0003_remove_newsarticle_news_article_title_trgm_and_more"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="newsarticle",
+            index=GinIndex(
+                fields=["title"],
+                name="news_article_title_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="newsarticle",
+            index=GinIndex(
+                fields=["short_description"],
+                name="news_article_short_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="newsarticle",
+            index=GinIndex(
+                fields=["content"],
+                name="news_article_content_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+"""
+Частичный индекс под ключ курсорной пагинации NewsArticleViewSet
+(-publication_date, -created_at, id) — только опубликованные новости.
+"""
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ("news", "0004_restore_trgm_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="newsarticle",
+            index=models.Index(
+                fields=["-publication_date", "-created_at", "id"],
+                name="news_article_cursor_idx",
+                condition=models.Q(is_published=True),
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_cursor_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsarticle',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Выдержка'),
+        ),
+        migrations.AddField(
+            model_name='newsarticle',
+            name='toc',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Оглавление'),
+        ),
+        migrations.AddField(
+            model_name='newsarticle',
+            name='word_count',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Слов в тексте'),
+        ),
+        migrations.AlterField(
+            model_name='newsarticle',
+            name='read_time_minutes',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Время чтения (мин)'),
+        ),
+    ]
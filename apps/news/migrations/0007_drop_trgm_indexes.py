@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_content_analysis'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='newsarticle',
+            name='news_article_title_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='newsarticle',
+            name='news_article_short_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='newsarticle',
+            name='news_article_content_trgm',
+        ),
+    ]
@@ -1,14 +1,16 @@
 from django.db import models
 from django.conf import settings
-from django.utils.text import slugify
 
 from mdeditor.fields import MDTextField
 
-from apps.core.models import TimeStampedModel, Tag
+from apps.core.models import AnalyzedContentModel, AutoSlugModel, TimeStampedModel, Tag
 
 
-class NewsArticle(TimeStampedModel):
+class NewsArticle(AutoSlugModel, AnalyzedContentModel, TimeStampedModel):
     """Новость / статья блога."""
+    analyzed_field = "content"
+    slug_source = "title"
+
     title = models.CharField("Заголовок", max_length=300)
     slug = models.SlugField("URL-путь", max_length=320, unique=True)
     short_description = models.TextField("Краткое описание (для карточки)", blank=True)
@@ -17,7 +19,6 @@ class NewsArticle(TimeStampedModel):
         "Обложка", upload_to="news/", blank=True, null=True
     )
     publication_date = models.DateTimeField("Дата публикации", null=True, blank=True)
-    read_time_minutes = models.PositiveIntegerField("Время чтения (мин)", default=0)
     views_count = models.PositiveIntegerField("Просмотры", default=0)
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -38,11 +39,14 @@ class NewsArticle(TimeStampedModel):
         verbose_name = "Новость"
         verbose_name_plural = "Новости"
         ordering = ["-publication_date", "-created_at"]
+        indexes = [
+            # Ключ курсорной пагинации (apps.core.pagination); API отдаёт только опубликованные.
+            models.Index(
+                fields=["-publication_date", "-created_at", "id"],
+                name="news_article_cursor_idx",
+                condition=models.Q(is_published=True),
+            ),
+        ]
 
     def __str__(self):
         return self.title
-
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title, allow_unicode=True)
-        super().save(*args, **kwargs)
@@ -0,0 +1,34 @@
+"""Поисковый документ новости (apps.core.search): заголовок, описание, контент, теги; подсказки."""
+from django.db.models import Q
+
+from apps.core.models import SearchDocument, SearchSuggestion, Tag
+from apps.core.search import register_document, register_suggestion
+from apps.news.models import NewsArticle
+
+
+def news_document(article):
+    return article.title, [
+        article.short_description,
+        article.content,
+        *(tag.name for tag in article.tags.all()),
+    ]
+
+
+register_document(
+    SearchDocument.KIND_NEWS,
+    NewsArticle,
+    news_document,
+    prefetch_related=("tags",),
+    m2m=((NewsArticle.tags.through, "news_articles"),),
+    depends_on=((Tag, "news_articles"),),
+    lookup_field="slug",
+    public_filter=Q(is_published=True),
+)
+
+register_suggestion(
+    SearchSuggestion.KIND_NEWS,
+    NewsArticle,
+    "title",
+    lookup_field="slug",
+    public_filter=Q(is_published=True),
+)
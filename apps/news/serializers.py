@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from apps.core.serializers import TagSerializer
+from apps.core.serializers import MarkdownHTMLField, TagSerializer
 from apps.news.models import NewsArticle
 from apps.users.serializers import UserPublicSerializer
 
@@ -16,9 +16,11 @@ class NewsArticleListSerializer(serializers.ModelSerializer):
             "title",
             "slug",
             "short_description",
+            "excerpt",
             "cover_image",
             "publication_date",
             "read_time_minutes",
+            "word_count",
             "views_count",
             "author",
             "tags",
@@ -28,6 +30,7 @@ class NewsArticleListSerializer(serializers.ModelSerializer):
 class NewsArticleDetailSerializer(serializers.ModelSerializer):
     tags = TagSerializer(many=True, read_only=True)
     author = UserPublicSerializer(read_only=True)
+    content_html = MarkdownHTMLField(source="content")
 
     class Meta:
         model = NewsArticle
@@ -37,12 +40,16 @@ class NewsArticleDetailSerializer(serializers.ModelSerializer):
             "slug",
             "short_description",
             "content",
+            "content_html",
+            "toc",
             "cover_image",
             "publication_date",
             "read_time_minutes",
+            "word_count",
             "views_count",
             "author",
             "meta_title",
             "meta_description",
             "tags",
         )
+        optional_fields = ("content_html",)
@@ -0,0 +1,49 @@
+"""
+Автор новости в ответах API — публичные поля пользователя (UserPublicSerializer).
+
+Пользователь не входит в cache_models новостей: иначе любое его сохранение (last_login
+при каждом входе) сбрасывало бы весь кэш новостей. Поколение NewsArticle меняется
+только когда у автора новостей меняются публичные поля или автор удаляется.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.core.cache import bump_generation
+from apps.news.models import NewsArticle
+from apps.users.serializers import UserPublicSerializer
+
+User = get_user_model()
+AUTHOR_FIELDS = tuple(name for name in UserPublicSerializer.Meta.fields if name != "id")
+
+
+def invalidate_news_responses():
+    transaction.on_commit(lambda: bump_generation(NewsArticle))
+
+
+@receiver(pre_save, sender=User)
+def remember_author_fields(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Прежние публичные поля — только у авторов и только если они могут измениться."""
+    instance._author_fields_before = None
+    if raw or not instance.pk:
+        return
+    if update_fields is not None and not set(update_fields) & set(AUTHOR_FIELDS):
+        return
+    instance._author_fields_before = (
+        User.objects.filter(pk=instance.pk, news_articles__isnull=False).values(*AUTHOR_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=User)
+def invalidate_news_on_author_change(sender, instance, **kwargs):
+    before = getattr(instance, "_author_fields_before", None)
+    if before and any(getattr(instance, name) != before[name] for name in AUTHOR_FIELDS):
+        invalidate_news_responses()
+
+
+@receiver(pre_delete, sender=User)
+def invalidate_news_on_author_delete(sender, instance, **kwargs):
+    # author обнуляется через UPDATE (SET_NULL) — сигналов NewsArticle не будет.
+    if instance.news_articles.exists():
+        invalidate_news_responses()
@@ -1,3 +1,8 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 from rest_framework.request import Request
@@ -35,6 +40,8 @@ class NewsSearchApiTests(TestCase):
         cls.article_other.tags.set([cls.tag_trends])
 
     def setUp(self):
+        # Кэш ответов (CachedResponseMixin) переживает откат транзакции теста.
+        cache.clear()
         self.client = APIClient()
         self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
 
@@ -68,6 +75,38 @@ class NewsSearchApiTests(TestCase):
         # tags__slug__in — хотя бы один из слагов; у обеих статей есть `trends`
         self.assertEqual(multi_tag_response.data["count"], 2)
 
+    def test_tags_any_all_exclude(self):
+        def slugs(**params):
+            response = self.client.get("/api/v1/news/articles/", params)
+            self.assertEqual(response.status_code, 200)
+            return {item["slug"] for item in response.data["results"]}
+
+        both = {self.article.slug, self.article_other.slug}
+        self.assertEqual(slugs(tags_any="pm,trends"), both)
+        self.assertEqual(slugs(tags_all="pm,trends"), {self.article.slug})
+        self.assertEqual(slugs(tags_any="trends", tags_exclude="pm"), {self.article_other.slug})
+        self.assertEqual(slugs(tags_any="pm,missing"), {self.article.slug})
+        self.assertEqual(slugs(tags_all="trends,missing"), set())
+        self.assertEqual(slugs(tags_exclude="missing"), both)
+
+        # Новый тег попадает в словарь slug → id сразу после сохранения.
+        with self.captureOnCommitCallbacks(execute=True):
+            fresh = Tag.objects.create(name="Fresh", slug="fresh")
+            self.article_other.tags.add(fresh)
+        self.assertEqual(slugs(tags_all="fresh"), {self.article_other.slug})
+
+    def test_tag_filters_without_distinct(self):
+        django_request = APIRequestFactory().get(
+            "/api/v1/news/articles/", {"tags_any": "pm,trends", "tags_exclude": "pm"}
+        )
+        view = NewsArticleViewSet()
+        view.request = Request(django_request)
+        view.action = "list"
+        sql = str(view.get_queryset().query).upper()
+        self.assertNotIn("DISTINCT", sql)
+        self.assertIn("EXISTS", sql)
+        self.assertNotIn("CORE_TAG", sql)
+
     def test_search_list_order_matches_viewset_search_rank(self):
         """
         Порядок в ответе API совпадает с order_by(-search_rank, ...) в NewsArticleViewSet.get_queryset().
@@ -89,3 +128,107 @@ class NewsSearchApiTests(TestCase):
             expected_slugs,
             msg="Порядок API должен совпадать с сортировкой по search_rank в ViewSet.",
         )
+
+    def test_search_modes(self):
+        """fulltext находит словоформы (русский стемминг), но не опечатки; hybrid — и то, и другое."""
+        article_ru = NewsArticle.objects.create(
+            title="Управление проектами в распределённых командах",
+            slug="upravlenie-proektami",
+            content="Как планировать релизы и управлять рисками.",
+            publication_date=timezone.now(),
+            is_published=True,
+        )
+
+        def slugs(params):
+            response = self.client.get("/api/v1/news/articles/", params)
+            self.assertEqual(response.status_code, 200)
+            return {row["slug"] for row in response.data["results"]}
+
+        self.assertEqual(slugs({"search": "проекты команды", "search_mode": "fulltext"}), {article_ru.slug})
+        self.assertEqual(slugs({"search": "managment trands", "search_mode": "fulltext"}), set())
+        self.assertIn(
+            self.article.slug,
+            slugs({"search": "managment trands", "search_mode": "hybrid", "min_rank": "0.10"}),
+        )
+        self.assertIn(
+            article_ru.slug,
+            slugs({"search": "проекты команды", "search_mode": "hybrid", "min_rank": "0.95"}),
+        )
+
+    def test_cursor_pagination(self):
+        """Курсор проходит ленту без пропусков и повторов — с равными датами и NULL в publication_date."""
+        day = timezone.now()
+        NewsArticle.objects.bulk_create(
+            NewsArticle(
+                title=f"Digest {number}",
+                slug=f"digest-{number}",
+                publication_date=None if number % 5 == 0 else day - timedelta(days=number // 3),
+                is_published=True,
+            )
+            for number in range(30)
+        )
+        expected = list(
+            NewsArticle.objects.filter(is_published=True)
+            .order_by("-publication_date", "-created_at", "id")
+            .values_list("slug", flat=True)
+        )
+
+        slugs, pages = [], []
+        response = self.client.get("/api/v1/news/articles/", {"pagination": "cursor"})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            pages.append(response.data)
+            slugs += [row["slug"] for row in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(slugs, expected)
+        self.assertIsNone(pages[0]["previous"])
+
+        previous = self.client.get(pages[-1]["previous"])
+        self.assertEqual(
+            [row["slug"] for row in previous.data["results"]],
+            [row["slug"] for row in pages[-2]["results"]],
+        )
+
+        self.assertEqual(
+            self.client.get("/api/v1/news/articles/", {"pagination": "cursor", "search": "digest"}).status_code,
+            400,
+        )
+        self.assertEqual(self.client.get("/api/v1/news/articles/", {"cursor": "broken"}).status_code, 404)
+        self.assertIn("count", self.client.get("/api/v1/news/articles/").data)
+
+
+class NewsAuthorCacheTests(TestCase):
+    """Кэш новостей сбрасывают только публичные поля автора, а не любое сохранение пользователя."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-news-author-key", is_active=True)
+        cls.author = get_user_model().objects.create_user(
+            email="author@example.com", password="secret", first_name="Анна", last_name="Петрова"
+        )
+        NewsArticle.objects.create(
+            title="Итоги", slug="itogi", author=cls.author, publication_date=timezone.now(), is_published=True
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+
+    def author_name(self):
+        return self.client.get("/api/v1/news/articles/").data["results"][0]["author"]["first_name"]
+
+    def test_only_public_fields_invalidate(self):
+        self.assertEqual(self.author_name(), "Анна")
+        with self.captureOnCommitCallbacks(execute=True):
+            update_last_login(None, self.author)
+        with self.assertNumQueries(0):
+            self.author_name()
+
+        self.author.first_name = "Мария"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.save()
+        self.assertEqual(self.author_name(), "Мария")
@@ -1,21 +1,43 @@
-from django.contrib.postgres.search import TrigramSimilarity
-from django.db.models import Q, Value
-from django.db.models.functions import Coalesce, Greatest
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import filters, viewsets
 
+from apps.core.facets import FacetsMixin, facets_parameter
+from apps.core.mixins import CachedResponseMixin, ConditionalGetMixin, SparseFieldsetsMixin
+from apps.core.models import SearchDocument, Tag
+from apps.core.pagination import CursorOrPageNumberPagination
+from apps.core.search import (
+    SEARCH_MODES,
+    SearchTransactionMixin,
+    filter_by_search,
+    parse_min_rank,
+    parse_search_mode,
+)
+from apps.core.tag_filters import filter_by_tags, tag_filter_parameters
 from apps.news.models import NewsArticle
 from apps.news.serializers import NewsArticleDetailSerializer, NewsArticleListSerializer
 
 
 @extend_schema(tags=["news"])
-class NewsArticleViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = NewsArticle.objects.filter(is_published=True).prefetch_related("tags")
+class NewsArticleViewSet(
+    SearchTransactionMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SparseFieldsetsMixin,
+    FacetsMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
+    queryset = NewsArticle.objects.filter(is_published=True)
+    # Автор — без модели пользователя: правки публичных полей автора меняют поколение
+    # NewsArticle (apps.news.signals), а last_login при входе кэш не сбрасывает.
+    cache_models = (NewsArticle, Tag)
     lookup_field = "slug"
     lookup_url_kwarg = "slug"
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ["publication_date", "created_at", "views_count", "title"]
     ordering = ["-publication_date", "-created_at"]
+    pagination_class = CursorOrPageNumberPagination
+    cursor_ordering = ("-publication_date", "-created_at", "id")
+    facet_fields = {"tags": "tags__slug"}
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -28,26 +50,26 @@ class NewsArticleViewSet(viewsets.ReadOnlyModelViewSet):
                 name="search",
                 type=str,
                 location=OpenApiParameter.QUERY,
-                description="Триграммный fuzzy-поиск по заголовку, описанию, контенту и тегам.",
+                description="Поиск по заголовку, описанию, контенту и тегам (режим — search_mode).",
             ),
             OpenApiParameter(
                 name="min_rank",
                 type=float,
                 location=OpenApiParameter.QUERY,
-                description="Порог релевантности для триграммного поиска (по умолчанию 0.12).",
+                description="Порог релевантности для триграммного поиска (по умолчанию 0.12; в режиме fulltext не применяется).",
             ),
             OpenApiParameter(
-                name="tag",
+                name="search_mode",
                 type=str,
                 location=OpenApiParameter.QUERY,
-                description="Слаг тега для фильтрации новостей.",
-            ),
-            OpenApiParameter(
-                name="tags",
-                type=str,
-                location=OpenApiParameter.QUERY,
-                description="Список слагов тегов через запятую.",
+                enum=SEARCH_MODES,
+                description=(
+                    "Режим поиска: fuzzy — триграммы, устойчив к опечаткам (по умолчанию); "
+                    "fulltext — полнотекстовый с русской морфологией; hybrid — оба, ранги усредняются."
+                ),
             ),
+            *tag_filter_parameters("новости"),
+            facets_parameter(facet_fields),
             OpenApiParameter(
                 name="ordering",
                 type=str,
@@ -66,33 +88,16 @@ class NewsArticleViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         qs = super().get_queryset()
-        search_query = self.request.query_params.get("search", "").strip()
-        min_rank_raw = self.request.query_params.get("min_rank")
-        try:
-            min_rank = float(min_rank_raw) if min_rank_raw is not None else 0.12
-        except (TypeError, ValueError):
-            min_rank = 0.12
-        min_rank = max(0.0, min(1.0, min_rank))
+        # Поиск — только у списка: деталь по slug/id не ранжируется (и порог %>> ставится
+        # лишь в транзакции list, см. SearchTransactionMixin).
+        search_query = self.request.query_params.get("search", "").strip() if self.action == "list" else ""
+        min_rank = parse_min_rank(self.request.query_params)
+        search_mode = parse_search_mode(self.request.query_params)
         if search_query:
-            qs = qs.annotate(
-                search_rank=Greatest(
-                    Coalesce(TrigramSimilarity("title", search_query), Value(0.0)),
-                    Coalesce(TrigramSimilarity("short_description", search_query), Value(0.0)),
-                    Coalesce(TrigramSimilarity("content", search_query), Value(0.0)),
-                )
-            ).filter(
-                Q(search_rank__gte=min_rank)
-                | Q(tags__name__icontains=search_query)
-                | Q(tags__slug__icontains=search_query)
+            qs = filter_by_search(
+                qs, SearchDocument.KIND_NEWS, search_query, min_rank, search_mode
             )
-        tag = self.request.query_params.get("tag")
-        if tag:
-            qs = qs.filter(tags__slug=tag)
-        tags = self.request.query_params.get("tags")
-        if tags:
-            tag_slugs = [slug.strip() for slug in tags.split(",") if slug.strip()]
-            if tag_slugs:
-                qs = qs.filter(tags__slug__in=tag_slugs)
+        qs = filter_by_tags(qs, self.request.query_params)
         if search_query:
             qs = qs.order_by("-search_rank", "-publication_date", "-created_at")
-        return qs.distinct()
+        return qs
@@ -6,3 +6,9 @@ class PagesConfig(AppConfig):
     name = "apps.pages"
     verbose_name = "Блоки страниц"
 
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from apps.pages import signals
+
+        post_migrate.connect(signals.compile_all_pages, sender=self)
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0002_blockitem_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='page',
+            name='compiled_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Снимок собран'),
+        ),
+        migrations.AddField(
+            model_name='page',
+            name='compiled_json',
+            field=models.TextField(blank=True, editable=False, verbose_name='Снимок JSON'),
+        ),
+        migrations.AddField(
+            model_name='page',
+            name='compiled_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия снимка'),
+        ),
+    ]
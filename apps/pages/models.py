@@ -11,6 +11,11 @@ class Page(TimeStampedModel):
 
     slug = models.SlugField("Slug страницы", max_length=100, unique=True)
     name = models.CharField("Название страницы", max_length=200)
+    # Готовый JSON ответа GET /api/pages/<slug>/ (apps.pages.snapshots): пересобирается
+    # сигналами при изменении страницы, её блоков, элементов и типов блоков.
+    compiled_json = models.TextField("Снимок JSON", blank=True, editable=False)
+    compiled_version = models.PositiveIntegerField("Версия снимка", default=0, editable=False)
+    compiled_at = models.DateTimeField("Снимок собран", null=True, blank=True, editable=False)
 
     class Meta:
         verbose_name = "Страница (блоки)"
@@ -0,0 +1,42 @@
+from django.db import connection
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.pages.models import BlockItem, BlockType, Page, PageBlock
+from apps.pages.snapshots import compile_pages, schedule_compile
+
+
+@receiver(post_save, sender=Page)
+def compile_page_on_save(sender, instance, **kwargs):
+    schedule_compile([instance.pk])
+
+
+@receiver(post_save, sender=PageBlock)
+@receiver(post_delete, sender=PageBlock)
+def compile_page_on_block_change(sender, instance, **kwargs):
+    schedule_compile([instance.page_id])
+
+
+@receiver(post_save, sender=BlockItem)
+@receiver(post_delete, sender=BlockItem)
+def compile_page_on_item_change(sender, instance, **kwargs):
+    # При каскадном удалении блока его строки уже может не быть — тогда страницу
+    # пересоберёт сигнал самого PageBlock.
+    schedule_compile(PageBlock.objects.filter(pk=instance.block_id).values_list("page_id", flat=True))
+
+
+@receiver(post_save, sender=BlockType)
+def compile_pages_on_block_type_change(sender, instance, **kwargs):
+    """Название типа блока входит в снимки всех страниц, где он используется."""
+    schedule_compile(instance.page_blocks.values_list("page_id", flat=True).distinct())
+
+
+def compile_all_pages(sender, **kwargs):
+    """post_migrate: пересобрать все снимки — формат сериализаторов мог измениться при деплое."""
+    table = Page._meta.db_table
+    if table not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        columns = {column.name for column in connection.introspection.get_table_description(cursor, table)}
+    if "compiled_json" in columns:  # нет после отката миграций pages
+        compile_pages(Page.objects.values_list("pk", flat=True))
@@ -0,0 +1,73 @@
+"""
+Снимки страниц: дерево блоков страницы, заранее сериализованное в JSON.
+
+GET /api/pages/<slug>/ не выбирает блоки и не вызывает PageSerializer: он читает
+одну строку Page по уникальному slug и отдаёт готовые байты из compiled_json.
+Снимок пересобирается сигналами (apps.pages.signals) после коммита транзакции,
+в которой менялись страница, её блоки, элементы блоков или типы блоков; каждая
+пересборка увеличивает compiled_version, из которой строится ETag.
+"""
+from typing import NamedTuple
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.http import quote_etag
+from rest_framework.renderers import JSONRenderer
+
+from apps.pages.models import Page
+from apps.pages.serializers import PageSerializer
+
+
+class PageSnapshot(NamedTuple):
+    body: str
+    etag: str
+    last_modified: int | None
+
+
+def compile_pages(page_ids):
+    """Пересобрать снимки страниц: сериализация дерева блоков и запись одним UPDATE на страницу."""
+    pages = Page.objects.filter(pk__in=set(page_ids)).prefetch_related(
+        "blocks__block_type",
+        "blocks__items",
+    )
+    for page in pages:
+        body = JSONRenderer().render(PageSerializer(page).data).decode()
+        # update() вместо save(): без post_save и без смены updated_at страницы.
+        Page.objects.filter(pk=page.pk).update(
+            compiled_json=body,
+            compiled_version=F("compiled_version") + 1,
+            compiled_at=timezone.now(),
+        )
+
+
+def schedule_compile(page_ids):
+    """
+    Пересобрать снимки после коммита: каскадное удаление и inline-формы админки
+    к этому моменту уже записали все блоки и элементы.
+    """
+    page_ids = {page_id for page_id in page_ids if page_id is not None}
+    if page_ids:
+        transaction.on_commit(lambda: compile_pages(page_ids))
+
+
+def page_snapshot(slug):
+    """
+    Снимок страницы по slug одним индексным запросом; None — страницы нет.
+    Страница без снимка (сразу после миграции) собирается при первом запросе.
+    """
+    fields = ("pk", "compiled_json", "compiled_version", "compiled_at")
+    row = Page.objects.filter(slug=slug).values_list(*fields).first()
+    if row is None:
+        return None
+    if not row[1]:
+        compile_pages([row[0]])
+        row = Page.objects.filter(pk=row[0]).values_list(*fields).first()
+        if row is None:
+            return None
+    pk, body, version, compiled_at = row
+    return PageSnapshot(
+        body=body,
+        etag=quote_etag(f"page-{pk}-v{version}"),
+        last_modified=int(compiled_at.timestamp()) if compiled_at else None,
+    )
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.models import ApiKey
+from apps.core.permissions import is_valid_api_key
+from apps.pages.models import BlockItem, BlockType, Page, PageBlock
+
+
+class PageSnapshotApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = ApiKey.objects.create(name="tests-pages-key", is_active=True)
+        cls.hero = BlockType.objects.create(code="hero", name="Hero")
+        cls.page = Page.objects.create(name="Главная", slug="home")
+        cls.block = PageBlock.objects.create(page=cls.page, block_type=cls.hero, order=1)
+        cls.item = BlockItem.objects.create(block=cls.block, title="PM Meetup", order=1)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_API_KEY=self.api_key.key)
+        is_valid_api_key(self.api_key.key)
+
+    def test_served_from_snapshot(self):
+        first = self.client.get("/api/pages/home/")  # снимок собирается при первом запросе
+        self.assertEqual(first.status_code, 200)
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/pages/home/")
+        self.assertEqual(response["Content-Type"], "application/json")
+        data = response.json()
+        self.assertEqual(data["slug"], "home")
+        self.assertEqual(data["blocks"][0]["block_type"], {"code": "hero", "name": "Hero"})
+        self.assertEqual(data["blocks"][0]["items"][0]["title"], "PM Meetup")
+        with self.assertNumQueries(1):
+            not_modified = self.client.get("/api/pages/home/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(self.client.get("/api/pages/missing/").status_code, 404)
+
+    def test_recompiled_on_change(self):
+        etag = self.client.get("/api/pages/home/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.title = "PM Meetup 2026"
+            self.item.save()
+        response = self.client.get("/api/pages/home/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["blocks"][0]["items"][0]["title"], "PM Meetup 2026")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hero.name = "Первый экран"
+            self.hero.save()
+        response = self.client.get("/api/pages/home/")
+        self.assertEqual(response.json()["blocks"][0]["block_type"]["name"], "Первый экран")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.block.delete()
+        self.assertEqual(self.client.get("/api/pages/home/").json()["blocks"], [])
@@ -1,11 +1,11 @@
-from django.shortcuts import get_object_or_404
+from django.http import Http404, HttpResponse
 from drf_spectacular.utils import extend_schema
-from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.mixins import conditional_response
 from apps.core.permissions import OnlyWithApiKeyOrFromFrontend
-from apps.pages.models import Page
 from apps.pages.serializers import PageSerializer
+from apps.pages.snapshots import page_snapshot
 
 
 @extend_schema(tags=["pages"])
@@ -14,20 +14,21 @@ class PageDetailAPIView(APIView):
     Возвращает структуру блоков и элементов для указанной страницы.
 
     GET /api/pages/<slug>/
+    Отдаёт готовый снимок JSON (apps.pages.snapshots) — один индексный запрос по slug,
+    без выборки блоков и сериализации. ETag — версия снимка, на If-None-Match — 304.
     """
 
     permission_classes = [OnlyWithApiKeyOrFromFrontend]
     serializer_class = PageSerializer
 
     @extend_schema(responses=PageSerializer)
-    def get(self, request, slug: str, *args, **kwargs) -> Response:
-        page = get_object_or_404(
-            Page.objects.prefetch_related(
-                "blocks__block_type",
-                "blocks__items",
-            ),
-            slug=slug,
+    def get(self, request, slug: str, *args, **kwargs) -> HttpResponse:
+        snapshot = page_snapshot(slug)
+        if snapshot is None:
+            raise Http404
+        return conditional_response(
+            request, (snapshot.etag, snapshot.last_modified), self._page_response, snapshot
         )
-        serializer = PageSerializer(page)
-        return Response(serializer.data)
 
+    def _page_response(self, request, snapshot) -> HttpResponse:
+        return HttpResponse(snapshot.body, content_type="application/json")
@@ -17,6 +17,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third-party
     'rest_framework',
@@ -123,6 +124,62 @@ FIXTURE_DIRS = [BASE_DIR / 'fixtures']
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# === КЭШ ===
+# По умолчанию — память процесса. Для общего кэша между воркерами gunicorn задайте,
+# например, CACHE_BACKEND=django.core.cache.backends.redis.RedisCache и
+# CACHE_LOCATION=redis://redis:6379/1.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='pm-meetup'),
+    }
+}
+
+# Кэш проверки API-ключей (apps.core.permissions): LRU воркера + кэш Django.
+# Отозванный ключ в других воркерах работает ещё до API_KEY_CACHE_LOCAL_TTL секунд
+# с общим кэшем и до API_KEY_CACHE_LOCAL_TTL + API_KEY_CACHE_TTL — с кэшем в памяти
+# процесса. Неверные ключи кэшируются только в кэше Django, на API_KEY_CACHE_NEGATIVE_TTL.
+API_KEY_CACHE_ALIAS = 'default'
+API_KEY_CACHE_TTL = config('API_KEY_CACHE_TTL', default=300, cast=int)
+API_KEY_CACHE_LOCAL_TTL = config('API_KEY_CACHE_LOCAL_TTL', default=30, cast=int)
+API_KEY_CACHE_NEGATIVE_TTL = config('API_KEY_CACHE_NEGATIVE_TTL', default=10, cast=int)
+API_KEY_CACHE_MAXSIZE = 1024
+
+# Кэш ответов read-only API (apps.core.mixins.CachedResponseMixin); 0 — выключен.
+# Сбрасывается сигналами моделей; с кэшем в памяти процесса — только в том воркере,
+# где сохранили объект, в остальных — через RESPONSE_CACHE_TTL секунд.
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TTL = config('RESPONSE_CACHE_TTL', default=300, cast=int)
+
+# HTML из Markdown (apps.core.markdown): LRU воркера перед таблицей RenderedMarkdown.
+# Ключ — хеш текста, поэтому записи не устаревают; TTL лишь ограничивает память.
+MARKDOWN_CACHE_LOCAL_MAXSIZE = 512
+MARKDOWN_CACHE_LOCAL_TTL = 3600
+
+# Время чтения текста (apps.core.content_analysis): слов в минуту.
+CONTENT_READ_WORDS_PER_MINUTE = 200
+
+# Словарь slug → id тегов для фильтров tags_any/tags_all (apps.core.tag_filters);
+# сбрасывается поколением модели Tag, TTL — страховка для остальных воркеров.
+TAG_ID_CACHE_LOCAL_TTL = 300
+
+# Очередь допуска к POST /api/v1/events/registrations/ (apps.core.admission): не чаще
+# REGISTRATION_ADMISSION_RATE запросов в секунду плюс всплеск REGISTRATION_ADMISSION_BURST,
+# остальным — билет и 429 с Retry-After; 0 — без очереди. Одна очередь на все воркеры —
+# только с общим кэшем (Redis), с кэшем в памяти процесса — своя в каждом воркере.
+ADMISSION_CACHE_ALIAS = 'default'
+REGISTRATION_ADMISSION_RATE = config('REGISTRATION_ADMISSION_RATE', default=20, cast=float)
+REGISTRATION_ADMISSION_BURST = config('REGISTRATION_ADMISSION_BURST', default=40, cast=int)
+REGISTRATION_ADMISSION_TICKET_TTL = 300
+
+# iCalendar-ленты событий (apps.events.feeds): события не старше EVENT_FEED_PAST_DAYS дней;
+# тело ленты хранится в кэше ответов под её версией EVENT_FEED_CACHE_TTL секунд (0 — не хранить).
+EVENT_FEED_PAST_DAYS = config('EVENT_FEED_PAST_DAYS', default=90, cast=int)
+EVENT_FEED_CACHE_TTL = config('EVENT_FEED_CACHE_TTL', default=3600, cast=int)
+
+# Общий поиск /api/v1/core/search/: сколько лучших совпадений брать от каждого типа.
+SEARCH_MAX_RESULTS_PER_TYPE = config('SEARCH_MAX_RESULTS_PER_TYPE', default=100, cast=int)
+
 # --------------------------------------------------
 # 13. Django REST Framework
 # --------------------------------------------------
@@ -175,6 +232,7 @@ SPECTACULAR_SETTINGS = {
         "EventRegistrationStatusEnum": [
             ("pending", "Ожидает подтверждения"),
             ("confirmed", "Подтверждена"),
+            ("waitlisted", "Лист ожидания"),
             ("cancelled", "Отменена"),
         ],
         "PartnershipApplicationStatusEnum": [